@@ -31,7 +31,12 @@ import * as dynamicGroupAtoms from "../recoil/dynamicGroups";
 import * as schemaAtoms from "../recoil/schema";
 import { datasetName } from "../recoil/selectors";
 import { State } from "../recoil/types";
-import { getSampleSrc, getSanitizedGroupByExpression } from "../recoil/utils";
+import {
+  GRID_THUMBNAIL_WIDTH,
+  MediaSrcOptions,
+  getSampleSrc,
+  getSanitizedGroupByExpression,
+} from "../recoil/utils";
 import * as viewAtoms from "../recoil/view";
 import { getStandardizedUrls } from "../utils";
 
@@ -163,7 +168,17 @@ export default <T extends AbstractLooker<BaseState>>(
           }
         }
 
-        config.src = getSampleSrc(sampleMediaFilePath);
+        // Grid thumbnails request downsized images and browser-friendly
+        // video proxies from the server's media cache. Patches are cropped
+        // from the full resolution image
+        let srcOptions: MediaSrcOptions | undefined = undefined;
+        if (thumbnail && constructor === ImageLooker && !isPatch) {
+          srcOptions = { width: GRID_THUMBNAIL_WIDTH };
+        } else if (thumbnail && constructor === VideoLooker) {
+          srcOptions = { proxy: true };
+        }
+
+        config.src = getSampleSrc(sampleMediaFilePath, srcOptions);
 
         if (sample.group?.name) {
           config.group = {
@@ -13,4 +13,19 @@ describe("getSampleSrc tests", () => {
       )}`
     );
   });
+
+  it("includes media cache parameters", () => {
+    const image = "/path/to/image.png";
+    setFetchParameters(window.location.origin, {}, "");
+    expect(getSampleSrc(image, { width: 512.4, format: "webp" })).toEqual(
+      `${window.location.origin}/media?filepath=${encodeURIComponent(
+        image
+      )}&width=512&format=webp`
+    );
+    expect(getSampleSrc(image, { proxy: true })).toEqual(
+      `${window.location.origin}/media?filepath=${encodeURIComponent(
+        image
+      )}&proxy=true`
+    );
+  });
 });
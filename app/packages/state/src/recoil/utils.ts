@@ -13,7 +13,24 @@ import {
 import { RecoilValue, useRecoilValue } from "recoil";
 import { Nullable } from "vitest";
 
-export const getSampleSrc = (url: string) => {
+/**
+ * Options for requesting a cached version of media from the /media route
+ */
+export interface MediaSrcOptions {
+  /** the maximum width, in pixels, of the returned image or video */
+  width?: number;
+  /** the format of returned images */
+  format?: "jpg" | "webp";
+  /** whether to return a browser-friendly proxy of the media, if necessary */
+  proxy?: boolean;
+}
+
+/**
+ * Width, in pixels, of the image thumbnails requested for grid samples
+ */
+export const GRID_THUMBNAIL_WIDTH = 512;
+
+export const getSampleSrc = (url: string, options?: MediaSrcOptions) => {
   if (determinePathType(url) === PathType.URL) {
     return url;
   }
@@ -21,7 +38,21 @@ export const getSampleSrc = (url: string) => {
   const params = getFetchParameters();
   const path = `${params.pathPrefix}/media`.replaceAll("//", "/");
 
-  return `${params.origin}${path}?filepath=${encodeURIComponent(url)}`;
+  let src = `${params.origin}${path}?filepath=${encodeURIComponent(url)}`;
+
+  if (options?.width) {
+    src += `&width=${Math.round(options.width)}`;
+  }
+
+  if (options?.format) {
+    src += `&format=${options.format}`;
+  }
+
+  if (options?.proxy) {
+    src += "&proxy=true";
+  }
+
+  return src;
 };
 
 export const getSanitizedGroupByExpression = (expression: string) => {
@@ -766,8 +766,13 @@ class CountValues(Aggregation):
             {"$group": {"_id": value, "count": {"$sum": 1}}},
         ]
 
+        return pipeline + self._get_result_pipeline()
+
+    def _get_result_pipeline(self):
+        # Returns the pipeline that reduces `{"_id": value, "count": count}`
+        # documents to the aggregation's result
         if self._first is None:
-            return pipeline + [
+            return [
                 {
                     "$group": {
                         "_id": None,
@@ -776,6 +781,8 @@ class CountValues(Aggregation):
                 }
             ]
 
+        pipeline = []
+
         exprs = []
         if self._search:
             exprs.append(
@@ -2658,6 +2665,158 @@ class Values(Aggregation):
         return pipeline
 
 
+class _FrameSummaryCount(Count):
+    """Computes a :class:`Count` of frame labels from the frame summaries
+    stored on the samples of a video collection.
+
+    Args:
+        summary_path: the path to the frame summary on each sample
+        key: the quantity to count. Supported values are ``"frames"``,
+            ``"count"``, and ``"labels"``
+    """
+
+    def __init__(self, summary_path, key):
+        super().__init__()
+        self._summary_path = summary_path
+        self._key = key
+
+    def to_mongo(self, sample_collection, context=None):
+        path = self._summary_path
+
+        if self._key == "labels":
+            labels_path = path + ".labels"
+            return [
+                {"$unwind": "$" + labels_path},
+                {"$match": {labels_path + ".k": {"$ne": None}}},
+                {
+                    "$group": {
+                        "_id": None,
+                        "count": {"$sum": "$" + labels_path + ".v"},
+                    }
+                },
+            ]
+
+        return [
+            {
+                "$group": {
+                    "_id": None,
+                    "count": {"$sum": "$" + path + "." + self._key},
+                }
+            }
+        ]
+
+
+class _FrameSummaryCountValues(CountValues):
+    """Computes the :class:`CountValues` of frame label classes from the frame
+    summaries stored on the samples of a video collection.
+
+    Args:
+        summary_path: the path to the frame summary on each sample
+        aggregation: the :class:`CountValues` being computed
+    """
+
+    def __init__(self, summary_path, aggregation):
+        super().__init__(
+            None,
+            _first=aggregation._first,
+            _sort_by=aggregation._sort_by,
+            _asc=aggregation._asc,
+            _include=aggregation._include,
+            _search=aggregation._search,
+            _selected=aggregation._selected,
+        )
+        self._summary_path = summary_path
+
+    def to_mongo(self, sample_collection, context=None):
+        labels_path = self._summary_path + ".labels"
+        pipeline = [
+            {"$unwind": "$" + labels_path},
+            {
+                "$group": {
+                    "_id": "$" + labels_path + ".k",
+                    "count": {"$sum": "$" + labels_path + ".v"},
+                }
+            },
+        ]
+
+        return pipeline + self._get_result_pipeline()
+
+
+class _FrameSummaryBounds(Bounds):
+    """Computes the safe :class:`Bounds` of frame label confidences and their
+    nan/inf counts from the frame summaries stored on the samples of a video
+    collection.
+
+    Args:
+        summary_path: the path to the frame summary on each sample
+    """
+
+    def __init__(self, summary_path):
+        super().__init__(None, safe=True, _count_nonfinites=True)
+        self._summary_path = summary_path
+        self._field_type = None
+
+    def to_mongo(self, sample_collection, context=None):
+        path = "$" + self._summary_path + ".confidence."
+        return [
+            {
+                "$group": {
+                    "_id": None,
+                    "min": {"$min": path + "min"},
+                    "max": {"$max": path + "max"},
+                    "inf": {"$sum": path + "inf"},
+                    "-inf": {"$sum": path + "ninf"},
+                    "nan": {"$sum": path + "nan"},
+                }
+            }
+        ]
+
+
+def _get_frame_summary_aggregation(aggregation, sample_collection, summaries):
+    # Returns an equivalent aggregation that is computed from the given frame
+    # summaries, if possible
+    if aggregation._expr is not None or aggregation._field_name is None:
+        return None
+
+    prefix = sample_collection._FRAMES_PREFIX
+    path = aggregation._field_name
+    if not path.startswith(prefix):
+        return None
+
+    field_name = path[len(prefix) :].split(".", 1)[0]
+    summary_path = summaries.get(field_name, None)
+    if summary_path is None:
+        return None
+
+    _, list_path = sample_collection._get_label_field_path(prefix + field_name)
+
+    agg_type = type(aggregation)
+
+    if agg_type is Count and aggregation._unwind:
+        if path == prefix + field_name:
+            return _FrameSummaryCount(summary_path, "frames")
+
+        if path == list_path:
+            return _FrameSummaryCount(summary_path, "count")
+
+        if path == list_path + ".label":
+            return _FrameSummaryCount(summary_path, "labels")
+
+    if agg_type is CountValues and path == list_path + ".label":
+        return _FrameSummaryCountValues(summary_path, aggregation)
+
+    if (
+        agg_type is Bounds
+        and aggregation._safe
+        and aggregation._count_nonfinites
+        and path == list_path + ".confidence"
+        and isinstance(sample_collection.get_field(path), fof.FloatField)
+    ):
+        return _FrameSummaryBounds(summary_path)
+
+    return None
+
+
 class _AggregationRepr(reprlib.Repr):
     def repr_ViewExpression(self, expr, level):
         return self.repr1(expr.to_mongo(), level=level - 1)
@@ -319,7 +319,13 @@ class ClipsView(fov.DatasetView):
         # This assumes that calling `load_view()` when the current clips
         # dataset has been deleted will cause a new one to be generated
         #
-        self._clips_dataset.delete()
+        # Cached datasets may be shared by other views, so they are left for
+        # eviction rather than being deleted
+        if fod._is_cached_generated_dataset(self._clips_dataset):
+            self._clips_stage._state = None
+        elif not self._clips_dataset.deleted:
+            self._clips_dataset.delete()
+
         _view = self._clips_stage.load_view(self._source_collection)
         self._clips_dataset = _view._clips_dataset
 
@@ -186,6 +186,8 @@ class SaveContext(object):
                 self._last_time = timeit.default_timer()
 
     def _save_batch(self):
+        updated = bool(self._sample_ops or self._frame_ops)
+
         if self._sample_ops:
             foo.bulk_write(self._sample_ops, self._sample_coll, ordered=False)
             self._sample_ops.clear()
@@ -194,6 +196,9 @@ class SaveContext(object):
             foo.bulk_write(self._frame_ops, self._frame_coll, ordered=False)
             self._frame_ops.clear()
 
+        if updated:
+            self._dataset._increment_write_count()
+
         if self._reload_parents:
             for sample in self._reload_parents:
                 sample._reload_parents()
@@ -1679,15 +1684,21 @@ class SampleCollection(object):
         """
         return self.count_values("tags")
 
-    def tag_labels(self, tags, label_fields=None):
+    def tag_labels(self, tags, label_fields=None, progress=False):
         """Adds the tag(s) to all labels in the specified label field(s) of
         this collection, if necessary.
 
+        The labels are updated server-side, so their IDs are never loaded into
+        memory.
+
         Args:
             tags: a tag or iterable of tags
             label_fields (None): an optional name or iterable of names of
                 :class:`fiftyone.core.labels.Label` fields. By default, all
                 label fields are used
+            progress (False): whether to render a progress bar (True/False),
+                use the default value ``fiftyone.config.show_progress_bars``
+                (None), or a progress callback function to invoke instead
         """
         if label_fields is None:
             label_fields = self._get_label_fields()
@@ -1697,10 +1708,19 @@ class SampleCollection(object):
         missing_tags = ~F("tags").contains(tags, all=True)
         match_expr = (F("tags") != None).if_else(missing_tags, True)
 
+        _tags = _to_tags_list(tags)
+        tags_fcn = lambda expr: _add_tags_expr(expr, _tags)
+
         for label_field in label_fields:
             # We only need to process labels that are missing a tag of interest
             view = self.filter_labels(label_field, match_expr)
-            view._tag_labels(tags, label_field)
+
+            if self._has_bulk_label_edits():
+                self._dataset._bulk_edit_labels(
+                    view, label_field, tags_fcn=tags_fcn, progress=progress
+                )
+            else:
+                view._tag_labels(tags, label_field)
 
     def _tag_labels(self, tags, label_field, ids=None, label_ids=None):
         if etau.is_str(tags):
@@ -1735,25 +1755,45 @@ class SampleCollection(object):
             else:
                 raise e
 
-    def untag_labels(self, tags, label_fields=None):
+    def untag_labels(self, tags, label_fields=None, progress=False):
         """Removes the tag from all labels in the specified label field(s) of
         this collection, if necessary.
 
+        The labels are updated server-side, so their IDs are never loaded into
+        memory.
+
         Args:
             tags: a tag or iterable of tags
             label_fields (None): an optional name or iterable of names of
                 :class:`fiftyone.core.labels.Label` fields. By default, all
                 label fields are used
+            progress (False): whether to render a progress bar (True/False),
+                use the default value ``fiftyone.config.show_progress_bars``
+                (None), or a progress callback function to invoke instead
         """
         if label_fields is None:
             label_fields = self._get_label_fields()
         elif etau.is_str(label_fields):
             label_fields = [label_fields]
 
+        _tags = _to_tags_list(tags)
+        tags_fcn = lambda expr: _remove_tags_expr(expr, _tags)
+
         for label_field in label_fields:
             # We only need to process labels that have a tag of interest
             view = self.select_labels(tags=tags, fields=label_field)
-            view._untag_labels(tags, label_field)
+
+            if self._has_bulk_label_edits():
+                self._dataset._bulk_edit_labels(
+                    view, label_field, tags_fcn=tags_fcn, progress=progress
+                )
+            else:
+                view._untag_labels(tags, label_field)
+
+    def _has_bulk_label_edits(self):
+        # Generated collections must sync label edits with their source
+        # collection, which requires the IDs of the edited labels
+        return not self._is_generated and not self._is_dynamic_groups
 
     def _untag_labels(self, tags, label_field, ids=None, label_ids=None):
         if etau.is_str(tags):
@@ -6582,7 +6622,13 @@ class SampleCollection(object):
         return self._add_view_stage(fos.Skip(skip))
 
     @view_stage
-    def sort_by(self, field_or_expr, reverse=False, create_index=True):
+    def sort_by(
+        self,
+        field_or_expr,
+        reverse=False,
+        create_index=True,
+        materialize=False,
+    ):
         """Sorts the samples in the collection by the given field(s) or
         expression(s).
 
@@ -6631,6 +6677,17 @@ class SampleCollection(object):
             )
             print(list(zip(num_objects, uniqueness)))
 
+            #
+            # Sorts the samples by number of detections using a hidden,
+            # indexed field that stores the number of detections in each
+            # sample
+            #
+
+            expr = F("predictions.detections").length()
+            dataset.create_sort_keys(expr)
+
+            view = dataset.sort_by(expr, materialize=True)
+
         Args:
             field_or_expr: the field(s) or expression(s) to sort by. This can
                 be any of the following:
@@ -6647,8 +6704,13 @@ class SampleCollection(object):
                     any string starting with "d" for descending order
             reverse (False): whether to return the results in descending order
             create_index (True): whether to create an index, if necessary, to
-                optimize the sort. Only applicable when sorting by field(s),
-                not expressions
+                optimize the sort. Only applicable when sorting by field(s), not
+                expressions
+            materialize (False): whether to sort by the stored values of any
+                sort expression(s) whose sort keys were created via
+                :meth:`fiftyone.core.dataset.Dataset.create_sort_keys` and are
+                up-to-date. Only applicable to expressions that follow only
+                stages that filter or reorder samples
 
         Returns:
             a :class:`fiftyone.core.view.DatasetView`
@@ -6658,6 +6720,7 @@ class SampleCollection(object):
                 field_or_expr,
                 reverse=reverse,
                 create_index=create_index,
+                materialize=materialize,
             )
         )
 
@@ -9230,6 +9293,13 @@ class SampleCollection(object):
 
         coll.drop_index(index_map[name])
 
+    def _get_frame_summaries(self):
+        """Returns a dict mapping frame-level label fields to the paths of
+        their up-to-date frame summaries that can be used when aggregating
+        this collection.
+        """
+        return {}
+
     def _get_default_indexes(self, frames=False):
         if frames:
             if self._has_frame_fields():
@@ -9614,7 +9684,23 @@ class SampleCollection(object):
         big_aggs = {}
         batch_aggs = {}
         facet_aggs = {}
+        frame_summaries = None
         for idx, aggregation in enumerate(aggregations):
+            # Use frame summaries rather than frame documents, if possible
+            if (
+                aggregation._field_name is not None
+                and aggregation._field_name.startswith(self._FRAMES_PREFIX)
+            ):
+                if frame_summaries is None:
+                    frame_summaries = self._get_frame_summaries()
+
+                if frame_summaries:
+                    _aggregation = foa._get_frame_summary_aggregation(
+                        aggregation, self, frame_summaries
+                    )
+                    if _aggregation is not None:
+                        aggregation = _aggregation
+
             if aggregation._is_big_batchable:
                 batch_aggs[idx] = aggregation
             elif aggregation._has_big_result:
@@ -10465,6 +10551,34 @@ def _serialize_value(field_name, field, value, validate=True):
     return field.to_mongo(value)
 
 
+def _to_tags_list(tags):
+    if etau.is_str(tags):
+        return [tags]
+
+    # Remove duplicates while preserving order
+    return list(dict.fromkeys(tags))
+
+
+def _add_tags_expr(tags_expr, tags):
+    tags_expr = {"$ifNull": [tags_expr, []]}
+    new_tags = {
+        "$filter": {
+            "input": {"$literal": tags},
+            "cond": {"$not": {"$in": ["$$this", tags_expr]}},
+        }
+    }
+    return {"$concatArrays": [tags_expr, new_tags]}
+
+
+def _remove_tags_expr(tags_expr, tags):
+    return {
+        "$filter": {
+            "input": tags_expr,
+            "cond": {"$not": {"$in": ["$$this", {"$literal": tags}]}},
+        }
+    }
+
+
 def _unwind_values(values, level=0):
     if not values:
         return values
@@ -104,6 +104,18 @@ class FiftyOneConfig(EnvConfig):
         self.model_zoo_dir = self.parse_path(
             d, "model_zoo_dir", env_var="FIFTYONE_MODEL_ZOO_DIR", default=None
         )
+        self.media_cache_dir = self.parse_path(
+            d,
+            "media_cache_dir",
+            env_var="FIFTYONE_MEDIA_CACHE_DIR",
+            default=None,
+        )
+        self.media_cache_size_bytes = self.parse_int(
+            d,
+            "media_cache_size_bytes",
+            env_var="FIFTYONE_MEDIA_CACHE_SIZE_BYTES",
+            default=2**32,
+        )
         self.module_path = self.parse_string_array(
             d,
             "module_path",
@@ -119,6 +131,12 @@ class FiftyOneConfig(EnvConfig):
             env_var="FIFTYONE_PLUGINS_CACHE_ENABLED",
             default=False,
         )
+        self.max_generated_datasets = self.parse_int(
+            d,
+            "max_generated_datasets",
+            env_var="FIFTYONE_MAX_GENERATED_DATASETS",
+            default=None,
+        )
         self.operator_timeout = self.parse_int(
             d,
             "operator_timeout",
@@ -289,6 +307,11 @@ class FiftyOneConfig(EnvConfig):
                 self.default_dataset_dir, "__models__"
             )
 
+        if self.media_cache_dir is None:
+            self.media_cache_dir = os.path.join(
+                self.default_dataset_dir, "__media_cache__"
+            )
+
         if self.plugins_dir is None:
             self.plugins_dir = os.path.join(
                 self.default_dataset_dir,
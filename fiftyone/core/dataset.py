@@ -6,16 +6,21 @@ FiftyOne datasets.
 |
 """
 
+import atexit
 from collections import defaultdict
 import contextlib
-from datetime import datetime
+from datetime import datetime, timedelta
 import fnmatch
+import hashlib
 import itertools
 import logging
+from multiprocessing.pool import ThreadPool
 import numbers
 import os
 import random
 import string
+import threading
+import weakref
 
 from bson import json_util, ObjectId, DBRef
 import cachetools
@@ -53,6 +58,23 @@ foud = fou.lazy_import("fiftyone.utils.data")
 
 logger = logging.getLogger(__name__)
 
+# Hidden sample field in which frame summaries are stored
+_FRAME_SUMMARIES_FIELD = "_frame_summaries"
+
+# Write count increments from individual document saves are coalesced over
+# this many seconds
+_WRITE_COUNT_DELAY = 1
+
+_pending_write_counts = {}
+
+# Cached generated datasets that have been used by any process within this
+# window are never evicted
+_GENERATED_DATASET_LEASE = timedelta(hours=1)
+
+# Names of the generated datasets used by objects in this process, keyed by
+# the ID of the object
+_generated_dataset_users = {}
+
 
 def list_datasets(glob_patt=None, tags=None, info=False):
     """Lists the available FiftyOne datasets.
@@ -244,6 +266,111 @@ def _delete_non_persistent_datasets(verbose=False):
                 logger.info("Dataset '%s' deleted", name)
 
 
+def _load_cached_generated_dataset(key):
+    if fo.config.max_generated_datasets == 0:
+        return None
+
+    conn = foo.get_db_conn()
+    d = conn.datasets.find_one_and_update(
+        {"generated_key": key},
+        {"$set": {"generated_last_used_at": datetime.utcnow()}},
+        projection={"name": True},
+    )
+
+    if d is None:
+        return None
+
+    try:
+        return load_dataset(d["name"])
+    except ValueError:
+        return None
+
+
+def _cache_generated_dataset(dataset, key):
+    max_datasets = fo.config.max_generated_datasets
+    if max_datasets == 0:
+        return
+
+    conn = foo.get_db_conn()
+    conn.datasets.update_one(
+        {"_id": dataset._doc.id},
+        {
+            "$set": {
+                "generated_key": key,
+                "generated_last_used_at": datetime.utcnow(),
+            }
+        },
+    )
+
+    if max_datasets is not None:
+        _evict_generated_datasets(conn, max_datasets)
+
+
+def _use_generated_dataset(user, dataset):
+    # Records that `user`, e.g., a view stage, uses the given generated
+    # dataset, which prevents the dataset from being evicted until `user` is
+    # garbage collected or starts using a different dataset
+    key = id(user)
+    if key not in _generated_dataset_users:
+        weakref.finalize(user, _generated_dataset_users.pop, key, None)
+
+    _generated_dataset_users[key] = dataset.name
+
+
+def _evict_generated_datasets(conn, max_datasets):
+    # Deletes the least recently used generated datasets beyond the first
+    # `max_datasets`. Datasets that are still used in this process, or whose
+    # lease has not expired, are left alone
+    in_use = set(_generated_dataset_users.values())
+    cutoff = datetime.utcnow() - _GENERATED_DATASET_LEASE
+
+    evicted = (
+        conn.datasets.find(
+            {"generated_key": {"$exists": True}},
+            {"name": True, "generated_last_used_at": True},
+        )
+        .sort("generated_last_used_at", -1)
+        .skip(max_datasets)
+    )
+    for d in list(evicted):
+        if d["name"] in in_use:
+            continue
+
+        # Removing the key first ensures that no other process can pick up
+        # the dataset from the cache while it is being deleted
+        result = conn.datasets.update_one(
+            {
+                "_id": d["_id"],
+                "generated_last_used_at": {"$lt": cutoff},
+            },
+            {"$unset": {"generated_key": ""}},
+        )
+        if not result.modified_count:
+            continue
+
+        try:
+            load_dataset(d["name"]).delete()
+        except ValueError:
+            pass
+
+
+def _is_cached_generated_dataset(dataset):
+    conn = foo.get_db_conn()
+    d = conn.datasets.find_one(
+        {"_id": dataset._doc.id, "generated_key": {"$exists": True}},
+        {"_id": True},
+    )
+    return d is not None
+
+
+def _touch_generated_dataset(name):
+    conn = foo.get_db_conn()
+    conn.datasets.update_one(
+        {"name": name, "generated_key": {"$exists": True}},
+        {"$set": {"generated_last_used_at": datetime.utcnow()}},
+    )
+
+
 class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
     """A FiftyOne dataset.
 
@@ -302,6 +429,9 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         self._evaluation_cache = cachetools.LRUCache(5)
         self._run_cache = cachetools.LRUCache(5)
 
+        self._write_count_lock = threading.Lock()
+        self._write_count_timer = None
+
         self._deleted = False
 
         if not _virtual:
@@ -1671,6 +1801,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         self._sample_doc_cls._rename_fields(
             sample_collection, paths, new_paths
         )
+        self._increment_write_count()
 
         fields, _, _, _ = _parse_field_mapping(field_mapping)
 
@@ -1689,6 +1820,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
 
         paths, new_paths = zip(*field_mapping.items())
         self._frame_doc_cls._rename_fields(sample_collection, paths, new_paths)
+        self._increment_write_count()
 
         fields, _, _, _ = _parse_field_mapping(field_mapping)
 
@@ -1755,6 +1887,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
 
         paths, new_paths = zip(*field_mapping.items())
         self._sample_doc_cls._clone_fields(sample_collection, paths, new_paths)
+        self._increment_write_count()
 
         fos.Sample._reload_docs(self._sample_collection_name)
         self._reload()
@@ -1768,6 +1901,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
 
         paths, new_paths = zip(*field_mapping.items())
         self._frame_doc_cls._clone_fields(sample_collection, paths, new_paths)
+        self._increment_write_count()
 
         fofr.Frame._reload_docs(self._frame_collection_name)
         self._reload()
@@ -1839,6 +1973,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
 
         field_names = _to_list(field_names)
         self._sample_doc_cls._clear_fields(sample_collection, field_names)
+        self._increment_write_count()
 
         fos.Sample._reload_docs(self._sample_collection_name)
 
@@ -1851,6 +1986,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
 
         field_names = _to_list(field_names)
         self._frame_doc_cls._clear_fields(sample_collection, field_names)
+        self._increment_write_count()
 
         fofr.Frame._reload_docs(self._frame_collection_name)
 
@@ -1988,6 +2124,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         self._sample_doc_cls._delete_fields(
             field_names, error_level=error_level
         )
+        self._increment_write_count()
 
         fields, embedded_fields = _parse_fields(field_names)
 
@@ -2021,6 +2158,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         self._frame_doc_cls._delete_fields(
             field_names, error_level=error_level
         )
+        self._increment_write_count()
 
         fields, embedded_fields = _parse_fields(field_names)
 
@@ -2395,38 +2533,17 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         make_sample = self._make_sample_fcn()
         index = 0
 
-        group_field = self.group_field
-        curr_id = None
-        group = {}
+        id_field = self.group_field + "._id"
+        docs = self._aggregate(
+            pipeline=pipeline,
+            post_pipeline=[{"$project": {id_field: True}}],
+        )
 
         try:
-            for d in self._aggregate(
-                detach_frames=True,
-                pipeline=pipeline,
-                group_slices=group_slices,
-                groups_only=True,
+            for group in self._hydrate_groups(
+                docs, make_sample, group_slices=group_slices
             ):
-                sample = make_sample(d)
-
-                group_id = sample[group_field].id
-                if curr_id is None:
-                    # First overall element
-                    curr_id = group_id
-                    group[sample[group_field].name] = sample
-                elif group_id == curr_id:
-                    # Add element to group
-                    group[sample[group_field].name] = sample
-                else:
-                    # Flush last group
-                    index += 1
-                    yield group
-
-                    # First element of new group
-                    curr_id = group_id
-                    group = {}
-                    group[sample[group_field].name] = sample
-
-            if group:
+                index += 1
                 yield group
         except CursorNotFound:
             # The cursor has timed out so we yield from a new one after
@@ -2437,6 +2554,48 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
             ):
                 yield group
 
+    def _hydrate_groups(
+        self, docs, make_sample, group_slices=None, batch_size=1000
+    ):
+        """Loads the requested slices of the groups in the given documents.
+
+        The slices of each batch of groups are retrieved via a single query
+        and then reassembled into groups in the order of the input documents.
+
+        Args:
+            docs: an iterable of sample dicts that contain (at least) the ID
+                of their group
+            make_sample: a function that builds samples from sample dicts
+            group_slices (None): an optional subset of group slices to load
+            batch_size (1000): the number of groups to load per query
+
+        Returns:
+            a generator that emits dicts mapping group slice names to samples
+        """
+        group_field = self.group_field
+        id_field = group_field + "._id"
+        name_field = group_field + ".name"
+
+        query = {}
+        if etau.is_container(group_slices):
+            query[name_field] = {"$in": list(group_slices)}
+        elif group_slices is not None:
+            query[name_field] = group_slices
+
+        for batch in fou.iter_batches(docs, batch_size):
+            group_ids = [d[group_field]["_id"] for d in batch]
+            query[id_field] = {"$in": group_ids}
+
+            groups = defaultdict(dict)
+            for d in self._sample_collection.find(query):
+                group = d[group_field]
+                groups[group["_id"]][group["name"]] = d
+
+            for group_id in group_ids:
+                group = groups.get(group_id, None)
+                if group:
+                    yield {name: make_sample(d) for name, d in group.items()}
+
     def get_group(self, group_id, group_slices=None):
         """Returns a dict containing the samples for the given group ID.
 
@@ -2612,12 +2771,14 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
             a list of IDs of the samples that were added to this dataset
         """
         if new_ids:
-            return _add_collection_with_new_ids(
+            ids = _add_collection_with_new_ids(
                 self,
                 sample_collection,
                 include_info=include_info,
                 overwrite_info=overwrite_info,
             )
+            self._increment_write_count()
+            return ids
 
         num_samples = len(self)
         self.merge_samples(
@@ -2653,6 +2814,8 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         except BulkWriteError as bwe:
             msg = bwe.details["writeErrors"][0]["errmsg"]
             raise ValueError(msg) from bwe
+        finally:
+            self._increment_write_count()
 
         for sample, d in zip(samples, dicts):
             doc = self._sample_dict_to_doc(d)
@@ -2715,6 +2878,8 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         except BulkWriteError as bwe:
             msg = bwe.details["writeErrors"][0]["errmsg"]
             raise ValueError(msg) from bwe
+        finally:
+            self._increment_write_count()
 
         for sample, d in zip(samples, dicts):
             doc = self._sample_dict_to_doc(d)
@@ -2748,6 +2913,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
             coll = self._sample_collection
 
         foo.bulk_write(ops, coll, ordered=ordered, progress=progress)
+        self._increment_write_count()
 
         if frames:
             fofr.Frame._reload_docs(self._frame_collection_name, frame_ids=ids)
@@ -3047,6 +3213,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
                 merge_lists=merge_lists,
                 overwrite=overwrite,
             )
+            self._increment_write_count()
             return
 
         #
@@ -3175,7 +3342,13 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         self._clear_groups(group_ids=group_ids)
 
     def delete_labels(
-        self, labels=None, ids=None, tags=None, view=None, fields=None
+        self,
+        labels=None,
+        ids=None,
+        tags=None,
+        view=None,
+        fields=None,
+        progress=False,
     ):
         """Deletes the specified labels from the dataset.
 
@@ -3208,6 +3381,9 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
                 dataset containing the labels to delete
             fields (None): a field or iterable of fields from which to delete
                 labels
+            progress (False): whether to render a progress bar (True/False),
+                use the default value ``fiftyone.config.show_progress_bars``
+                (None), or a progress callback function to invoke instead
         """
         if labels is not None:
             self._delete_labels(labels, fields=fields)
@@ -3236,10 +3412,8 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         frame_ops = []
         for field in fields:
             if view is not None:
-                _, id_path = view._get_label_field_path(field, "_id")
-                view_ids = view.values(id_path, unwind=True)
-            else:
-                view_ids = None
+                # The labels in the view are deleted server-side
+                self._bulk_edit_labels(view, field, progress=progress)
 
             root, is_list_field = self._get_label_field_root(field)
             root, is_frame_field = self._handle_frame_field(root)
@@ -3248,14 +3422,6 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
             if is_list_field:
                 query = {root: {"$exists": True}}
 
-                if view_ids is not None:
-                    ops.append(
-                        UpdateMany(
-                            query,
-                            {"$pull": {root: {"_id": {"$in": view_ids}}}},
-                        )
-                    )
-
                 if ids is not None:
                     ops.append(
                         UpdateMany(
@@ -3278,14 +3444,6 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
                         )
                     )
             else:
-                if view_ids is not None:
-                    ops.append(
-                        UpdateMany(
-                            {root + "._id": {"$in": view_ids}},
-                            {"$set": {root: None}},
-                        )
-                    )
-
                 if ids is not None:
                     ops.append(
                         UpdateMany(
@@ -3315,6 +3473,9 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
             foo.bulk_write(frame_ops, self._frame_collection)
             fofr.Frame._reload_docs(self._frame_collection_name)
 
+        if sample_ops or frame_ops:
+            self._increment_write_count()
+
     def _delete_labels(self, labels, fields=None):
         if etau.is_str(fields):
             fields = [fields]
@@ -3425,6 +3586,156 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
                 self._frame_collection_name, sample_ids=sample_ids
             )
 
+        if sample_ops or frame_ops:
+            self._increment_write_count()
+
+    def _bulk_edit_labels(
+        self, sample_collection, label_field, tags_fcn=None, progress=False
+    ):
+        # Edits the labels in `label_field` of `sample_collection` entirely
+        # server-side by merging the IDs of the labels in the collection back
+        # into the dataset. If `tags_fcn` is provided, it maps a label tags
+        # expression to its new tags; otherwise the labels are deleted
+        root, is_list_field = sample_collection._get_label_field_root(
+            label_field
+        )
+        _root, is_frame_field = self._handle_frame_field(root)
+
+        if is_frame_field:
+            coll_name = self._frame_collection_name
+            post_pipeline = [
+                {"$unwind": "$frames"},
+                {"$replaceRoot": {"newRoot": "$frames"}},
+            ]
+        else:
+            coll_name = self._sample_collection_name
+            post_pipeline = []
+
+        if is_list_field:
+            post_pipeline.extend(
+                [
+                    {"$project": {"_ids": "$" + _root + "._id"}},
+                    {"$match": {"_ids.0": {"$exists": True}}},
+                ]
+            )
+
+            in_view = {"$in": ["$$label._id", "$$new._ids"]}
+            if tags_fcn is None:
+                labels = {
+                    "$filter": {
+                        "input": "$" + _root,
+                        "as": "label",
+                        "cond": {"$not": in_view},
+                    }
+                }
+            else:
+                labels = {
+                    "$map": {
+                        "input": "$" + _root,
+                        "as": "label",
+                        "in": {
+                            "$cond": [
+                                in_view,
+                                {
+                                    "$mergeObjects": [
+                                        "$$label",
+                                        {"tags": tags_fcn("$$label.tags")},
+                                    ]
+                                },
+                                "$$label",
+                            ]
+                        },
+                    }
+                }
+
+            update = [{"$set": {_root: labels}}]
+        else:
+            post_pipeline.extend(
+                [
+                    {"$match": {_root + "._id": {"$exists": True}}},
+                    {"$project": {"_id": True}},
+                ]
+            )
+
+            if tags_fcn is None:
+                update = [{"$set": {_root: None}}]
+            else:
+                tags_path = _root + ".tags"
+                update = [{"$set": {tags_path: tags_fcn("$" + tags_path)}}]
+
+        post_pipeline.append(
+            {
+                "$merge": {
+                    "into": coll_name,
+                    "on": "_id",
+                    "whenMatched": update,
+                    "whenNotMatched": "discard",
+                }
+            }
+        )
+
+        pipeline = sample_collection._pipeline(
+            attach_frames=is_frame_field, post_pipeline=post_pipeline
+        )
+
+        shards = self._get_id_shards(sample_collection)
+        num_samples = sum(count for _, count in shards)
+        args = [
+            (self._sample_collection, match, count, pipeline)
+            for match, count in shards
+        ]
+
+        with fou.ProgressBar(total=num_samples, progress=progress) as pb:
+            if len(args) == 1:
+                pb.update(_run_shard(args[0]))
+            else:
+                with ThreadPool(processes=len(args)) as pool:
+                    for count in pool.imap_unordered(_run_shard, args):
+                        pb.update(count)
+
+        self._increment_write_count()
+
+        if is_frame_field:
+            fofr.Frame._reload_docs(self._frame_collection_name)
+        else:
+            fos.Sample._reload_docs(self._sample_collection_name)
+
+    def _get_id_shards(self, sample_collection, min_shard_size=10000):
+        # Partitions the samples of the dataset into contiguous ID ranges that
+        # can be processed in parallel, if every stage of the collection
+        # processes each sample independently
+        num_samples = self._sample_collection.estimated_document_count()
+
+        if isinstance(sample_collection, fov.DatasetView) and not all(
+            fov._is_sample_wise(stage) for stage in sample_collection._stages
+        ):
+            num_shards = 1
+        else:
+            num_shards = min(
+                fou.recommend_thread_pool_workers(),
+                num_samples // min_shard_size,
+            )
+
+        if num_shards <= 1:
+            return [(None, num_samples)]
+
+        buckets = list(
+            foo.aggregate(
+                self._sample_collection,
+                [{"$bucketAuto": {"groupBy": "$_id", "buckets": num_shards}}],
+            )
+        )
+
+        shards = []
+        for idx, bucket in enumerate(buckets):
+            match = {"$gte": bucket["_id"]["min"]}
+            if idx < len(buckets) - 1:
+                match["$lt"] = buckets[idx + 1]["_id"]["min"]
+
+            shards.append(({"$match": {"_id": match}}, bucket["count"]))
+
+        return shards
+
     @deprecated(reason="Use delete_samples() instead")
     def remove_sample(self, sample_or_id):
         """Removes the given sample from the dataset.
@@ -3482,6 +3793,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
     def _save(self, view=None, fields=None):
         if view is not None:
             _save_view(view, fields=fields)
+            self._increment_write_count()
 
         try:
             self._doc.save(safe=True)
@@ -3554,10 +3866,22 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         description=None,
         color=None,
         overwrite=False,
+        materialize=False,
     ):
         """Saves the given view into this dataset under the given name so it
         can be loaded later via :meth:`load_saved_view`.
 
+        If ``materialize`` is True, the ordered sample IDs output by the
+        view's leading stages that only select and/or sort samples (e.g.,
+        :meth:`match() <fiftyone.core.collections.SampleCollection.match>`
+        and
+        :meth:`sort_by() <fiftyone.core.collections.SampleCollection.sort_by>`)
+        are stored in the database, and subsequent calls to
+        :meth:`load_saved_view` read the stored result rather than evaluating
+        those stages again. The stored result is automatically refreshed
+        when the view is loaded after the dataset's samples have been
+        modified.
+
         Examples::
 
             import fiftyone as fo
@@ -3579,10 +3903,18 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
             color (None): an optional RGB hex string like ``'#FF6D04'``
             overwrite (False): whether to overwrite an existing saved view with
                 the same name
+            materialize (False): whether to store the output of the view's
+                leading selection/sorting stages in the database
         """
         if view._root_dataset._doc.id != self._doc.id:
             raise ValueError("Cannot save view into a different dataset")
 
+        if materialize and not view._get_num_materializable_stages():
+            raise ValueError(
+                "Cannot materialize a view that does not begin with stages "
+                "that only select and/or sort samples"
+            )
+
         view._set_name(name)
         slug = self._validate_saved_view_name(name, overwrite=overwrite)
 
@@ -3603,6 +3935,9 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         )
         view_doc.save(upsert=True)
 
+        if materialize:
+            self._materialize_saved_view(view_doc, view)
+
         # Targeted reload of saved views for better concurrency safety.
         # @todo improve list field updates in general so this isn't necessary
         self._doc.reload("saved_views")
@@ -3731,7 +4066,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
             if isinstance(view_doc, DBRef):
                 continue
 
-            view_doc.delete()
+            _delete_saved_view_doc(view_doc)
 
         self._doc.saved_views = []
         self.save()
@@ -3740,7 +4075,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         view_doc = self._get_saved_view_doc(name, pop=True)
         if not isinstance(view_doc, DBRef):
             view_id = str(view_doc.id)
-            view_doc.delete()
+            _delete_saved_view_doc(view_doc)
         else:
             view_id = None
 
@@ -3775,9 +4110,152 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         stage_dicts = [json_util.loads(s) for s in view_doc.view_stages]
         name = getattr(view_doc, "name")
         view = fov.DatasetView._build(self, stage_dicts)
+
+        if view_doc.materialized_stages:
+            materialized = self._load_materialized_result(view_doc, view)
+            if materialized is None:
+                materialized = self._materialize_saved_view(view_doc, view)
+
+            view._set_materialized(materialized)
+
         view._set_name(name)
         return view
 
+    def _materialize_saved_view(self, view_doc, view):
+        num_stages = view._get_num_materializable_stages()
+        if not num_stages:
+            return None
+
+        # The write count is read first so that any concurrent writes render
+        # the stored result stale
+        write_count = self._get_write_count()
+
+        stages = view._stages[:num_stages]
+        _view = self.view()
+        for stage in stages:
+            _view = _view._add_view_stage(stage, validate=False)
+
+        # The sample IDs are written to the stored collection by the database
+        # rather than being loaded into memory
+        coll_name = foo.make_materialized_view_collection_name()
+        ordered = any(fov._is_ordering_stage(stage) for stage in stages)
+
+        pipeline = [{"$project": {"_id": True}}]
+        if ordered:
+            pipeline.extend(
+                [
+                    {"$group": {"_id": None, "ids": {"$push": "$_id"}}},
+                    {
+                        "$unwind": {
+                            "path": "$ids",
+                            "includeArrayIndex": "index",
+                        }
+                    },
+                    {"$project": {"_id": "$ids", "index": True}},
+                ]
+            )
+
+        pipeline.append({"$out": coll_name})
+        list(_view._aggregate(post_pipeline=pipeline))
+
+        old_coll_name = view_doc.materialized_collection
+
+        view_doc.materialized_collection = coll_name
+        view_doc.materialized_stages = num_stages
+        view_doc.materialized_write_count = write_count
+        view_doc.materialized_at = datetime.utcnow()
+        view_doc.save()
+
+        if old_coll_name and old_coll_name != coll_name:
+            foo.get_db_conn().drop_collection(old_coll_name)
+
+        return fov.MaterializedResult(num_stages, coll_name, ordered)
+
+    def _load_materialized_result(self, view_doc, view):
+        num_stages = view._get_num_materializable_stages()
+        if (
+            num_stages != view_doc.materialized_stages
+            or view_doc.materialized_write_count != self._get_write_count()
+        ):
+            return None
+
+        coll_name = view_doc.materialized_collection
+        conn = foo.get_db_conn()
+        if not coll_name or not conn.list_collection_names(
+            filter={"name": coll_name}
+        ):
+            return None
+
+        stages = view._stages[:num_stages]
+        ordered = any(fov._is_ordering_stage(stage) for stage in stages)
+
+        return fov.MaterializedResult(num_stages, coll_name, ordered)
+
+    def _get_write_count(self):
+        self._flush_write_count()
+
+        conn = foo.get_db_conn()
+        d = conn.datasets.find_one({"_id": self._doc.id}, {"write_count": 1})
+        return d.get("write_count", 0) if d else 0
+
+    def _get_sort_keys(self):
+        # Returns the names of the fields that store sort keys that are
+        # up-to-date with the current contents of the dataset
+        self._flush_write_count()
+
+        conn = foo.get_db_conn()
+        d = conn.datasets.find_one(
+            {"_id": self._doc.id}, {"write_count": 1, "sort_keys": 1}
+        )
+        d = d or {}
+        write_count = d.get("write_count", 0)
+        sort_keys = d.get("sort_keys", None) or {}
+
+        return set(
+            f for f, k in sort_keys.items() if k["write_count"] == write_count
+        )
+
+    def _increment_write_count(self, deferred=False):
+        # Used to detect when materialized saved views, sort keys, and frame
+        # summaries are stale. Deferred increments are coalesced into a single
+        # increment that occurs shortly afterwards, or before this process
+        # next reads the count
+        if not deferred:
+            self._flush_write_count(force=True)
+            return
+
+        with self._write_count_lock:
+            if self._write_count_timer is None:
+                timer = threading.Timer(
+                    _WRITE_COUNT_DELAY, self._flush_write_count
+                )
+                timer.daemon = True
+                timer.start()
+
+                self._write_count_timer = timer
+                _pending_write_counts[id(self)] = self
+
+    def _flush_write_count(self, force=False):
+        # The dataset may have been deleted while an increment was pending
+        if self.deleted:
+            _pending_write_counts.pop(id(self), None)
+            return
+
+        with self._write_count_lock:
+            timer = self._write_count_timer
+            self._write_count_timer = None
+            _pending_write_counts.pop(id(self), None)
+
+        if timer is not None:
+            timer.cancel()
+        elif not force:
+            return
+
+        conn = foo.get_db_conn()
+        conn.datasets.update_one(
+            {"_id": self._doc.id}, {"$inc": {"write_count": 1}}
+        )
+
     def _validate_saved_view_name(self, name, skip=None, overwrite=False):
         slug = fou.to_slug(name)
         for view_doc in self._doc.get_saved_views():
@@ -4184,6 +4662,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         fos.Sample._reset_docs(
             self._sample_collection_name, sample_ids=sample_ids
         )
+        self._increment_write_count()
 
         if contains_videos:
             self._clear_frames(sample_ids=sample_ids)
@@ -4273,6 +4752,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
             fofr.Frame._reset_docs_by_frame_id(
                 self._frame_collection_name, frame_ids
             )
+            self._increment_write_count()
             return
 
         if view is not None:
@@ -4290,6 +4770,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         fofr.Frame._reset_docs(
             self._frame_collection_name, sample_ids=sample_ids
         )
+        self._increment_write_count()
 
     def _keep_frames(self, view=None, frame_ids=None):
         sample_collection = view if view is not None else self
@@ -4314,6 +4795,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
             fofr.Frame._reset_docs_by_frame_id(
                 self._frame_collection_name, frame_ids, keep=True
             )
+            self._increment_write_count()
             return
 
         if view is None:
@@ -4344,6 +4826,8 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
                 self._frame_collection_name, sample_id, fns, keep=True
             )
 
+        self._increment_write_count()
+
     def ensure_frames(self):
         """Ensures that the video dataset contains frame instances for every
         frame of each sample's source video.
@@ -4394,6 +4878,386 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
                 },
             ]
         )
+        self._increment_write_count()
+
+    def create_frame_summaries(self, field_names=None):
+        """Stores summaries of the given frame-level label field(s) of the
+        video dataset on each sample.
+
+        The summary of a field records the number of frames that contain
+        labels, the number of labels of each class, and the bounds of the
+        label confidences in each video.
+
+        Aggregations that can be computed from frame summaries, such as
+        counting the labels or the label classes of a frame field, will use
+        them rather than loading the frames of each video. Summaries are only
+        used while they are up-to-date, so call this method again after
+        modifying the dataset to refresh them.
+
+        Examples::
+
+            import fiftyone as fo
+            import fiftyone.zoo as foz
+
+            dataset = foz.load_zoo_dataset("quickstart-video")
+
+            dataset.create_frame_summaries("detections")
+
+            # These aggregations use the frame summaries
+            print(dataset.count("frames.detections.detections"))
+            print(dataset.count_values("frames.detections.detections.label"))
+
+        Args:
+            field_names (None): a frame-level label field or iterable of such
+                fields to summarize. By default, all frame-level label fields
+                are summarized
+        """
+        if self.media_type != fom.VIDEO or self._is_clips:
+            raise ValueError("Frame summaries require a video dataset")
+
+        if field_names is None:
+            schema = self.get_frame_field_schema(embedded_doc_type=fol.Label)
+            field_names = list(schema.keys())
+        elif etau.is_str(field_names):
+            field_names = [field_names]
+        else:
+            field_names = list(field_names)
+
+        for field_name in field_names:
+            # Validates that the field is a frame-level label field
+            self._get_label_field_type(self._FRAMES_PREFIX + field_name)
+
+        self._compute_frame_summaries(field_names)
+
+    def list_frame_summaries(self):
+        """Returns the frame-level label fields whose summaries are stored on
+        the samples of this dataset.
+
+        Returns:
+            a list of frame-level label fields
+        """
+        conn = foo.get_db_conn()
+        d = conn.datasets.find_one(
+            {"_id": self._doc.id}, {"frame_summaries": 1}
+        )
+        return sorted(((d or {}).get("frame_summaries", None) or {}).keys())
+
+    def drop_frame_summaries(self, field_names=None):
+        """Deletes the frame summaries for the given frame-level label
+        field(s) of this dataset.
+
+        Args:
+            field_names (None): a frame-level label field or iterable of such
+                fields. By default, all frame summaries are deleted
+        """
+        if field_names is None:
+            field_names = self.list_frame_summaries()
+        elif etau.is_str(field_names):
+            field_names = [field_names]
+
+        if not field_names:
+            return
+
+        self._sample_collection.update_many(
+            {},
+            {
+                "$unset": {
+                    _FRAME_SUMMARIES_FIELD + "." + f: "" for f in field_names
+                }
+            },
+        )
+
+        conn = foo.get_db_conn()
+        conn.datasets.update_one(
+            {"_id": self._doc.id},
+            {"$unset": {"frame_summaries." + f: "" for f in field_names}},
+        )
+
+    def create_sort_keys(self, exprs):
+        """Stores the values of the given sort expression(s) in hidden,
+        indexed fields of the samples of this dataset.
+
+        Views that sort by these expressions via
+        :meth:`sort_by(..., materialize=True)
+        <fiftyone.core.collections.SampleCollection.sort_by>` will sort by the
+        stored values rather than computing the expressions, as long as the
+        dataset has not been modified since the sort keys were created. Call
+        this method again after modifying the dataset to refresh them.
+
+        Examples::
+
+            import fiftyone as fo
+            import fiftyone.zoo as foz
+            from fiftyone import ViewField as F
+
+            dataset = foz.load_zoo_dataset("quickstart")
+
+            expr = F("ground_truth.detections").length()
+            dataset.create_sort_keys(expr)
+
+            # This view sorts by the stored values
+            view = dataset.sort_by(expr, reverse=True, materialize=True)
+
+        Args:
+            exprs: a :class:`fiftyone.core.expressions.ViewExpression` or
+                MongoDB aggregation expression, or an iterable of such
+                expressions
+        """
+        exprs = _parse_sort_key_exprs(exprs)
+
+        for expr in exprs:
+            if foe.is_frames_expr(expr) or foe.get_group_slices(expr):
+                raise ValueError(
+                    "Sort keys cannot be created for expressions that involve "
+                    "frame or group fields"
+                )
+
+        for expr in exprs:
+            self._create_sort_key(expr)
+
+    def list_sort_keys(self):
+        """Returns the sort expressions whose values are stored on the samples
+        of this dataset.
+
+        Returns:
+            a list of MongoDB aggregation expressions
+        """
+        conn = foo.get_db_conn()
+        d = conn.datasets.find_one({"_id": self._doc.id}, {"sort_keys": 1})
+        sort_keys = (d or {}).get("sort_keys", None) or {}
+        return [json_util.loads(k["expr"]) for k in sort_keys.values()]
+
+    def drop_sort_keys(self, exprs=None):
+        """Deletes the stored values and indexes of the given sort
+        expression(s) of this dataset.
+
+        Args:
+            exprs (None): a :class:`fiftyone.core.expressions.ViewExpression`
+                or MongoDB aggregation expression, or an iterable of such
+                expressions. By default, all sort keys are deleted
+        """
+        if exprs is None:
+            exprs = self.list_sort_keys()
+        else:
+            exprs = _parse_sort_key_exprs(exprs)
+
+        field_names = [_get_sort_key_field(expr) for expr in exprs]
+        if not field_names:
+            return
+
+        index_names = set(self._sample_collection.index_information().keys())
+        for field_name in field_names:
+            if field_name + "_1" in index_names:
+                self._sample_collection.drop_index(field_name + "_1")
+
+        self._sample_collection.update_many(
+            {}, {"$unset": {f: "" for f in field_names}}
+        )
+
+        self._sample_doc_cls._reload_fields()
+        for field_name in field_names:
+            if field_name in self._sample_doc_cls._fields:
+                self._sample_doc_cls._delete_field_schema(field_name)
+
+        self._doc.save()
+
+        conn = foo.get_db_conn()
+        conn.datasets.update_one(
+            {"_id": self._doc.id},
+            {"$unset": {"sort_keys." + f: "" for f in field_names}},
+        )
+
+    def _create_sort_key(self, expr):
+        write_count = self._get_write_count()
+        field_name = _get_sort_key_field(expr)
+
+        if field_name not in self._sample_doc_cls._fields:
+            self._sample_doc_cls._reload_fields()
+            self._sample_doc_cls._add_field_schema(field_name, fof.Field())
+            self._doc.save()
+
+        self._sample_collection.update_many({}, [{"$set": {field_name: expr}}])
+        self._sample_collection.create_index(field_name)
+
+        sort_key = {
+            "expr": json_util.dumps(expr, sort_keys=True),
+            "write_count": write_count,
+        }
+
+        conn = foo.get_db_conn()
+        conn.datasets.update_one(
+            {"_id": self._doc.id},
+            {"$set": {"sort_keys." + field_name: sort_key}},
+        )
+
+    def _get_frame_summaries(self):
+        if self.media_type != fom.VIDEO or self._is_clips:
+            return {}
+
+        self._flush_write_count()
+
+        conn = foo.get_db_conn()
+        d = conn.datasets.find_one(
+            {"_id": self._doc.id}, {"write_count": 1, "frame_summaries": 1}
+        )
+        d = d or {}
+        write_count = d.get("write_count", 0)
+        summaries = d.get("frame_summaries", None) or {}
+
+        # Stale summaries are not used until they are recomputed
+        return {
+            f: _FRAME_SUMMARIES_FIELD + "." + f
+            for f, c in summaries.items()
+            if c == write_count
+        }
+
+    def _compute_frame_summaries(self, field_names):
+        write_count = self._get_write_count()
+
+        # Readers fall back to the frames while the summaries are rebuilt
+        conn = foo.get_db_conn()
+        conn.datasets.update_one(
+            {"_id": self._doc.id},
+            {"$unset": {"frame_summaries." + f: "" for f in field_names}},
+        )
+
+        if _FRAME_SUMMARIES_FIELD not in self._sample_doc_cls._fields:
+            self._sample_doc_cls._reload_fields()
+            self._sample_doc_cls._add_field_schema(
+                _FRAME_SUMMARIES_FIELD, fof.Field()
+            )
+            self._doc.save()
+
+        pipelines = []
+        for field_name in field_names:
+            pipelines.extend(self._make_frame_summary_pipelines(field_name))
+
+        foo.aggregate(self._frame_collection, pipelines)
+
+        conn.datasets.update_one(
+            {"_id": self._doc.id},
+            {
+                "$set": {
+                    "frame_summaries." + f: write_count for f in field_names
+                }
+            },
+        )
+
+    def _make_frame_summary_pipelines(self, field_name):
+        # Resets the summary of the given frame field and returns pipelines
+        # that compute it from the frames collection
+        prefix = self._FRAMES_PREFIX
+        _, list_path = self._get_label_field_path(prefix + field_name)
+        conf_field = self.get_field(list_path + ".confidence")
+        has_confidence = isinstance(conf_field, fof.FloatField)
+        list_path = list_path[len(prefix) :]
+
+        summary_path = _FRAME_SUMMARIES_FIELD + "." + field_name
+        self._sample_collection.update_many(
+            {},
+            {
+                "$set": {
+                    summary_path: {
+                        "frames": 0,
+                        "count": 0,
+                        "labels": [],
+                        "confidence": {
+                            "min": None,
+                            "max": None,
+                            "inf": 0,
+                            "ninf": 0,
+                            "nan": 0,
+                        },
+                    }
+                }
+            },
+        )
+
+        def _merge(fields):
+            return {
+                "$merge": {
+                    "into": self._sample_collection_name,
+                    "on": "_id",
+                    "whenMatched": [
+                        {
+                            "$set": {
+                                summary_path + "." + k: "$$new." + k
+                                for k in fields
+                            }
+                        }
+                    ],
+                    "whenNotMatched": "discard",
+                }
+            }
+
+        match = {"$match": {field_name: {"$ne": None}}}
+
+        frames_pipeline = [
+            match,
+            {"$group": {"_id": "$_sample_id", "frames": {"$sum": 1}}},
+            _merge(["frames"]),
+        ]
+
+        # Per-class counts and confidence stats are computed for each
+        # (sample, label) pair and then reduced per sample
+        group = {"count": {"$sum": 1}}
+        regroup = {
+            "labels": {"$push": {"k": "$_id.label", "v": "$count"}},
+            "count": {"$sum": "$count"},
+        }
+        fields = ["count", "labels"]
+
+        if has_confidence:
+            conf = "$label.confidence"
+            nonfinites = {
+                "inf": float("inf"),
+                "ninf": -float("inf"),
+                "nan": float("nan"),
+            }
+            safe_conf = {
+                "$cond": [
+                    {"$in": [conf, list(nonfinites.values())]},
+                    None,
+                    conf,
+                ]
+            }
+
+            group["min"] = {"$min": safe_conf}
+            group["max"] = {"$max": safe_conf}
+            regroup["min"] = {"$min": "$min"}
+            regroup["max"] = {"$max": "$max"}
+            for key, value in nonfinites.items():
+                group[key] = {
+                    "$sum": {"$cond": [{"$eq": [conf, value]}, 1, 0]}
+                }
+                regroup[key] = {"$sum": "$" + key}
+
+        labels_pipeline = [
+            match,
+            {"$project": {"_sample_id": True, "label": "$" + list_path}},
+            {"$unwind": "$label"},
+            {
+                "$group": {
+                    "_id": {
+                        "sample_id": "$_sample_id",
+                        "label": "$label.label",
+                    },
+                    **group,
+                }
+            },
+            {"$group": {"_id": "$_id.sample_id", **regroup}},
+        ]
+
+        if has_confidence:
+            keys = ("min", "max") + tuple(nonfinites.keys())
+            labels_pipeline.append(
+                {"$addFields": {"confidence": {k: "$" + k for k in keys}}}
+            )
+            fields.append("confidence")
+
+        labels_pipeline.append(_merge(fields))
+
+        return [frames_pipeline, labels_pipeline]
 
     def delete(self):
         """Deletes the dataset.
@@ -7266,6 +8130,39 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         self._save()
 
 
+@atexit.register
+def _flush_pending_write_counts():
+    for dataset in list(_pending_write_counts.values()):
+        try:
+            dataset._flush_write_count()
+        except Exception:
+            pass
+
+
+def _parse_sort_key_exprs(exprs):
+    if isinstance(exprs, (foe.ViewExpression, dict)):
+        exprs = [exprs]
+
+    return [
+        e.to_mongo() if isinstance(e, foe.ViewExpression) else e for e in exprs
+    ]
+
+
+def _get_sort_key_field(expr):
+    # Returns the name of the hidden field that stores the given sort key
+    expr_str = json_util.dumps(expr, sort_keys=True)
+    return "_sort_key_" + hashlib.md5(expr_str.encode()).hexdigest()
+
+
+def _run_shard(args):
+    coll, match, count, pipeline = args
+    if match is not None:
+        pipeline = [match] + pipeline
+
+    foo.aggregate(coll, pipeline)
+    return count
+
+
 def _get_random_characters(n):
     return "".join(
         random.choice(string.ascii_lowercase + string.digits) for _ in range(n)
@@ -7619,12 +8516,19 @@ def _do_load_dataset(obj, name):
     return dataset_doc, sample_doc_cls, frame_doc_cls
 
 
+def _delete_saved_view_doc(view_doc):
+    if view_doc.materialized_collection:
+        foo.get_db_conn().drop_collection(view_doc.materialized_collection)
+
+    view_doc.delete()
+
+
 def _delete_dataset_doc(dataset_doc):
     for view_doc in dataset_doc.saved_views:
         if isinstance(view_doc, DBRef):
             continue
 
-        view_doc.delete()
+        _delete_saved_view_doc(view_doc)
 
     for workspace_doc in dataset_doc.workspaces:
         if isinstance(workspace_doc, DBRef):
@@ -8123,6 +9027,11 @@ def _clone_extras(src_dataset, dst_dataset):
     for _view_doc in src_doc.get_saved_views():
         view_doc = _clone_reference_doc(_view_doc)
         view_doc.dataset_id = dst_doc.id
+
+        # Materialized results are recomputed when the view is first loaded
+        view_doc.materialized_collection = None
+        view_doc.materialized_write_count = None
+
         view_doc.save(upsert=True)
 
         dst_doc.saved_views.append(view_doc)
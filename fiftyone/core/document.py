@@ -438,6 +438,7 @@ class _Document(object):
     def save(self):
         """Saves the document to the database."""
         self._save()
+        self._dataset._increment_write_count(deferred=True)
 
     def _save(self, deferred=False):
         if not self._in_db:
@@ -835,6 +836,7 @@ class DocumentView(_Document):
         """Saves the document view to the database."""
         self._save()
         self._reload_parents()
+        self._dataset._increment_write_count(deferred=True)
 
     def _save(self, deferred=False):
         return self._doc._save(
@@ -10,6 +10,7 @@ from copy import deepcopy
 from datetime import date, datetime, timedelta
 import re
 import warnings
+import weakref
 
 import bson
 import numpy as np
@@ -58,7 +59,7 @@ def is_frames_expr(expr):
         True/False
     """
     if isinstance(expr, ViewExpression):
-        expr = expr.to_mongo()
+        expr = expr._to_mongo()
 
     if etau.is_str(expr):
         return (
@@ -95,7 +96,7 @@ def get_group_slices(expr):
         a (possibly-empty) list of group slices
     """
     if isinstance(expr, ViewExpression):
-        expr = expr.to_mongo()
+        expr = expr._to_mongo()
 
     group_slices = set()
     _do_get_group_slices(expr, group_slices)
@@ -235,8 +236,22 @@ class ViewExpression(object):
     """
 
     def __init__(self, expr):
-        self._expr = expr
-        self._prefix = None
+        # New expressions have no compiled representations to invalidate
+        self.__dict__.update(_expr=expr, _prefix=None)
+
+    def __setattr__(self, name, value):
+        # Modifying an expression in-place invalidates its compiled
+        # representations, and those of any expressions that contain it
+        if name in ("_expr", "_prefix"):
+            self._invalidate()
+
+        super().__setattr__(name, value)
+
+    def __getstate__(self):
+        d = self.__dict__.copy()
+        d.pop("_compiled", None)
+        d.pop("_dependents", None)
+        return d
 
     def __str__(self):
         return repr(self)
@@ -251,7 +266,7 @@ class ViewExpression(object):
 
     def __deepcopy__(self, memo):
         obj = self.__class__(deepcopy(self._expr, memo))
-        obj._prefix = deepcopy(self._prefix, memo)
+        obj.__dict__["_prefix"] = deepcopy(self._prefix, memo)
         return obj
 
     def _freeze_prefix(self, prefix):
@@ -272,10 +287,44 @@ class ViewExpression(object):
         Returns:
             a MongoDB expression
         """
+        return _copy_mongo(self._to_mongo(prefix=prefix))
+
+    def _to_mongo(self, prefix=None):
+        # Returns the memoized MongoDB representation of the expression. The
+        # returned object is shared, so callers must not modify it
         if self.is_frozen:
             prefix = self._prefix
 
-        return _do_to_mongo(self._expr, prefix)
+        compiled = self.__dict__.get("_compiled", None)
+        if compiled is None:
+            compiled = {}
+            self.__dict__["_compiled"] = compiled
+
+        mongo = compiled.get(prefix, None)
+        if mongo is None:
+            mongo = _do_to_mongo(self._expr, prefix, parent=self)
+            compiled[prefix] = mongo
+
+        return mongo
+
+    def _add_dependent(self, parent):
+        dependents = self.__dict__.get("_dependents", None)
+        if dependents is None:
+            dependents = {}
+            self.__dict__["_dependents"] = dependents
+
+        dependents[id(parent)] = weakref.ref(parent)
+
+    def _invalidate(self):
+        # Discards the compiled representations of this expression and of any
+        # expressions that were compiled from it
+        self.__dict__.pop("_compiled", None)
+        dependents = self.__dict__.pop("_dependents", None)
+        if dependents:
+            for ref in dependents.values():
+                parent = ref()
+                if parent is not None:
+                    parent._invalidate()
 
     def __call__(self, field):
         """Retrieves the specified field or embedded field of this expression,
@@ -4627,8 +4676,10 @@ class ViewField(ViewExpression):
 
     def __deepcopy__(self, memo):
         obj = self.__class__()
-        obj._expr = deepcopy(self._expr, memo)
-        obj._prefix = deepcopy(self._prefix, memo)
+        obj.__dict__.update(
+            _expr=deepcopy(self._expr, memo),
+            _prefix=deepcopy(self._prefix, memo),
+        )
         return obj
 
     def to_mongo(self, prefix=None):
@@ -4654,6 +4705,9 @@ class ViewField(ViewExpression):
 
         return "$$CURRENT"
 
+    def _to_mongo(self, prefix=None):
+        return self.to_mongo(prefix=prefix)
+
 
 class ObjectId(ViewExpression):
     """A :class:`ViewExpression` that refers to an
@@ -4690,19 +4744,37 @@ class ObjectId(ViewExpression):
         """
         return {"$toObjectId": self._expr}
 
+    def _to_mongo(self, prefix=None):
+        return self.to_mongo(prefix=prefix)
+
+
+def _copy_mongo(val):
+    if isinstance(val, dict):
+        return {k: _copy_mongo(v) for k, v in val.items()}
+
+    if isinstance(val, list):
+        return [_copy_mongo(v) for v in val]
+
+    return val
+
 
-def _do_to_mongo(val, prefix):
+def _do_to_mongo(val, prefix, parent=None):
     if isinstance(val, ViewExpression):
-        return val.to_mongo(prefix=prefix)
+        if parent is not None:
+            val._add_dependent(parent)
+
+        return val._to_mongo(prefix=prefix)
 
     if isinstance(val, dict):
         return {
-            _do_to_mongo(k, prefix): _do_to_mongo(v, prefix)
+            _do_to_mongo(k, prefix, parent=parent): _do_to_mongo(
+                v, prefix, parent=parent
+            )
             for k, v in val.items()
         }
 
     if isinstance(val, list):
-        return [_do_to_mongo(v, prefix) for v in val]
+        return [_do_to_mongo(v, prefix, parent=parent) for v in val]
 
     if isinstance(val, (date, datetime)):
         # The arg needs must be float (not int) to avoid errors near the epoch
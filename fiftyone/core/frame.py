@@ -475,6 +475,7 @@ class Frames(object):
     def save(self):
         """Saves all frames for the sample to the database."""
         self._save()
+        self._dataset._increment_write_count(deferred=True)
 
     def _save(self, deferred=False):
         if not self._in_db:
@@ -5,9 +5,12 @@ FiftyOne JSON handling
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+from base64 import b64encode
 import dataclasses
 from datetime import date, datetime
+import io
 import math
+import zlib
 
 from bson import ObjectId
 import numpy as np
@@ -16,6 +19,7 @@ import fiftyone.core.utils as fou
 
 
 _MASK_CLASSES = {"Detection", "Heatmap", "Segmentation"}
+_NUMPY_HEADER_BYTES = 4096
 
 
 def _handle_bytes(o):
@@ -30,7 +34,12 @@ def _handle_bytes(o):
 
 def _handle_numpy_array(raw, _cls=None):
     if _cls not in _MASK_CLASSES:
-        return str(fou.deserialize_numpy_array(raw).shape)
+        return str(_read_numpy_header(raw)[0])
+
+    _, fortran_order = _read_numpy_header(raw)
+    if not fortran_order:
+        # already serialized as a C-contiguous array, so it can be sent as-is
+        return b64encode(raw).decode("ascii")
 
     array = fou.deserialize_numpy_array(raw)
 
@@ -40,6 +49,19 @@ def _handle_numpy_array(raw, _cls=None):
     return fou.serialize_numpy_array(array, ascii=True)
 
 
+def _read_numpy_header(raw):
+    # only the first bytes are inflated, which contain the .npy header
+    header = zlib.decompressobj().decompress(raw, _NUMPY_HEADER_BYTES)
+    with io.BytesIO(header) as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, _ = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, _ = np.lib.format.read_array_header_2_0(f)
+
+    return shape, fortran_order
+
+
 def _handle_date(dt):
     return {
         "_cls": "DateTime",
@@ -33,6 +33,9 @@ from .database import (
     delete_run,
     delete_runs,
     drop_collection,
+    make_materialized_view_collection_name,
+    create_values_collection,
+    drop_values_collections,
     drop_orphan_collections,
     drop_orphan_saved_views,
     drop_orphan_runs,
@@ -7,12 +7,14 @@ Database utilities.
 """
 import atexit
 import dataclasses
-from datetime import datetime
+from datetime import datetime, timedelta
+import hashlib
 import logging
 from multiprocessing.pool import ThreadPool
 import os
 
 import asyncio
+import bson
 from bson import json_util, ObjectId
 from bson.codec_options import CodecOptions
 from mongoengine import connect
@@ -20,7 +22,11 @@ import motor.motor_asyncio as mtr
 
 from packaging.version import Version
 import pymongo
-from pymongo.errors import BulkWriteError, ServerSelectionTimeoutError
+from pymongo.errors import (
+    BulkWriteError,
+    OperationFailure,
+    ServerSelectionTimeoutError,
+)
 import pytz
 
 import eta.core.utils as etau
@@ -46,6 +52,11 @@ _async_client = None
 _connection_kwargs = {}
 _db_service = None
 
+_VALUES_COLLECTION_PREFIX = "values."
+_VALUES_COLLECTIONS_REGISTRY = "values_collections"
+_VALUES_COLLECTION_TTL = timedelta(days=1)
+_MATERIALIZED_VIEW_COLLECTION_PREFIX = "materialized."
+
 
 #
 # IMPORTANT DATABASE CONFIG REQUIREMENTS
@@ -288,6 +299,7 @@ def _delete_non_persistent_datasets_if_allowed():
     try:
         if num_connections <= 1:
             fod.delete_non_persistent_datasets()
+            drop_values_collections()
     except:
         logger.exception("Skipping automatic non-persistent dataset cleanup")
 
@@ -473,6 +485,9 @@ def drop_orphan_collections(dry_run=False):
     Orphan collections are collections that are not associated with any known
     dataset or other collections used by FiftyOne.
 
+    Collections created by :func:`create_values_collection` are considered
+    orphans once they have not been used for a day.
+
     Args:
         dry_run (False): whether to log the actions that would be taken but not
             perform them
@@ -487,10 +502,30 @@ def drop_orphan_collections(dry_run=False):
             colls_in_use.add(sample_coll_name)
             colls_in_use.add("frames." + sample_coll_name)
 
+    for view_dict in conn.views.find({}, {"materialized_collection": 1}):
+        coll_name = view_dict.get("materialized_collection", None)
+        if coll_name:
+            colls_in_use.add(coll_name)
+
+    coll_names = conn.list_collection_names()
+
+    # Values collections may be in use by views in other processes, so they
+    # are only dropped after going unused for a while
+    colls_in_use.update(
+        _get_values_collections_in_use(conn, coll_names, dry_run=dry_run)
+    )
+
     # Only collections with these prefixes may be deleted
-    coll_prefixes = ("samples.", "frames.", "patches.", "clips.")
+    coll_prefixes = (
+        "samples.",
+        "frames.",
+        "patches.",
+        "clips.",
+        _VALUES_COLLECTION_PREFIX,
+        _MATERIALIZED_VIEW_COLLECTION_PREFIX,
+    )
 
-    for coll_name in conn.list_collection_names():
+    for coll_name in coll_names:
         if coll_name not in colls_in_use and any(
             coll_name.startswith(prefix) for prefix in coll_prefixes
         ):
@@ -499,6 +534,156 @@ def drop_orphan_collections(dry_run=False):
                 conn.drop_collection(coll_name)
 
 
+def _get_values_collections_in_use(conn, coll_names, dry_run=False):
+    registry = conn[_VALUES_COLLECTIONS_REGISTRY]
+    now = datetime.utcnow()
+    cutoff = now - _VALUES_COLLECTION_TTL
+
+    last_used = {d["_id"]: d["last_used_at"] for d in registry.find({})}
+
+    in_use = set()
+    for coll_name in coll_names:
+        if not coll_name.startswith(_VALUES_COLLECTION_PREFIX):
+            continue
+
+        if coll_name in last_used:
+            last_used_at = last_used[coll_name]
+        else:
+            last_used_at = _get_temp_collection_time(coll_name)
+
+        if last_used_at is None:
+            # Unregistered collections are adopted and expire normally
+            last_used_at = now
+            if not dry_run:
+                registry.update_one(
+                    {"_id": coll_name},
+                    {"$set": {"last_used_at": now}},
+                    upsert=True,
+                )
+
+        if last_used_at >= cutoff:
+            in_use.add(coll_name)
+        elif not dry_run and coll_name in last_used:
+            # The collection may have been used since the registry was read
+            result = registry.delete_one(
+                {"_id": coll_name, "last_used_at": {"$lt": cutoff}}
+            )
+            if not result.deleted_count:
+                in_use.add(coll_name)
+
+    # Registrations of collections that no longer exist are stale
+    if not dry_run:
+        registry.delete_many(
+            {"_id": {"$in": list(set(last_used.keys()) - set(coll_names))}}
+        )
+
+    return in_use
+
+
+def _get_temp_collection_time(coll_name):
+    # Collections are populated under a temporary ``<name>.<ObjectId>`` name
+    try:
+        _id = ObjectId(coll_name.rsplit(".", 1)[1])
+    except Exception:
+        return None
+
+    return _id.generation_time.replace(tzinfo=None)
+
+
+def create_values_collection(values, collection_name=None):
+    """Creates a collection that contains the given values, if necessary.
+
+    The collection contains one document per distinct value, whose ``_id`` is
+    the value and whose ``index`` is the position of the value's first
+    occurrence in ``values``. Such collections can be used to efficiently
+    ``$lookup`` large lists of values that would be too large to embed in
+    aggregation pipelines.
+
+    Collections are named by a hash of their values, so they are reused when
+    the same values are provided again. Each call records that the
+    collection is in use, and :func:`drop_orphan_collections` only drops
+    collections that have gone unused for a while.
+
+    Args:
+        values: a list of hashable values
+        collection_name (None): the collection name previously returned by
+            this method for the same values, if any
+
+    Returns:
+        the name of the collection
+    """
+    conn = get_db_conn()
+    registry = conn[_VALUES_COLLECTIONS_REGISTRY]
+
+    if collection_name is None:
+        key = hashlib.md5(bson.encode({"values": values})).hexdigest()
+        collection_name = _VALUES_COLLECTION_PREFIX + key
+
+    # Collections are registered once they exist
+    update = {"$set": {"last_used_at": datetime.utcnow()}}
+    if registry.update_one({"_id": collection_name}, update).matched_count:
+        return collection_name
+
+    _create_values_collection(conn, values, collection_name)
+    registry.update_one({"_id": collection_name}, update, upsert=True)
+
+    return collection_name
+
+
+def _create_values_collection(conn, values, collection_name):
+    docs = {}
+    for idx, value in enumerate(values):
+        key = _get_value_key(value)
+        if key not in docs:
+            docs[key] = {"_id": value, "index": idx}
+
+    # Values are inserted into a temporary collection and then atomically
+    # renamed, so that concurrent readers never see a partial collection
+    tmp_coll = conn[collection_name + "." + str(ObjectId())]
+    insert_documents(docs.values(), tmp_coll, progress=False)
+
+    try:
+        tmp_coll.rename(collection_name)
+    except OperationFailure:
+        # another process created the collection first
+        tmp_coll.drop()
+
+
+def _get_value_key(value):
+    # MongoDB considers numeric types equal, but not booleans and numbers
+    if isinstance(value, bool):
+        return bool, value
+
+    if isinstance(value, (int, float)):
+        return float, value
+
+    return type(value), value
+
+
+def make_materialized_view_collection_name():
+    """Returns a new name for a collection that stores the sample IDs of a
+    materialized saved view.
+
+    The collection has the same layout as the collections created by
+    :func:`create_values_collection`, but it is not reused or dropped
+    automatically; its owner is responsible for creating and dropping it.
+
+    Returns:
+        the name of the collection
+    """
+    return _MATERIALIZED_VIEW_COLLECTION_PREFIX + str(ObjectId())
+
+
+def drop_values_collections():
+    """Drops all collections created by :func:`create_values_collection`."""
+    conn = get_db_conn()
+    for coll_name in conn.list_collection_names():
+        if coll_name.startswith(_VALUES_COLLECTION_PREFIX):
+            conn.drop_collection(coll_name)
+
+    conn.drop_collection(_VALUES_COLLECTIONS_REGISTRY)
+
+
 def drop_orphan_saved_views(dry_run=False):
     """Drops all orphan saved views from the database.
 
@@ -1593,6 +1778,13 @@ def _get_result_ids(conn, dataset_dict):
 
 
 def _delete_saved_views(conn, view_ids):
+    for view_dict in conn.views.find(
+        {"_id": {"$in": view_ids}}, {"materialized_collection": 1}
+    ):
+        coll_name = view_dict.get("materialized_collection", None)
+        if coll_name:
+            conn.drop_collection(coll_name)
+
     conn.views.delete_many({"_id": {"$in": view_ids}})
 
 
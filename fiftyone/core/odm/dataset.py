@@ -6,6 +6,7 @@ Documents that track datasets and their sample schemas in the database.
 |
 """
 
+from datetime import datetime, timedelta
 import logging
 
 from bson import DBRef, ObjectId
@@ -617,6 +618,7 @@ class DatasetDocument(Document):
     version = StringField(required=True, null=True)
     created_at = DateTimeField()
     last_loaded_at = DateTimeField()
+    last_modified_at = DateTimeField()
     sample_collection_name = StringField(unique=True, required=True)
     frame_collection_name = StringField()
     persistent = BooleanField(default=False)
@@ -645,6 +647,20 @@ class DatasetDocument(Document):
     evaluations = DictField(ReferenceField(RunDocument))
     runs = DictField(ReferenceField(RunDocument))
 
+    def _update(self, _id, updates, **kwargs):
+        # Loading a dataset does not modify it
+        fields = set(updates.get("$set", {}).keys())
+        fields.update(updates.get("$unset", {}).keys())
+        fields.discard("last_loaded_at")
+
+        if fields:
+            self.last_modified_at = _next_modified_at(self.last_modified_at)
+            updates.setdefault("$set", {})[
+                "last_modified_at"
+            ] = self.last_modified_at
+
+        return super()._update(_id, updates, **kwargs)
+
     def get_saved_views(self):
         saved_views = []
         for view_doc in self.saved_views:
@@ -754,3 +770,15 @@ class DatasetDocument(Document):
             d["runs"] = {k: v.to_dict() for k, v in self.get_runs().items()}
 
         return d
+
+
+def _next_modified_at(last_modified_at):
+    # The database stores datetimes with millisecond precision, and successive
+    # modifications must have distinct timestamps
+    now = datetime.utcnow()
+    now = now.replace(microsecond=1000 * (now.microsecond // 1000))
+
+    if last_modified_at is not None and now <= last_modified_at:
+        now = last_modified_at + timedelta(milliseconds=1)
+
+    return now
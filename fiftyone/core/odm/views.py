@@ -8,6 +8,7 @@ Saved view documents.
 from fiftyone.core.fields import (
     ColorField,
     DateTimeField,
+    IntField,
     ListField,
     ObjectIdField,
     StringField,
@@ -33,3 +34,7 @@ class SavedViewDocument(Document):
     created_at = DateTimeField()
     last_modified_at = DateTimeField()
     last_loaded_at = DateTimeField()
+    materialized_collection = StringField()
+    materialized_stages = IntField()
+    materialized_write_count = IntField()
+    materialized_at = DateTimeField()
@@ -332,7 +332,13 @@ class _PatchesView(fov.DatasetView):
         # This assumes that calling `load_view()` when the current patches
         # dataset has been deleted will cause a new one to be generated
         #
-        self._patches_dataset.delete()
+        # Cached datasets may be shared by other views, so they are left for
+        # eviction rather than being deleted
+        if fod._is_cached_generated_dataset(self._patches_dataset):
+            self._patches_stage._state = None
+        elif not self._patches_dataset.deleted:
+            self._patches_dataset.delete()
+
         _view = self._patches_stage.load_view(self._source_collection)
         self._patches_dataset = _view._patches_dataset
 
@@ -10,13 +10,14 @@ import builtins
 from collections import defaultdict, OrderedDict
 import contextlib
 from copy import deepcopy
+import hashlib
 import itertools
 import random
 import reprlib
 import uuid
 import warnings
 
-from bson import ObjectId
+from bson import json_util, ObjectId
 import numpy as np
 
 import eta.core.utils as etau
@@ -28,6 +29,7 @@ import fiftyone.core.frame as fofr
 import fiftyone.core.groups as fog
 import fiftyone.core.labels as fol
 import fiftyone.core.media as fom
+import fiftyone.core.odm as foo
 from fiftyone.core.odm.document import MongoEngineBaseDocument
 import fiftyone.core.sample as fos
 import fiftyone.core.utils as fou
@@ -524,7 +526,9 @@ class Exclude(ViewStage):
 
     def to_mongo(self, _):
         sample_ids = [ObjectId(_id) for _id in self._sample_ids]
-        return [{"$match": {"_id": {"$not": {"$in": sample_ids}}}}]
+        return _make_select_values_pipeline(
+            self, "_id", sample_ids, exclude=True
+        )
 
     def _kwargs(self):
         return [["sample_ids", self._sample_ids]]
@@ -612,7 +616,7 @@ class ExcludeBy(ViewStage):
         else:
             values = self._values
 
-        return [{"$match": {path: {"$not": {"$in": values}}}}]
+        return _make_select_values_pipeline(self, path, values, exclude=True)
 
     def _kwargs(self):
         return [["field", self._field], ["values", self._values]]
@@ -1137,11 +1141,11 @@ class ExcludeFrames(ViewStage):
     def to_mongo(self, _):
         frame_ids = [ObjectId(_id) for _id in self._frame_ids]
         select_expr = F("frames").filter(~F("_id").is_in(frame_ids))
-        pipeline = [{"$addFields": {"frames": select_expr.to_mongo()}}]
+        pipeline = [{"$addFields": {"frames": select_expr._to_mongo()}}]
 
         if self._omit_empty:
             non_empty_expr = F("frames").length() > 0
-            pipeline.append({"$match": {"$expr": non_empty_expr.to_mongo()}})
+            pipeline.append({"$match": {"$expr": non_empty_expr._to_mongo()}})
 
         return pipeline
 
@@ -1661,18 +1665,18 @@ class Exists(ViewStage):
             else:
                 expr = F("frames").length() == 0
 
-            return [{"$match": {"$expr": expr.to_mongo()}}]
+            return [{"$match": {"$expr": expr._to_mongo()}}]
 
         if not is_frame_field:
             expr = F(field_name).exists(self._bool)
-            return [{"$match": {"$expr": expr.to_mongo()}}]
+            return [{"$match": {"$expr": expr._to_mongo()}}]
 
         if self._bool:
             expr = F("frames").filter(F(field_name).exists()).length() > 0
         else:
             expr = F("frames").filter(F(field_name).exists()).length() == 0
 
-        return [{"$match": {"$expr": expr.to_mongo()}}]
+        return [{"$match": {"$expr": expr._to_mongo()}}]
 
     def _needs_frames(self, sample_collection):
         if not sample_collection._contains_videos():
@@ -1903,7 +1907,7 @@ def _get_filter_field_pipeline(
 
     if only_matches:
         match_expr = _get_field_only_matches_expr(new_field)
-        pipeline.append({"$match": {"$expr": match_expr.to_mongo()}})
+        pipeline.append({"$match": {"$expr": match_expr._to_mongo()}})
 
     return pipeline
 
@@ -1969,7 +1973,7 @@ def _get_filter_frames_field_pipeline(
 
     if only_matches:
         match_expr = _get_frames_field_only_matches_expr(new_field)
-        pipeline.append({"$match": {"$expr": match_expr.to_mongo()}})
+        pipeline.append({"$match": {"$expr": match_expr._to_mongo()}})
 
     return pipeline
 
@@ -2476,7 +2480,7 @@ def _get_filter_list_field_pipeline(
 
     if only_matches:
         match_expr = _get_list_field_only_matches_expr(new_field)
-        pipeline.append({"$match": {"$expr": match_expr.to_mongo()}})
+        pipeline.append({"$match": {"$expr": match_expr._to_mongo()}})
 
     return pipeline
 
@@ -2538,7 +2542,7 @@ def _get_filter_frames_list_field_pipeline(
 
     if only_matches:
         match_expr = _get_frames_list_field_only_matches_expr(new_field)
-        pipeline.append({"$match": {"$expr": match_expr.to_mongo()}})
+        pipeline.append({"$match": {"$expr": match_expr._to_mongo()}})
 
     return pipeline
 
@@ -2584,7 +2588,7 @@ def _get_trajectories_filter(sample_collection, field, filter_arg):
     # union() removes duplicates
     indexes_expr = F("frames").reduce(reduce_expr, []).union()
 
-    set_pipeline = [{"$addFields": {"_indexes": indexes_expr.to_mongo()}}]
+    set_pipeline = [{"$addFields": {"_indexes": indexes_expr._to_mongo()}}]
     label_filter = (F("$_indexes") != None) & F("$_indexes").contains(
         [F("index")]
     )
@@ -2830,7 +2834,7 @@ class FilterKeypoints(ViewStage):
                 sample_collection, self._field, new_field=self._new_field
             )
 
-            pipeline.append({"$match": {"$expr": match_expr.to_mongo()}})
+            pipeline.append({"$match": {"$expr": match_expr._to_mongo()}})
 
         return pipeline
 
@@ -4414,25 +4418,29 @@ class Match(ViewStage):
         return self._filter
 
     def to_mongo(self, _):
-        return [{"$match": self._get_mongo_expr()}]
+        return [{"$match": self._get_mongo_expr(copy=False)}]
 
     def _needs_frames(self, sample_collection):
         if not sample_collection._contains_videos():
             return False
 
-        return foe.is_frames_expr(self._get_mongo_expr())
+        return foe.is_frames_expr(self._get_mongo_expr(copy=False))
 
     def _needs_group_slices(self, sample_collection):
         if sample_collection.media_type != fom.GROUP:
             return None
 
-        return foe.get_group_slices(self._get_mongo_expr())
+        return foe.get_group_slices(self._get_mongo_expr(copy=False))
 
-    def _get_mongo_expr(self):
+    def _get_mongo_expr(self, copy=True):
         if not isinstance(self._filter, foe.ViewExpression):
             return self._filter
 
-        return {"$expr": self._filter.to_mongo()}
+        if copy:
+            return {"$expr": self._filter.to_mongo()}
+
+        # The memoized expression is shared, so it must not be modified
+        return {"$expr": self._filter._to_mongo()}
 
     def _kwargs(self):
         return [["filter", self._get_mongo_expr()]]
@@ -4589,7 +4597,7 @@ class SelectGroupSlices(ViewStage):
                 "$lookup": {
                     "from": sample_collection._dataset._sample_collection_name,
                     "let": {"group_id": "$" + id_field},
-                    "pipeline": [{"$match": {"$expr": expr.to_mongo()}}],
+                    "pipeline": [{"$match": {"$expr": expr._to_mongo()}}],
                     "as": "groups",
                 }
             },
@@ -4819,7 +4827,7 @@ class MatchFrames(ViewStage):
 
         if self._omit_empty:
             non_empty_expr = F("frames").length() > 0
-            pipeline.append({"$match": {"$expr": non_empty_expr.to_mongo()}})
+            pipeline.append({"$match": {"$expr": non_empty_expr._to_mongo()}})
 
         return pipeline
 
@@ -5641,23 +5649,9 @@ class Select(ViewStage):
             )
 
         ids = [ObjectId(_id) for _id in self._sample_ids]
-
-        pipeline = [{"$match": {"_id": {"$in": ids}}}]
-
-        if self._ordered:
-            pipeline.extend(
-                [
-                    {
-                        "$addFields": {
-                            "_select_order": {"$indexOfArray": [ids, "$_id"]}
-                        }
-                    },
-                    {"$sort": {"_select_order": 1}},
-                    {"$project": {"_select_order": False}},
-                ]
-            )
-
-        return pipeline
+        return _make_select_values_pipeline(
+            self, "_id", ids, ordered=self._ordered
+        )
 
     def _kwargs(self):
         return [["sample_ids", self._sample_ids], ["ordered", self._ordered]]
@@ -5768,24 +5762,9 @@ class SelectBy(ViewStage):
         else:
             values = self._values
 
-        pipeline = [{"$match": {path: {"$in": values}}}]
-
-        if self._ordered:
-            pipeline.extend(
-                [
-                    {
-                        "$addFields": {
-                            "_select_order": {
-                                "$indexOfArray": [values, "$" + path]
-                            }
-                        }
-                    },
-                    {"$sort": {"_select_order": 1}},
-                    {"$project": {"_select_order": False}},
-                ]
-            )
-
-        return pipeline
+        return _make_select_values_pipeline(
+            self, path, values, ordered=self._ordered
+        )
 
     def _kwargs(self):
         return [
@@ -6149,11 +6128,11 @@ class SelectFrames(ViewStage):
     def to_mongo(self, _):
         frame_ids = [ObjectId(_id) for _id in self._frame_ids]
         select_expr = F("frames").filter(F("_id").is_in(frame_ids))
-        pipeline = [{"$addFields": {"frames": select_expr.to_mongo()}}]
+        pipeline = [{"$addFields": {"frames": select_expr._to_mongo()}}]
 
         if self._omit_empty:
             non_empty_expr = F("frames").length() > 0
-            pipeline.append({"$match": {"$expr": non_empty_expr.to_mongo()}})
+            pipeline.append({"$match": {"$expr": non_empty_expr._to_mongo()}})
 
         return pipeline
 
@@ -6248,25 +6227,9 @@ class SelectGroups(ViewStage):
     def to_mongo(self, sample_collection):
         id_path = sample_collection.group_field + "._id"
         ids = [ObjectId(_id) for _id in self._group_ids]
-
-        pipeline = [{"$match": {id_path: {"$in": ids}}}]
-
-        if self._ordered:
-            pipeline.extend(
-                [
-                    {
-                        "$addFields": {
-                            "_select_order": {
-                                "$indexOfArray": [ids, "$" + id_path]
-                            }
-                        }
-                    },
-                    {"$sort": {"_select_order": 1}},
-                    {"$project": {"_select_order": False}},
-                ]
-            )
-
-        return pipeline
+        return _make_select_values_pipeline(
+            self, id_path, ids, ordered=self._ordered
+        )
 
     def _kwargs(self):
         return [["group_ids", self._group_ids], ["ordered", self._ordered]]
@@ -6573,12 +6536,12 @@ class SelectLabels(ViewStage):
 
         # Select specified labels
         for field, labels_map in self._labels_map.items():
-            label_filter = F("_id").is_in(
-                [foe.ObjectId(_id) for _id in labels_map]
+            label_ids = [ObjectId(_id) for _id in labels_map]
+            pipeline.extend(
+                _make_select_label_ids_pipeline(
+                    sample_collection, field, label_ids
+                )
             )
-            stage = FilterLabels(field, label_filter, only_matches=False)
-            stage.validate(sample_collection)
-            pipeline.extend(stage.to_mongo(sample_collection))
 
         return pipeline
 
@@ -6613,20 +6576,24 @@ class SelectLabels(ViewStage):
 
         filter_expr = None
 
-        if self._ids is not None:
-            filter_expr = F("_id").is_in([ObjectId(_id) for _id in self._ids])
-
         if self._tags is not None:
-            tag_expr = (F("tags") != None).if_else(
+            filter_expr = (F("tags") != None).if_else(
                 F("tags").contains(self._tags), False
             )
-            if filter_expr is not None:
-                filter_expr &= tag_expr
-            else:
-                filter_expr = tag_expr
 
         # Filter to only retain selected labels
-        if filter_expr is not None:
+        if self._ids is not None:
+            label_ids = [ObjectId(_id) for _id in self._ids]
+            for field in fields:
+                pipeline.extend(
+                    _make_select_label_ids_pipeline(
+                        sample_collection,
+                        field,
+                        label_ids,
+                        filter_expr=filter_expr,
+                    )
+                )
+        elif filter_expr is not None:
             for field in fields:
                 stage = FilterLabels(field, filter_expr, only_matches=False)
                 stage.validate(sample_collection)
@@ -6687,6 +6654,12 @@ class Shuffle(ViewStage):
         stage = fo.Shuffle(seed=51)
         view = dataset.add_stage(stage)
 
+    When this stage is applied directly to a non-grouped dataset that has an
+    index on its ``_rand`` field, which can be created via
+    ``dataset.create_index("_rand")``, the samples are read in randomly
+    ordered buckets of the index, so that large datasets can be shuffled
+    without sorting all of their samples at once.
+
     Args:
         seed (None): an optional random seed to use when shuffling the samples
     """
@@ -6700,7 +6673,40 @@ class Shuffle(ViewStage):
         """The random seed to use, or ``None``."""
         return self._seed
 
-    def to_mongo(self, _):
+    def to_mongo(self, sample_collection):
+        bounds = _get_rand_bounds(sample_collection)
+        if bounds is None:
+            return self._shuffle_pipeline()
+
+        # Reads the `_rand` index in buckets whose order is randomized, and
+        # shuffles the samples within each bucket
+        rand_min, rand_max = bounds
+        num_buckets = _NUM_SHUFFLE_BUCKETS if rand_max > rand_min else 1
+        step = (rand_max - rand_min) / num_buckets
+
+        buckets = list(range(num_buckets))
+        random.Random(self._randint).shuffle(buckets)
+
+        coll_name = sample_collection._dataset._sample_collection_name
+        pipeline = None
+        for idx in buckets:
+            rand_range = {"$gte": rand_min + idx * step}
+            if idx < num_buckets - 1:
+                rand_range["$lt"] = rand_min + (idx + 1) * step
+
+            _pipeline = [{"$match": {"_rand": rand_range}}]
+            _pipeline.extend(self._shuffle_pipeline())
+
+            if pipeline is None:
+                pipeline = _pipeline
+            else:
+                pipeline.append(
+                    {"$unionWith": {"coll": coll_name, "pipeline": _pipeline}}
+                )
+
+        return pipeline
+
+    def _shuffle_pipeline(self):
         # @todo can we avoid creating a new field here?
         return [
             {
@@ -6860,12 +6866,24 @@ class SortBy(ViewStage):
         create_index (True): whether to create an index, if necessary, to
             optimize the sort. Only applicable when sorting by field(s), not
             expressions
+        materialize (False): whether to sort by the stored values of any sort
+            expression(s) whose sort keys were created via
+            :meth:`fiftyone.core.dataset.Dataset.create_sort_keys` and are
+            up-to-date. Only applicable to expressions that follow only stages
+            that filter or reorder samples
     """
 
-    def __init__(self, field_or_expr, reverse=False, create_index=True):
+    def __init__(
+        self,
+        field_or_expr,
+        reverse=False,
+        create_index=True,
+        materialize=False,
+    ):
         self._field_or_expr = field_or_expr
         self._reverse = reverse
         self._create_index = create_index
+        self._materialize = materialize
 
     @property
     def field_or_expr(self):
@@ -6882,8 +6900,13 @@ class SortBy(ViewStage):
         """Whether to create an index, if necessary, to optimize the sort."""
         return self._create_index
 
+    @property
+    def materialize(self):
+        """Whether to sort by the stored values of sort expressions."""
+        return self._materialize
+
     def to_mongo(self, sample_collection):
-        field_or_expr = self._get_mongo_field_or_expr()
+        field_or_expr = self._get_materialized_field_or_expr(sample_collection)
 
         if not isinstance(field_or_expr, (list, tuple)):
             field_or_expr = [(field_or_expr, 1)]
@@ -6954,11 +6977,50 @@ class SortBy(ViewStage):
     def _get_mongo_field_or_expr(self):
         return _serialize_sort_expr(self._field_or_expr)
 
+    def _get_materialized_field_or_expr(self, sample_collection):
+        field_or_expr = self._get_mongo_field_or_expr()
+
+        if not self._materialize:
+            return field_or_expr
+
+        # Sort keys are computed from the raw samples, so any previous stages
+        # must not modify their contents
+        if isinstance(sample_collection, fod.Dataset):
+            dataset = sample_collection
+        elif all(fov._is_materializable(s) for s in sample_collection._stages):
+            dataset = sample_collection._dataset
+        else:
+            return field_or_expr
+
+        is_list = isinstance(field_or_expr, (list, tuple))
+        if not is_list:
+            field_or_expr = [(field_or_expr, 1)]
+
+        if all(etau.is_str(expr) for expr, _ in field_or_expr):
+            sort_keys = set()
+        else:
+            sort_keys = dataset._get_sort_keys()
+
+        _field_or_expr = []
+        for expr, order in field_or_expr:
+            if not etau.is_str(expr):
+                field_name = fod._get_sort_key_field(expr)
+                if field_name in sort_keys:
+                    expr = field_name
+
+            _field_or_expr.append((expr, order))
+
+        if not is_list:
+            return _field_or_expr[0][0]
+
+        return _field_or_expr
+
     def _kwargs(self):
         return [
             ["field_or_expr", self._get_mongo_field_or_expr()],
             ["reverse", self._reverse],
             ["create_index", self._create_index],
+            ["materialize", self._materialize],
         ]
 
     @classmethod
@@ -6981,6 +7043,12 @@ class SortBy(ViewStage):
                 "default": "True",
                 "placeholder": "create_index (default=True)",
             },
+            {
+                "name": "materialize",
+                "type": "bool",
+                "default": "False",
+                "placeholder": "materialize (default=False)",
+            },
         ]
 
     def validate(self, sample_collection):
@@ -7337,6 +7405,11 @@ class Take(ViewStage):
         stage = fo.Take(2, seed=51)
         view = dataset.add_stage(stage)
 
+    When this stage is applied directly to a non-grouped dataset that has an
+    index on its ``_rand`` field, which can be created via
+    ``dataset.create_index("_rand")``, the samples are read from a random
+    window of the index rather than by sorting the entire dataset.
+
     Args:
         size: the number of samples to return. If a non-positive number is
             provided, an empty view is returned
@@ -7358,10 +7431,36 @@ class Take(ViewStage):
         """The random seed to use, or ``None``."""
         return self._seed
 
-    def to_mongo(self, _):
+    def to_mongo(self, sample_collection):
         if self._size <= 0:
             return [{"$match": {"_id": None}}]
 
+        bounds = _get_rand_bounds(sample_collection)
+        if bounds is not None:
+            # Reads the `size` samples that follow a random point of the
+            # `_rand` index, wrapping around if necessary
+            rand_min, rand_max = bounds
+            rand = random.Random(self._randint).random()
+            start = rand_min + rand * (rand_max - rand_min)
+            coll_name = sample_collection._dataset._sample_collection_name
+
+            return [
+                {"$match": {"_rand": {"$gte": start}}},
+                {"$sort": {"_rand": 1}},
+                {"$limit": self._size},
+                {
+                    "$unionWith": {
+                        "coll": coll_name,
+                        "pipeline": [
+                            {"$match": {"_rand": {"$lt": start}}},
+                            {"$sort": {"_rand": 1}},
+                            {"$limit": self._size},
+                        ],
+                    }
+                },
+                {"$limit": self._size},
+            ]
+
         # @todo can we avoid creating a new field here?
         return [
             {
@@ -7470,27 +7569,15 @@ class ToPatches(ViewStage):
             "config": self._config,
         }
 
-        last_state = deepcopy(self._state)
-        if last_state is not None:
-            name = last_state.pop("name", None)
-        else:
-            name = None
-
-        if state != last_state or not fod.dataset_exists(name):
-            kwargs = self._config or {}
-            patches_dataset = fop.make_patches_dataset(
+        kwargs = self._config or {}
+        patches_dataset = _load_generated_dataset(
+            self,
+            sample_collection,
+            state,
+            lambda: fop.make_patches_dataset(
                 sample_collection, self._field, **kwargs
-            )
-
-            # Other views may use the same generated dataset, so reuse the old
-            # name if possible
-            if name is not None and state == last_state:
-                patches_dataset.name = name
-
-            state["name"] = patches_dataset.name
-            self._state = state
-        else:
-            patches_dataset = fod.load_dataset(name)
+            ),
+        )
 
         return fop.PatchesView(sample_collection, self, patches_dataset)
 
@@ -7614,27 +7701,15 @@ class ToEvaluationPatches(ViewStage):
             "config": self._config,
         }
 
-        last_state = deepcopy(self._state)
-        if last_state is not None:
-            name = last_state.pop("name", None)
-        else:
-            name = None
-
-        if state != last_state or not fod.dataset_exists(name):
-            kwargs = self._config or {}
-            eval_patches_dataset = fop.make_evaluation_patches_dataset(
+        kwargs = self._config or {}
+        eval_patches_dataset = _load_generated_dataset(
+            self,
+            sample_collection,
+            state,
+            lambda: fop.make_evaluation_patches_dataset(
                 sample_collection, self._eval_key, **kwargs
-            )
-
-            # Other views may use the same generated dataset, so reuse the old
-            # name if possible
-            if name is not None and state == last_state:
-                eval_patches_dataset.name = name
-
-            state["name"] = eval_patches_dataset.name
-            self._state = state
-        else:
-            eval_patches_dataset = fod.load_dataset(name)
+            ),
+        )
 
         return fop.EvaluationPatchesView(
             sample_collection, self, eval_patches_dataset
@@ -7771,27 +7846,15 @@ class ToClips(ViewStage):
             "config": self._config,
         }
 
-        last_state = deepcopy(self._state)
-        if last_state is not None:
-            name = last_state.pop("name", None)
-        else:
-            name = None
-
-        if state != last_state or not fod.dataset_exists(name):
-            kwargs = self._config or {}
-            clips_dataset = focl.make_clips_dataset(
+        kwargs = self._config or {}
+        clips_dataset = _load_generated_dataset(
+            self,
+            sample_collection,
+            state,
+            lambda: focl.make_clips_dataset(
                 sample_collection, self._field_or_expr, **kwargs
-            )
-
-            # Other views may use the same generated dataset, so reuse the old
-            # name if possible
-            if name is not None and state == last_state:
-                clips_dataset.name = name
-
-            state["name"] = clips_dataset.name
-            self._state = state
-        else:
-            clips_dataset = fod.load_dataset(name)
+            ),
+        )
 
         return focl.ClipsView(sample_collection, self, clips_dataset)
 
@@ -7905,22 +7968,16 @@ class ToTrajectories(ViewStage):
             "config": self._config,
         }
 
-        last_state = deepcopy(self._state)
-        if last_state is not None:
-            name = last_state.pop("name", None)
-        else:
-            name = None
-
-        if state != last_state or not fod.dataset_exists(name):
-            kwargs = self._config or {}
-            clips_dataset = focl.make_clips_dataset(
+        kwargs = self._config or {}
+        clips_dataset = _load_generated_dataset(
+            self,
+            sample_collection,
+            state,
+            lambda: focl.make_clips_dataset(
                 sample_collection, self._field, trajectories=True, **kwargs
-            )
-
-            state["name"] = clips_dataset.name
-            self._state = state
-        else:
-            clips_dataset = fod.load_dataset(name)
+            ),
+            reuse_name=False,
+        )
 
         return focl.TrajectoriesView(sample_collection, self, clips_dataset)
 
@@ -8089,27 +8146,13 @@ class ToFrames(ViewStage):
             "config": self._config,
         }
 
-        last_state = deepcopy(self._state)
-        if last_state is not None:
-            name = last_state.pop("name", None)
-        else:
-            name = None
-
-        if state != last_state or not fod.dataset_exists(name):
-            kwargs = self._config or {}
-            frames_dataset = fovi.make_frames_dataset(
-                sample_collection, **kwargs
-            )
-
-            # Other views may use the same generated dataset, so reuse the old
-            # name if possible
-            if name is not None and state == last_state:
-                frames_dataset.name = name
-
-            state["name"] = frames_dataset.name
-            self._state = state
-        else:
-            frames_dataset = fod.load_dataset(name)
+        kwargs = self._config or {}
+        frames_dataset = _load_generated_dataset(
+            self,
+            sample_collection,
+            state,
+            lambda: fovi.make_frames_dataset(sample_collection, **kwargs),
+        )
 
         return fovi.FramesView(sample_collection, self, frames_dataset)
 
@@ -8132,6 +8175,76 @@ class ToFrames(ViewStage):
         ]
 
 
+def _load_generated_dataset(
+    stage, sample_collection, state, make_dataset, reuse_name=True
+):
+    # Loads the generated dataset for a stage like `ToPatches` with the given
+    # `state`, either from the stage's last state, from the cache of generated
+    # datasets, or by calling `make_dataset()`
+    last_state = deepcopy(stage._state)
+    if last_state is not None:
+        name = last_state.pop("name", None)
+    else:
+        name = None
+
+    if state == last_state and name is not None:
+        # The dataset may have been deleted since it was last loaded, in
+        # which case it is regenerated below
+        try:
+            dataset = fod.load_dataset(name)
+        except ValueError:
+            dataset = None
+
+        if dataset is not None:
+            fod._touch_generated_dataset(name)
+            fod._use_generated_dataset(stage, dataset)
+            return dataset
+
+    # Datasets that were explicitly named are not cached
+    config = state.get("config", None) or {}
+    use_cache = config.get("name", None) is None
+
+    if use_cache:
+        key = _get_generated_dataset_key(stage, sample_collection, state)
+        dataset = fod._load_cached_generated_dataset(key)
+    else:
+        dataset = None
+
+    if dataset is None:
+        dataset = make_dataset()
+
+        # Other views may use the same generated dataset, so reuse the old
+        # name if possible
+        if reuse_name and name is not None and state == last_state:
+            dataset.name = name
+
+        # Generating the dataset may have modified the source collection, e.g.,
+        # by sampling video frames
+        if use_cache:
+            key = _get_generated_dataset_key(stage, sample_collection, state)
+            fod._cache_generated_dataset(dataset, key)
+
+    state["name"] = dataset.name
+    stage._state = state
+    fod._use_generated_dataset(stage, dataset)
+
+    return dataset
+
+
+def _get_generated_dataset_key(stage, sample_collection, state):
+    # Generated datasets are valid as long as their source datasets have not
+    # been modified
+    d = {
+        "stage": etau.get_class_name(stage),
+        "state": state,
+        "write_counts": [
+            sample_collection._dataset._get_write_count(),
+            sample_collection._root_dataset._get_write_count(),
+        ],
+    }
+    return hashlib.md5(json_util.dumps(d, sort_keys=True).encode()).hexdigest()
+
+
 def _parse_sample_ids(arg):
     if etau.is_str(arg):
         return [arg], False
@@ -8214,6 +8327,182 @@ def _get_group_id(sample_or_group):
     raise ValueError("Sample '%s' has no group" % sample.id)
 
 
+def _make_select_values_pipeline(
+    stage, path, values, ordered=False, exclude=False
+):
+    # `stage` is any object on which to cache the name of the values
+    # collection, if one is used
+    num_values = len(values)
+    use_collection = num_values > _MAX_INLINE_VALUES or (
+        ordered and num_values > _MAX_INLINE_ORDERED_VALUES
+    )
+
+    if use_collection:
+        try:
+            coll_name = foo.create_values_collection(
+                values, collection_name=getattr(stage, "_values_coll", None)
+            )
+            stage._values_coll = coll_name
+        except TypeError:
+            # values are not hashable
+            use_collection = False
+
+    if not use_collection:
+        if exclude:
+            return [{"$match": {path: {"$not": {"$in": values}}}}]
+
+        pipeline = [{"$match": {path: {"$in": values}}}]
+
+        if ordered:
+            pipeline.extend(
+                [
+                    {
+                        "$addFields": {
+                            "_select_order": {
+                                "$indexOfArray": [values, "$" + path]
+                            }
+                        }
+                    },
+                    {"$sort": {"_select_order": 1}},
+                    {"$project": {"_select_order": False}},
+                ]
+            )
+
+        return pipeline
+
+    # Large lists of values are joined from a collection rather than being
+    # embedded in the pipeline
+    pipeline = []
+
+    if not exclude and num_values <= _MAX_INLINE_VALUES:
+        pipeline.append({"$match": {path: {"$in": values}}})
+
+    pipeline.extend(
+        _make_lookup_values_pipeline(
+            coll_name,
+            path,
+            ordered=ordered,
+            exclude=exclude,
+            match=num_values > _MAX_INLINE_VALUES,
+        )
+    )
+
+    return pipeline
+
+
+def _make_lookup_values_pipeline(
+    coll_name, path, ordered=False, exclude=False, match=True
+):
+    # Selects the documents whose `path` is an `_id` in the `coll_name`
+    # collection, sorted by its `index` field if `ordered` is True. If `match`
+    # is False, the documents are assumed to have already been selected
+    pipeline = [
+        {
+            "$lookup": {
+                "from": coll_name,
+                "localField": path,
+                "foreignField": "_id",
+                "as": "_select_values",
+            }
+        }
+    ]
+
+    if exclude:
+        pipeline.append({"$match": {"_select_values": {"$size": 0}}})
+    elif match:
+        pipeline.append({"$match": {"_select_values": {"$ne": []}}})
+
+    if ordered:
+        pipeline.extend(
+            [
+                {
+                    "$addFields": {
+                        "_select_order": {"$min": "$_select_values.index"}
+                    }
+                },
+                {"$sort": {"_select_order": 1}},
+                {
+                    "$project": {
+                        "_select_values": False,
+                        "_select_order": False,
+                    }
+                },
+            ]
+        )
+    else:
+        pipeline.append({"$project": {"_select_values": False}})
+
+    return pipeline
+
+
+def _make_select_label_ids_pipeline(
+    sample_collection, field, label_ids, filter_expr=None
+):
+    pipeline = []
+
+    if len(label_ids) > _MAX_INLINE_VALUES:
+        # Large lists of IDs are joined from a collection rather than being
+        # embedded in the pipeline
+        path, _ = sample_collection._get_label_field_root(field)
+        coll_name = foo.create_values_collection(label_ids)
+        pipeline.append(
+            {
+                "$lookup": {
+                    "from": coll_name,
+                    "localField": path + "._id",
+                    "foreignField": "_id",
+                    "as": "_select_labels",
+                }
+            }
+        )
+        label_filter = foe.ViewExpression(
+            {"$in": [F("_id"), F("$_select_labels._id")]}
+        )
+    else:
+        label_filter = F("_id").is_in(label_ids)
+
+    if filter_expr is not None:
+        label_filter &= filter_expr
+
+    stage = FilterLabels(field, label_filter, only_matches=False)
+    stage.validate(sample_collection)
+    pipeline.extend(stage.to_mongo(sample_collection))
+
+    if len(label_ids) > _MAX_INLINE_VALUES:
+        pipeline.append({"$project": {"_select_labels": False}})
+
+    return pipeline
+
+
+def _get_rand_bounds(sample_collection):
+    # Index-backed sampling is only possible when the stage is applied
+    # directly to a non-grouped dataset whose `_rand` field is indexed
+    if isinstance(sample_collection, fov.DatasetView):
+        if sample_collection._stages:
+            return None
+
+    if sample_collection.media_type == fom.GROUP:
+        return None
+
+    coll = sample_collection._dataset._sample_collection
+    index_keys = [
+        list(info["key"]) for info in coll.index_information().values()
+    ]
+    if [("_rand", 1)] not in index_keys:
+        return None
+
+    kwargs = dict(
+        projection={"_id": False, "_rand": True}, hint=[("_rand", 1)]
+    )
+    doc_min = coll.find_one(sort=[("_rand", 1)], **kwargs)
+    doc_max = coll.find_one(sort=[("_rand", -1)], **kwargs)
+
+    if doc_min is None or doc_max is None:
+        return None
+
+    return doc_min["_rand"], doc_max["_rand"]
+
+
 def _get_rng(seed):
     if seed is None:
         return random
@@ -8466,6 +8755,13 @@ _repr.maxset = 3
 _repr.maxstring = 30
 _repr.maxother = 30
 
+_NUM_SHUFFLE_BUCKETS = 32
+
+# Lists of values larger than this are joined from a temporary collection
+# rather than being embedded in pipelines
+_MAX_INLINE_VALUES = 100000
+_MAX_INLINE_ORDERED_VALUES = 1000
+
 # Simple registry for the server to grab available view stages
 _STAGES = [
     Concat,
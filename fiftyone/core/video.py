@@ -292,7 +292,13 @@ class FramesView(fov.DatasetView):
         # This assumes that calling `load_view()` when the current patches
         # dataset has been deleted will cause a new one to be generated
         #
-        self._frames_dataset.delete()
+        # Cached datasets may be shared by other views, so they are left for
+        # eviction rather than being deleted
+        if fod._is_cached_generated_dataset(self._frames_dataset):
+            self._frames_stage._state = None
+        elif not self._frames_dataset.deleted:
+            self._frames_dataset.delete()
+
         _view = self._frames_stage.load_view(self._source_collection)
         self._frames_dataset = _view._frames_dataset
 
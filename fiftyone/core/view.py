@@ -56,6 +56,9 @@ class DatasetView(foc.SampleCollection):
             view
     """
 
+    # the stored result of a materialized saved view, if any
+    _materialized = None
+
     def __init__(
         self,
         dataset,
@@ -63,6 +66,7 @@ class DatasetView(foc.SampleCollection):
         _media_type=None,
         _group_slice=None,
         _name=None,
+        _materialized=None,
     ):
         if _stages is None:
             _stages = []
@@ -72,6 +76,7 @@ class DatasetView(foc.SampleCollection):
         self.__media_type = _media_type
         self.__group_slice = _group_slice
         self.__name = _name
+        self._materialized = _materialized
 
     def __eq__(self, other):
         if type(other) != type(self):
@@ -130,6 +135,7 @@ class DatasetView(foc.SampleCollection):
             _media_type=self.__media_type,
             _group_slice=self.__group_slice,
             _name=self.__name,
+            _materialized=self._materialized,
         )
 
     @property
@@ -677,35 +683,14 @@ class DatasetView(foc.SampleCollection):
         make_sample = self._make_sample_fcn()
         index = 0
 
-        group_field = self.group_field
-        curr_id = None
-        group = {}
+        id_field = self.group_field + "._id"
+        docs = self._aggregate(post_pipeline=[{"$project": {id_field: True}}])
 
         try:
-            for d in self._aggregate(
-                detach_frames=True, groups_only=True, group_slices=group_slices
+            for group in self._dataset._hydrate_groups(
+                docs, make_sample, group_slices=group_slices
             ):
-                sample = make_sample(d)
-
-                group_id = sample[group_field].id
-                if curr_id is None:
-                    # First overall element
-                    curr_id = group_id
-                    group[sample[group_field].name] = sample
-                elif group_id == curr_id:
-                    # Add element to group
-                    group[sample[group_field].name] = sample
-                else:
-                    # Flush last group
-                    index += 1
-                    yield group
-
-                    # First element of new group
-                    curr_id = group_id
-                    group = {}
-                    group[sample[group_field].name] = sample
-
-            if group:
+                index += 1
                 yield group
         except CursorNotFound:
             # The cursor has timed out so we yield from a new one after
@@ -1481,7 +1466,19 @@ class DatasetView(foc.SampleCollection):
         _attach_groups_idx = None
 
         idx = 0
-        for stage in self._stages:
+        _stages = self._stages
+
+        # Substitute the stored result of a materialized saved view, if any
+        if self._materialized is not None:
+            num_stages = self._materialized.num_stages
+            for stage in _stages[:num_stages]:
+                _view = _view._add_view_stage(stage, validate=False)
+
+            _pipelines.append(self._materialized.to_mongo())
+            _stages = _stages[num_stages:]
+            idx += 1
+
+        for stage in _stages:
             if isinstance(stage, fost.SelectGroupSlices):
                 # We might need to reattach frames after `SelectGroupSlices`,
                 # since it involves a `$lookup` that resets the samples
@@ -1731,6 +1728,22 @@ class DatasetView(foc.SampleCollection):
     def _set_name(self, name):
         self.__name = name
 
+    def _set_materialized(self, materialized):
+        self._materialized = materialized
+
+    def _get_num_materializable_stages(self):
+        if self._dataset.media_type == fom.GROUP:
+            return 0
+
+        num_stages = 0
+        for stage in self._stages:
+            if not _is_materializable(stage):
+                break
+
+            num_stages += 1
+
+        return num_stages
+
     def _get_filtered_schema(self, schema, frames=False):
         if schema is None:
             return None
@@ -1818,6 +1831,20 @@ class DatasetView(foc.SampleCollection):
         filtered_fields = self._get_filtered_fields(frames=frames)
         return not any((selected_fields, excluded_fields, filtered_fields))
 
+    def _get_frame_summaries(self):
+        if (
+            self.media_type != fom.VIDEO
+            or self._dataset.media_type != fom.VIDEO
+        ):
+            return {}
+
+        # Frame summaries describe entire samples, so they can only be used
+        # when the view does not modify the contents of its samples
+        if not all(_is_materializable(stage) for stage in self._stages):
+            return {}
+
+        return self._dataset._get_frame_summaries()
+
     def _get_group_media_types(self):
         for stage in reversed(self._stages):
             if isinstance(stage, fost.SelectGroupSlices):
@@ -1826,6 +1853,37 @@ class DatasetView(foc.SampleCollection):
         return self._dataset.group_media_types
 
 
+class MaterializedResult(object):
+    """The stored result of the first ``num_stages`` stages of a materialized
+    saved view.
+
+    Args:
+        num_stages: the number of view stages whose output is stored
+        collection_name: the name of the collection that stores the sample IDs
+        ordered: whether the order of the stored sample IDs, as defined by
+            their ``index`` field, must be preserved
+    """
+
+    def __init__(self, num_stages, collection_name, ordered):
+        self.num_stages = num_stages
+        self.collection_name = collection_name
+        self.ordered = ordered
+
+    def to_mongo(self):
+        """Returns the MongoDB aggregation pipeline that selects the stored
+        samples.
+
+        The samples are joined against the stored collection, so the sample
+        IDs are never loaded into memory.
+
+        Returns:
+            a MongoDB aggregation pipeline (list of dicts)
+        """
+        return fost._make_lookup_values_pipeline(
+            self.collection_name, "_id", ordered=self.ordered
+        )
+
+
 def make_optimized_select_view(
     sample_collection,
     sample_ids,
@@ -2013,3 +2071,72 @@ def _filter_embedded_field_schema(
         _filter_embedded_field_schema(
             _field, _path, selected_fields, excluded_fields
         )
+
+
+def _is_materializable(stage):
+    # Stages that only select and/or sort samples, so their output is fully
+    # described by an ordered list of sample IDs
+    if isinstance(stage, fost.SortBySimilarity):
+        return stage.dist_field is None
+
+    return isinstance(
+        stage,
+        (
+            fost.Exclude,
+            fost.ExcludeBy,
+            fost.Exists,
+            fost.GeoWithin,
+            fost.Limit,
+            fost.Match,
+            fost.MatchLabels,
+            fost.MatchTags,
+            fost.Select,
+            fost.SelectBy,
+            fost.Shuffle,
+            fost.Skip,
+            fost.SortBy,
+            fost.Take,
+        ),
+    )
+
+
+def _is_sample_wise(stage):
+    # Stages whose output for each sample depends only on that sample, so
+    # they can be applied to any subset of the samples independently
+    return isinstance(
+        stage,
+        (
+            fost.Exclude,
+            fost.ExcludeBy,
+            fost.ExcludeFields,
+            fost.ExcludeFrames,
+            fost.ExcludeLabels,
+            fost.Exists,
+            fost.FilterField,
+            fost.FilterKeypoints,
+            fost.FilterLabels,
+            fost.GeoWithin,
+            fost.LimitLabels,
+            fost.MapLabels,
+            fost.Match,
+            fost.MatchFrames,
+            fost.MatchLabels,
+            fost.MatchTags,
+            fost.Select,
+            fost.SelectBy,
+            fost.SelectFields,
+            fost.SelectFrames,
+            fost.SelectLabels,
+            fost.SetField,
+            fost.SortBy,
+        ),
+    )
+
+
+def _is_ordering_stage(stage):
+    if isinstance(stage, (fost.Select, fost.SelectBy)):
+        return stage.ordered
+
+    return isinstance(
+        stage, (fost.Shuffle, fost.SortBy, fost.SortBySimilarity, fost.Take)
+    )
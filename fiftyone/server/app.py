@@ -27,8 +27,10 @@ import strawberry as gql
 
 import fiftyone as fo
 import fiftyone.constants as foc
+from fiftyone.server.compression import CompressionMiddleware
 from fiftyone.server.constants import SCALAR_OVERRIDES
 from fiftyone.server.context import GraphQL
+from fiftyone.server.events import start_database_listener
 from fiftyone.server.extensions import EndSession
 from fiftyone.server.mutation import Mutation
 from fiftyone.server.query import Query
@@ -111,8 +113,10 @@ app = Starlette(
             ],
         ),
         Middleware(HeadersMiddleware),
+        Middleware(CompressionMiddleware),
     ],
     debug=True,
+    on_startup=[start_database_listener],
     routes=[Route(route, endpoint) for route, endpoint in routes]
     + [
         Route(
@@ -0,0 +1,176 @@
+"""
+FiftyOne Server response compression.
+
+| Copyright 2017-2024, Voxel51, Inc.
+| `voxel51.com <https://voxel51.com/>`_
+|
+"""
+
+import gzip
+import typing as t
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+_COMPRESSIBLE_TYPES = {
+    "application/graphql-response+json",
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+    "text/css",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+}
+
+
+class CompressionMiddleware:
+    """ASGI middleware that compresses JSON and text responses with Brotli or
+    gzip, as negotiated via the request's ``Accept-Encoding`` header.
+
+    Brotli is only used if the ``brotli`` package is installed. Responses that
+    are already encoded, ranged, streamed as server-sent events, or smaller
+    than ``minimum_size`` are sent as-is.
+
+    Args:
+        app: the ASGI app
+        minimum_size (1024): the minimum response size, in bytes, to compress
+        gzip_level (6): the gzip compression level
+        brotli_quality (4): the Brotli compression quality
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        encoding = None
+        if "range" not in headers:
+            encoding = negotiate_encoding(headers.get("accept-encoding", ""))
+
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        """Compresses the given bytes.
+
+        Args:
+            body: the bytes
+            encoding: the encoding, ``"br"`` or ``"gzip"``
+
+        Returns:
+            the compressed bytes
+        """
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+
+def negotiate_encoding(accept_encoding: str) -> t.Optional[str]:
+    """Chooses a response encoding given an ``Accept-Encoding`` header.
+
+    Args:
+        accept_encoding: the ``Accept-Encoding`` header value
+
+    Returns:
+        ``"br"``, ``"gzip"``, or None
+    """
+    accepted = set()
+    for token in accept_encoding.split(","):
+        name, *params = [p.strip() for p in token.split(";")]
+        qvalue = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    qvalue = float(param[2:])
+                except ValueError:
+                    qvalue = 0.0
+
+        if name and qvalue > 0:
+            accepted.add(name.lower())
+
+    if brotli is not None and "br" in accepted:
+        return "br"
+
+    if "gzip" in accepted:
+        return "gzip"
+
+    return None
+
+
+class _CompressionResponder:
+    def __init__(
+        self, middleware: CompressionMiddleware, encoding: str, send: Send
+    ) -> None:
+        self._middleware = middleware
+        self._encoding = encoding
+        self._send = send
+        self._start: t.Optional[Message] = None
+        self._compress = False
+        self._chunks: t.List[bytes] = []
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            content_type = content_type.split(";")[0].strip().lower()
+            self._compress = (
+                "content-encoding" not in headers
+                and "content-range" not in headers
+                and content_type in _COMPRESSIBLE_TYPES
+            )
+
+            if not self._compress:
+                await self._send(message)
+            else:
+                self._start = message
+
+            return
+
+        if message["type"] != "http.response.body" or not self._compress:
+            await self._send(message)
+            return
+
+        self._chunks.append(message.get("body", b""))
+        if message.get("more_body", False):
+            return
+
+        body = b"".join(self._chunks)
+        self._chunks = []
+
+        if len(body) >= self._middleware.minimum_size:
+            body = self._middleware.compress(body, self._encoding)
+
+            # copy the raw headers, which may be shared with the response
+            self._start["headers"] = list(self._start["headers"])
+            headers = MutableHeaders(raw=self._start["headers"])
+            headers["Content-Encoding"] = self._encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+
+        await self._send(self._start)
+        await self._send({"type": "http.response.body", "body": body})
@@ -7,6 +7,7 @@ FiftyOne Server events.
 """
 
 from .dispatch import dispatch_event
+from .changes import start_database_listener
 from .listener import add_event_listener
 from .polling import dispatch_polling_event_listener
 from .state import get_state, set_port
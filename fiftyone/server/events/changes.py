@@ -0,0 +1,250 @@
+"""
+FiftyOne Server database change events.
+
+| Copyright 2017-2024, Voxel51, Inc.
+| `voxel51.com <https://voxel51.com/>`_
+|
+"""
+
+import asyncio
+import logging
+import typing as t
+
+from bson import json_util
+from pymongo.errors import OperationFailure, PyMongoError
+
+import fiftyone.core.odm as foo
+from fiftyone.core.session.events import Refresh
+import fiftyone.core.utils as fou
+
+from fiftyone.server.events.dispatch import dispatch_event
+from fiftyone.server.events.state import get_listeners, get_state
+
+
+logger = logging.getLogger(__name__)
+
+_POLLING_INTERVAL = 2  # seconds
+_IGNORED_DATASET_FIELDS = {
+    "frame_summaries",
+    "generated_key",
+    "generated_last_used_at",
+    "last_loaded_at",
+    "sort_keys",
+    "write_count",
+}
+
+_task: t.Optional[asyncio.Task] = None
+
+
+async def start_database_listener() -> None:
+    """Starts a background task that pushes changes to the current dataset,
+    its saved views, and its workspaces to all App listeners.
+
+    MongoDB change streams are used when the database supports them (replica
+    sets), otherwise the database is polled.
+    """
+    global _task
+    if _task is None or _task.done():
+        _task = asyncio.get_running_loop().create_task(
+            listen_for_database_changes()
+        )
+
+
+async def listen_for_database_changes() -> None:
+    """Listens for database changes that affect the server's state and
+    dispatches a :class:`fiftyone.core.session.events.Refresh` event when
+    they occur.
+
+    Bursts of writes are coalesced into a single event.
+    """
+    while True:
+        try:
+            await _watch_changes()
+        except OperationFailure as e:
+            # change streams are only available on replica sets
+            logger.debug("Change streams unavailable (%s); polling instead", e)
+            await _poll_changes()
+        except PyMongoError as e:
+            # e.g. the connection was lost, so restart the change stream
+            logger.debug("Change stream failed (%s); restarting", e)
+            await asyncio.sleep(_POLLING_INTERVAL)
+
+
+async def _watch_changes() -> None:
+    db = foo.get_async_db_conn()
+    async with db.watch(_get_change_stream_pipeline()) as stream:
+        async for change in stream:
+            changes = [change]
+            while True:
+                change = await stream.try_next()
+                if change is None:
+                    break
+
+                changes.append(change)
+
+            if any(_affects_state(c) for c in changes):
+                await _dispatch_refresh()
+
+
+async def _poll_changes() -> None:
+    stamp = None
+    while True:
+        await asyncio.sleep(_POLLING_INTERVAL)
+
+        if not _has_listeners():
+            stamp = None
+            continue
+
+        try:
+            new_stamp = await fou.run_sync_task(_get_state_stamp)
+        except PyMongoError as e:
+            logger.debug("Failed to poll for database changes: %s", e)
+            continue
+
+        if stamp is not None and new_stamp is not None and new_stamp != stamp:
+            await _dispatch_refresh()
+
+        stamp = new_stamp
+
+
+def _get_change_stream_pipeline() -> t.List[t.Dict]:
+    # Updates to the datasets collection that only modify bookkeeping fields
+    # (e.g. write counts) are filtered out by the server
+    updated_fields = {
+        "$map": {
+            "input": {
+                "$objectToArray": {
+                    "$ifNull": ["$updateDescription.updatedFields", {}]
+                }
+            },
+            "as": "field",
+            "in": "$$field.k",
+        }
+    }
+    removed_fields = {"$ifNull": ["$updateDescription.removedFields", []]}
+    affects_state = {
+        "$anyElementTrue": [
+            {
+                "$map": {
+                    "input": {
+                        "$concatArrays": [updated_fields, removed_fields]
+                    },
+                    "as": "field",
+                    "in": {
+                        "$not": {
+                            "$in": [
+                                {
+                                    "$arrayElemAt": [
+                                        {"$split": ["$$field", "."]},
+                                        0,
+                                    ]
+                                },
+                                sorted(_IGNORED_DATASET_FIELDS),
+                            ]
+                        }
+                    },
+                }
+            }
+        ]
+    }
+
+    return [
+        {
+            "$match": {
+                "$or": [
+                    {"ns.coll": {"$in": ["views", "workspaces"]}},
+                    {
+                        "ns.coll": "datasets",
+                        "operationType": {"$ne": "update"},
+                    },
+                    {
+                        "ns.coll": "datasets",
+                        "operationType": "update",
+                        "$expr": affects_state,
+                    },
+                ]
+            }
+        }
+    ]
+
+
+def _has_listeners() -> bool:
+    return bool(get_listeners()[Refresh.get_event_name()])
+
+
+def _get_dataset_id():
+    state = get_state()
+    if state.dataset is None:
+        return None
+
+    return state.dataset._doc.id
+
+
+def _affects_state(change: t.Dict) -> bool:
+    dataset_id = _get_dataset_id()
+    if dataset_id is None or not _has_listeners():
+        return False
+
+    coll = change["ns"]["coll"]
+    if coll == "datasets":
+        if change["documentKey"]["_id"] != dataset_id:
+            return False
+
+        update = change.get("updateDescription", None)
+        if update is not None:
+            fields = list(update.get("updatedFields", {}).keys())
+            fields.extend(update.get("removedFields", []))
+            return any(
+                f.split(".", 1)[0] not in _IGNORED_DATASET_FIELDS
+                for f in fields
+            )
+
+        return True
+
+    # Changes are not watched with full documents, so saved views and
+    # workspaces are matched against those of the current dataset. Creations
+    # and deletions also edit the dataset document, which triggers its own
+    # change
+    _id = change["documentKey"]["_id"]
+    dataset_doc = get_state().dataset._doc
+    if coll == "views":
+        docs = dataset_doc.saved_views
+    else:
+        docs = dataset_doc.workspaces
+
+    return any(doc.id == _id for doc in docs)
+
+
+def _get_state_stamp() -> t.Optional[str]:
+    dataset_id = _get_dataset_id()
+    if dataset_id is None:
+        return None
+
+    conn = foo.get_db_conn()
+    dataset_doc = conn.datasets.find_one(
+        {"_id": dataset_id}, {f: False for f in _IGNORED_DATASET_FIELDS}
+    )
+    if dataset_doc is None:
+        return None
+
+    projection = {"name": True, "last_modified_at": True}
+    views = list(conn.views.find({"_dataset_id": dataset_id}, projection))
+    workspaces = list(
+        conn.workspaces.find({"_dataset_id": dataset_id}, projection)
+    )
+
+    return json_util.dumps([dataset_doc, views, workspaces], sort_keys=True)
+
+
+async def _dispatch_refresh() -> None:
+    state = get_state()
+    if state.dataset is None:
+        return
+
+    try:
+        await fou.run_sync_task(state.dataset.reload)
+    except ValueError:
+        # the dataset was deleted
+        return
+
+    await dispatch_event(None, Refresh(state=state))
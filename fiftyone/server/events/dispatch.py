@@ -76,3 +76,4 @@ async def dispatch_event(
             continue
 
         listener.queue.put_nowait((datetime.now(), event))
+        listener.notify.set()
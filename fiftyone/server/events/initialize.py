@@ -51,11 +51,15 @@ async def initialize_listener(payload: ListenPayload):
     if coroutine:
         await coroutine
 
+    # all of a request's listeners share one notification so that the request
+    # can wait on a single event
+    notify = asyncio.Event()
     request_listeners: t.Set[t.Tuple[str, Listener]] = set()
     for event_name in payload.events:
         listener = Listener(
             queue=asyncio.LifoQueue(maxsize=1000),
             subscription=payload.subscription,
+            notify=notify,
         )
         get_listeners()[event_name].add(listener)
         request_listeners.add((event_name, listener))
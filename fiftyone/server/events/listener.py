@@ -20,6 +20,7 @@ from fiftyone.core.session.events import (
     CloseSession,
     EventType,
     ListenPayload,
+    Refresh,
     StateUpdate,
     dict_factory,
 )
@@ -34,6 +35,9 @@ from fiftyone.server.events.state import (
 )
 
 
+_DISCONNECT_INTERVAL = 1  # seconds
+
+
 async def add_event_listener(
     request: Request, payload: ListenPayload
 ) -> t.AsyncIterator:
@@ -70,10 +74,10 @@ async def add_event_listener(
 
             events: t.List[t.Tuple[datetime, EventType]] = []
             for _, listener in data.request_listeners:
-                if listener.queue.qsize():
+                while listener.queue.qsize():
                     events.append(listener.queue.get_nowait())
 
-            events = sorted(events, key=lambda event: event[0])
+            events = _coalesce(sorted(events, key=lambda event: event[0]))
 
             for _, event in events:
                 if isinstance(event, StateUpdate):
@@ -87,7 +91,7 @@ async def add_event_listener(
                     ),
                 )
 
-            await asyncio.sleep(0.2)
+            await _wait(data.request_listeners)
 
     except asyncio.CancelledError as e:
         await _disconnect(data.is_app, data.request_listeners)
@@ -105,3 +109,35 @@ async def _disconnect(
 
         if get_app_count() and focx._get_context() == focx._NONE:
             await dispatch_event(None, CloseSession())
+
+
+async def _wait(listeners: t.Set[t.Tuple[str, Listener]]) -> None:
+    # a request's listeners share a notification, so any one of them will do.
+    # The timeout bounds how long a disconnect can go unnoticed
+    notify = next(iter(listeners))[1].notify if listeners else None
+    if notify is None:
+        await asyncio.sleep(_DISCONNECT_INTERVAL)
+        return
+
+    try:
+        await asyncio.wait_for(notify.wait(), timeout=_DISCONNECT_INTERVAL)
+    except asyncio.TimeoutError:
+        pass
+
+    notify.clear()
+
+
+def _coalesce(
+    events: t.List[t.Tuple[datetime, EventType]]
+) -> t.List[t.Tuple[datetime, EventType]]:
+    # state events carry the full state, so only the latest of each matters
+    last = {}
+    for idx, (_, event) in enumerate(events):
+        if isinstance(event, (Refresh, StateUpdate)):
+            last[type(event)] = idx
+
+    return [
+        (timestamp, event)
+        for idx, (timestamp, event) in enumerate(events)
+        if last.get(type(event), idx) == idx
+    ]
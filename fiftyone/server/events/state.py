@@ -7,7 +7,7 @@ FiftyOne Server events state.
 """
 
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import typing as t
 
 import asyncio
@@ -19,6 +19,7 @@ import fiftyone.core.state as fos
 class Listener:
     queue: asyncio.Queue
     subscription: str
+    notify: asyncio.Event = field(default_factory=asyncio.Event)
 
 
 _LISTENERS: t.Dict[str, t.Set[Listener]] = defaultdict(set)
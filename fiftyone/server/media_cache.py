@@ -0,0 +1,439 @@
+"""
+FiftyOne Server media cache.
+
+| Copyright 2017-2024, Voxel51, Inc.
+| `voxel51.com <https://voxel51.com/>`_
+|
+"""
+
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import logging
+import os
+import threading
+import time
+
+import eta.core.utils as etau
+
+import fiftyone as fo
+import fiftyone.core.media as fom
+import fiftyone.core.utils as fou
+
+fouim = fou.lazy_import("fiftyone.utils.image")
+fouv = fou.lazy_import("fiftyone.utils.video")
+
+
+logger = logging.getLogger(__name__)
+
+_BROWSER_IMAGE_EXTS = {
+    ".apng",
+    ".avif",
+    ".bmp",
+    ".gif",
+    ".jpeg",
+    ".jpg",
+    ".png",
+    ".svg",
+    ".webp",
+}
+_BROWSER_VIDEO_EXTS = {".mp4", ".webm"}
+_IMAGE_FORMATS = {"jpg": ".jpg", "jpeg": ".jpg", "webp": ".webp"}
+_VIDEO_EXT = ".mp4"
+
+_media_cache = None
+
+
+def get_media_cache():
+    """Returns the :class:`MediaCache` singleton configured by
+    ``fo.config.media_cache_dir`` and ``fo.config.media_cache_size_bytes``.
+
+    Returns:
+        a :class:`MediaCache`
+    """
+    global _media_cache
+
+    if (
+        _media_cache is None
+        or _media_cache.cache_dir != fo.config.media_cache_dir
+        or _media_cache.max_size_bytes != fo.config.media_cache_size_bytes
+    ):
+        _media_cache = MediaCache(
+            fo.config.media_cache_dir, fo.config.media_cache_size_bytes
+        )
+
+    return _media_cache
+
+
+def warm_media_cache(
+    sample_collection,
+    media_field="filepath",
+    width=None,
+    format=None,
+    num_workers=None,
+    progress=None,
+):
+    """Populates the App's media cache with the thumbnails and/or
+    browser-friendly proxies of the media in the given collection, so that
+    the App can serve them without generating them on demand.
+
+    The ``width`` and ``format`` must match those requested by the App for the
+    cached media to be used. The App's sample grid requests image thumbnails
+    with ``width=512`` and the default format, and browser-friendly proxies
+    of videos.
+
+    Args:
+        sample_collection: a
+            :class:`fiftyone.core.collections.SampleCollection`
+        media_field ("filepath"): the field containing the media paths
+        width (None): an optional thumbnail width, in pixels. By default, only
+            media that is not browser-friendly is cached, at full resolution
+        format (None): an optional image format for the cached images.
+            Supported values are ``("jpg", "webp")``. The default is ``"jpg"``
+        num_workers (None): a suggested number of threads to use
+        progress (None): whether to render a progress bar (True/False), use
+            the default value ``fiftyone.config.show_progress_bars`` (None), or
+            a progress callback function to invoke instead
+
+    Returns:
+        the number of media files that were added to the cache
+    """
+    filepaths = set(sample_collection.values(media_field))
+    filepaths.discard(None)
+
+    return get_media_cache().warm(
+        sorted(filepaths),
+        width=width,
+        format=format,
+        num_workers=num_workers,
+        progress=progress,
+    )
+
+
+class MediaCache(object):
+    """An on-disk cache of resized and/or re-encoded copies of media files.
+
+    Images are cached as JPEG or WebP thumbnails and videos as H.264 MP4
+    proxies. Cached files are keyed by their source path, size, and
+    modification time, so edited media is automatically regenerated. When the
+    cache exceeds its maximum size, the least recently used files are evicted.
+
+    Args:
+        cache_dir: the cache directory
+        max_size_bytes: the maximum size of the cache, in bytes
+        num_workers (None): a suggested number of threads to use to generate
+            media
+    """
+
+    def __init__(self, cache_dir, max_size_bytes, num_workers=None):
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+
+        self._num_workers = fou.recommend_thread_pool_workers(num_workers)
+        self._executor = None
+        self._index = None
+        self._size = 0
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    @property
+    def size_bytes(self):
+        """The current size of the cache, in bytes."""
+        with self._lock:
+            self._ensure_index()
+            return self._size
+
+    def get_cache_path(self, filepath, width=None, format=None):
+        """Returns the path at which the cached version of the given media
+        would be stored.
+
+        Args:
+            filepath: the path to the source media
+            width (None): an optional thumbnail width, in pixels
+            format (None): an optional image format, ``"jpg"`` or ``"webp"``
+
+        Returns:
+            the cache path, or None if the media can be served as-is
+        """
+        ext = os.path.splitext(filepath)[1].lower()
+        media_type = fom.get_media_type(filepath)
+
+        if media_type == fom.IMAGE:
+            if width is None and format is None and ext in _BROWSER_IMAGE_EXTS:
+                return None
+
+            out_ext = _parse_format(format)
+        elif media_type == fom.VIDEO:
+            if width is None and ext in _BROWSER_VIDEO_EXTS:
+                return None
+
+            out_ext = _VIDEO_EXT
+        else:
+            return None
+
+        st = os.stat(filepath)
+        key = "%s:%d:%d:%s" % (filepath, st.st_mtime_ns, st.st_size, width)
+        key = hashlib.sha1(key.encode()).hexdigest()
+
+        return os.path.join(self.cache_dir, key[:2], key + out_ext)
+
+    def get_sync(self, filepath, width=None, format=None):
+        """Returns the path to serve for the given media, generating its
+        cached version if necessary.
+
+        If the cached version cannot be generated, the source path is returned.
+
+        Args:
+            filepath: the path to the source media
+            width (None): an optional thumbnail width, in pixels
+            format (None): an optional image format, ``"jpg"`` or ``"webp"``
+
+        Returns:
+            the path to serve
+        """
+        cache_path = self.get_cache_path(filepath, width=width, format=format)
+        if cache_path is None:
+            return filepath
+
+        if self._touch(cache_path):
+            return cache_path
+
+        if self._generate(filepath, cache_path, width):
+            return cache_path
+
+        return filepath
+
+    async def get(self, filepath, width=None, format=None):
+        """Asynchronously returns the path to serve for the given media,
+        generating its cached version in a worker thread if necessary.
+
+        Concurrent requests for the same media share one generation task.
+
+        Args:
+            filepath: the path to the source media
+            width (None): an optional thumbnail width, in pixels
+            format (None): an optional image format, ``"jpg"`` or ``"webp"``
+
+        Returns:
+            the path to serve
+        """
+        loop = asyncio.get_running_loop()
+
+        # Cache lookups stat files and may build the cache's index, so they
+        # are run in the default executor rather than on the event loop
+        cache_path, exists = await loop.run_in_executor(
+            None, self._lookup, filepath, width, format
+        )
+        if cache_path is None:
+            return filepath
+
+        if exists:
+            return cache_path
+
+        future = self._pending.get(cache_path, None)
+        if future is None:
+            future = loop.run_in_executor(
+                self._get_executor(),
+                self._generate,
+                filepath,
+                cache_path,
+                width,
+            )
+            self._pending[cache_path] = future
+
+        try:
+            success = await future
+        finally:
+            self._pending.pop(cache_path, None)
+
+        return cache_path if success else filepath
+
+    def warm(
+        self,
+        filepaths,
+        width=None,
+        format=None,
+        num_workers=None,
+        progress=None,
+    ):
+        """Generates the cached versions of the given media, if necessary.
+
+        Args:
+            filepaths: an iterable of source media paths
+            width (None): an optional thumbnail width, in pixels
+            format (None): an optional image format, ``"jpg"`` or ``"webp"``
+            num_workers (None): a suggested number of threads to use
+            progress (None): whether to render a progress bar (True/False),
+                use the default value ``fiftyone.config.show_progress_bars``
+                (None), or a progress callback function to invoke instead
+
+        Returns:
+            the number of media files that were added to the cache
+        """
+        tasks = []
+        for filepath in filepaths:
+            try:
+                cache_path = self.get_cache_path(
+                    filepath, width=width, format=format
+                )
+            except OSError as e:
+                logger.warning(e)
+                continue
+
+            if cache_path is not None and not self._touch(cache_path):
+                tasks.append((filepath, cache_path, width))
+
+        if not tasks:
+            return 0
+
+        num_workers = fou.recommend_thread_pool_workers(num_workers)
+
+        num_added = 0
+        with fou.ProgressBar(total=len(tasks), progress=progress) as pb:
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                for success in pb(
+                    executor.map(lambda args: self._generate(*args), tasks)
+                ):
+                    num_added += int(success)
+
+        return num_added
+
+    def clear(self):
+        """Deletes all cached media."""
+        with self._lock:
+            etau.delete_dir(self.cache_dir)
+            self._index = OrderedDict()
+            self._size = 0
+
+    def _lookup(self, filepath, width, format):
+        cache_path = self.get_cache_path(filepath, width=width, format=format)
+        if cache_path is None:
+            return None, False
+
+        return cache_path, self._touch(cache_path)
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._num_workers)
+
+        return self._executor
+
+    def _ensure_index(self):
+        if self._index is not None:
+            return
+
+        entries = []
+        if os.path.isdir(self.cache_dir):
+            for root, _, filenames in os.walk(self.cache_dir):
+                for filename in filenames:
+                    path = os.path.join(root, filename)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+
+                    entries.append((st.st_atime, path, st.st_size))
+
+        self._index = OrderedDict()
+        self._size = 0
+        for _, path, size in sorted(entries):
+            self._index[path] = size
+            self._size += size
+
+    def _touch(self, cache_path):
+        try:
+            st = os.stat(cache_path)
+        except OSError:
+            return False
+
+        # Only the access time is updated so that HTTP validators (ETags)
+        # derived from the modification time remain stable
+        try:
+            os.utime(cache_path, (time.time(), st.st_mtime))
+        except OSError:
+            pass
+
+        with self._lock:
+            self._ensure_index()
+            if cache_path in self._index:
+                self._index.move_to_end(cache_path)
+            else:
+                self._index[cache_path] = st.st_size
+                self._size += st.st_size
+
+        return True
+
+    def _generate(self, filepath, cache_path, width):
+        out_dir, filename = os.path.split(cache_path)
+        tmp_path = os.path.join(
+            out_dir,
+            ".%d-%d-%s" % (os.getpid(), threading.get_ident(), filename),
+        )
+
+        try:
+            etau.ensure_dir(out_dir)
+            max_size = (width, -1) if width is not None else None
+
+            if fom.get_media_type(filepath) == fom.VIDEO:
+                fouv.transform_video(
+                    filepath, tmp_path, max_size=max_size, reencode=True
+                )
+            else:
+                fouim.transform_image(filepath, tmp_path, max_size=max_size)
+
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.warning("Failed to cache media '%s': %s", filepath, e)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+            return False
+
+        self._add(cache_path)
+        return True
+
+    def _add(self, cache_path):
+        size = os.path.getsize(cache_path)
+
+        with self._lock:
+            self._ensure_index()
+            self._size += size - self._index.pop(cache_path, 0)
+            self._index[cache_path] = size
+
+            # Always keep the newest entry, even if it alone exceeds the limit
+            while self._size > self.max_size_bytes and len(self._index) > 1:
+                path, size = self._index.popitem(last=False)
+                self._size -= size
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def validate_format(format):
+    """Validates that the given image format is supported by the cache.
+
+    Args:
+        format: an image format
+
+    Raises:
+        ValueError: if the format is not supported
+    """
+    _parse_format(format)
+
+
+def _parse_format(format):
+    if format is None:
+        return ".jpg"
+
+    ext = _IMAGE_FORMATS.get(format.lower(), None)
+    if ext is None:
+        raise ValueError(
+            "Unsupported format '%s'; supported values are %s"
+            % (format, sorted(_IMAGE_FORMATS.keys()))
+        )
+
+    return ext
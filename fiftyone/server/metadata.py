@@ -7,14 +7,19 @@ FiftyOne Server JIT metadata utilities
 """
 from enum import Enum
 import logging
+import os
 import shutil
 import struct
+import threading
 import typing as t
 
 from functools import reduce
 
 import asyncio
 import aiofiles
+import cachetools
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
 import strawberry as gql
 
 import eta.core.serial as etas
@@ -23,6 +28,9 @@ import eta.core.video as etav
 import fiftyone.core.fields as fof
 import fiftyone.core.labels as fol
 from fiftyone.core.collections import SampleCollection
+import fiftyone.core.metadata as fomt
+import fiftyone.core.odm as foo
+from fiftyone.core.utils import run_sync_task
 from fiftyone.utils.utils3d import OrthographicProjectionMetadata
 
 import fiftyone.core.media as fom
@@ -35,6 +43,11 @@ _ADDITIONAL_MEDIA_FIELDS = {
     OrthographicProjectionMetadata: "filepath",
 }
 _FFPROBE_BINARY_PATH = shutil.which("ffprobe")
+_MAX_CONCURRENT_READS = 16
+_METADATA_CACHE_SIZE = 8192
+
+_metadata_cache = cachetools.LRUCache(_METADATA_CACHE_SIZE)
+_metadata_cache_lock = threading.Lock()
 
 
 @gql.enum
@@ -53,74 +66,127 @@ async def get_metadata(
     metadata_cache: t.Dict[str, t.Dict[str, str]],
     url_cache: t.Dict[str, str],
 ):
-    """Gets the metadata for the given local media file.
+    """Gets the App metadata for the given sample.
+
+    See :func:`get_metadata_batch` to efficiently resolve the metadata of
+    many samples.
 
     Args:
-        filepath: the path to the file
-        media_type: the file's media type
-        metadata (None): a pre-existing metadata dict to use if possible
+        collection: the :class:`fiftyone.core.collections.SampleCollection`
+        sample: the sample dict
+        media_type: the sample's media type
+        metadata_cache: a dict mapping filepaths to App metadata
+        url_cache: a dict of media URLs
 
     Returns:
         metadata dict
     """
-    filepath = sample["filepath"]
-    metadata = sample.get("metadata", None)
+    results = await get_metadata_batch(
+        collection, [sample], [media_type], metadata_cache, url_cache
+    )
+    return results[0]
+
+
+async def get_metadata_batch(
+    collection: SampleCollection,
+    samples: t.List[t.Dict],
+    media_types: t.List[str],
+    metadata_cache: t.Optional[t.Dict[str, t.Dict[str, str]]] = None,
+    url_cache: t.Optional[t.Dict[str, str]] = None,
+):
+    """Gets the App metadata for the given samples.
+
+    Pre-existing ``metadata`` is used when possible. The media of any
+    remaining samples are read concurrently, and the computed metadata is
+    written back to the samples that have none in a single bulk update so
+    that it is never recomputed.
+
+    Args:
+        collection: the :class:`fiftyone.core.collections.SampleCollection`
+        samples: a list of sample dicts
+        media_types: a list of the samples' media types
+        metadata_cache (None): a dict mapping filepaths to App metadata
+        url_cache (None): a dict of media URLs
+
+    Returns:
+        a list of metadata dicts
+    """
+    if metadata_cache is None:
+        metadata_cache = {}
+
+    if url_cache is None:
+        url_cache = {}
 
     opm_field, additional_fields = _get_additional_media_fields(collection)
 
-    filepath_result, filepath_source, urls = _create_media_urls(
-        collection,
-        sample,
-        media_type,
-        url_cache,
-        additional_fields=additional_fields,
-        opm_field=opm_field,
-    )
-    if filepath_result is not None:
-        filepath = filepath_result
-
-    is_video = media_type == fom.VIDEO
-
-    # If sufficient pre-existing metadata exists, use it
-    if filepath not in metadata_cache and metadata:
-        if is_video:
-            width = metadata.get("frame_width", None)
-            height = metadata.get("frame_height", None)
-            frame_rate = metadata.get("frame_rate", None)
-
-            if width and height and frame_rate:
-                metadata_cache[filepath] = dict(
-                    aspect_ratio=width / height,
-                    frame_rate=frame_rate,
-                )
-        else:
-            width = metadata.get("width", None)
-            height = metadata.get("height", None)
+    results = []
+    uncached = []
+    missing = {}
+    for sample, media_type in zip(samples, media_types):
+        filepath, filepath_source, urls = _create_media_urls(
+            collection,
+            sample,
+            media_type,
+            url_cache,
+            additional_fields=additional_fields,
+            opm_field=opm_field,
+        )
+        if filepath is None:
+            filepath = filepath_source = sample["filepath"]
 
-            if width and height:
-                metadata_cache[filepath] = dict(
-                    aspect_ratio=width / height,
-                )
+        is_video = media_type == fom.VIDEO
+        results.append((filepath, urls, is_video))
 
-    if filepath not in metadata_cache:
-        try:
-            # Retrieve media metadata from disk
-            metadata_cache[filepath] = await read_metadata(
-                filepath_source, is_video
-            )
-        except Exception as exc:
-            # Immediately fail so the user knows they should install FFmpeg
-            if isinstance(exc, FFmpegNotFoundException):
-                raise exc
+        if filepath in metadata_cache:
+            continue
 
-            # Something went wrong (ie non-existent file), so we gracefully
-            # return some placeholder metadata so the App grid can be rendered
-            if is_video:
-                metadata_cache[filepath] = dict(aspect_ratio=1, frame_rate=30)
-            else:
-                metadata_cache[filepath] = dict(aspect_ratio=1)
+        # If sufficient pre-existing metadata exists, use it
+        metadata = _parse_metadata(sample.get("metadata", None), is_video)
+        if metadata is not None:
+            metadata_cache[filepath] = metadata
+            continue
+
+        uncached.append((sample, media_type, filepath, filepath_source))
+
+    # Previously read metadata is valid while the media is unchanged on disk
+    stamps = []
+    if uncached:
+        stamps = await run_sync_task(
+            _get_file_stamps, [u[3] for u in uncached]
+        )
+
+    for (sample, media_type, filepath, filepath_source), stamp in zip(
+        uncached, stamps
+    ):
+        if filepath in metadata_cache:
+            continue
+
+        metadata = _get_cached_metadata(filepath, stamp)
+        if metadata is not None:
+            metadata_cache[filepath] = metadata
+            continue
 
-    return dict(urls=urls, **metadata_cache[filepath])
+        if filepath not in missing:
+            is_video = media_type == fom.VIDEO
+            missing[filepath] = (filepath_source, is_video, stamp, [])
+
+        # Only samples whose media was read can store the computed metadata
+        if (
+            filepath_source == sample["filepath"]
+            and sample.get("metadata", None) is None
+            and media_type in (fom.IMAGE, fom.VIDEO)
+        ):
+            missing[filepath][3].append(sample["_id"])
+
+    if missing:
+        updates = await _read_missing_metadata(missing, metadata_cache)
+        if updates:
+            await _save_metadata(collection, updates)
+
+    return [
+        dict(urls=urls, **metadata_cache[filepath])
+        for filepath, urls, _ in results
+    ]
 
 
 async def read_metadata(filepath, is_video):
@@ -145,6 +211,147 @@ async def read_metadata(filepath, is_video):
         return dict(aspect_ratio=width / height)
 
 
+def _get_file_stamps(filepaths):
+    stamps = []
+    for filepath in filepaths:
+        try:
+            st = os.stat(filepath)
+            stamps.append((st.st_mtime_ns, st.st_size))
+        except Exception:
+            stamps.append(None)
+
+    return stamps
+
+
+def _get_cached_metadata(filepath, stamp):
+    if stamp is None:
+        return None
+
+    with _metadata_cache_lock:
+        cached = _metadata_cache.get(filepath, None)
+
+    if cached is None or cached[0] != stamp:
+        return None
+
+    return cached[1]
+
+
+async def _read_missing_metadata(missing, metadata_cache):
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_READS)
+
+    async def read(filepath, filepath_source, is_video, stamp, sample_ids):
+        async with semaphore:
+            try:
+                if sample_ids:
+                    metadata = await _build_metadata(filepath_source, is_video)
+                    result = _parse_metadata(metadata.to_dict(), is_video)
+                else:
+                    metadata = None
+                    result = await read_metadata(filepath_source, is_video)
+            except Exception as exc:
+                # Immediately fail so the user knows they should install FFmpeg
+                if isinstance(exc, FFmpegNotFoundException):
+                    raise exc
+
+                # Something went wrong (ie non-existent file), so we gracefully
+                # return some placeholder metadata so the App grid can be
+                # rendered
+                if is_video:
+                    metadata_cache[filepath] = dict(
+                        aspect_ratio=1, frame_rate=30
+                    )
+                else:
+                    metadata_cache[filepath] = dict(aspect_ratio=1)
+
+                return []
+
+        if result is None:
+            result = dict(aspect_ratio=1)
+            if is_video:
+                result["frame_rate"] = 30
+
+        metadata_cache[filepath] = result
+        if stamp is not None:
+            with _metadata_cache_lock:
+                _metadata_cache[filepath] = (stamp, result)
+
+        if metadata is None:
+            return []
+
+        return [(_id, metadata) for _id in sample_ids]
+
+    updates = await asyncio.gather(
+        *[read(filepath, *args) for filepath, args in missing.items()]
+    )
+
+    return [u for _updates in updates for u in _updates]
+
+
+async def _build_metadata(filepath, is_video):
+    if not is_video:
+        return await run_sync_task(fomt.ImageMetadata.build_for, filepath)
+
+    info = await get_stream_info(filepath)
+    return fomt.VideoMetadata(
+        size_bytes=info.size_bytes,
+        mime_type=info.mime_type,
+        frame_width=info.frame_size[0],
+        frame_height=info.frame_size[1],
+        frame_rate=info.frame_rate,
+        total_frame_count=info.total_frame_count,
+        duration=info.duration,
+        encoding_str=info.encoding_str,
+    )
+
+
+async def _save_metadata(collection, updates):
+    coll = foo.get_async_db_conn()[collection._dataset._sample_collection_name]
+    ops = [
+        UpdateOne(
+            {"_id": _id, "metadata": None},
+            {"$set": {"metadata": metadata.to_dict()}},
+        )
+        for _id, metadata in updates
+    ]
+
+    try:
+        result = await coll.bulk_write(ops, ordered=False)
+        modified = result.modified_count > 0
+    except PyMongoError as e:
+        logger.debug("Failed to save computed metadata: %s", e)
+
+        # some of the updates may have been applied
+        modified = True
+
+    # Like sample saves, the write count increment is deferred so that the
+    # metadata computed for consecutive pages is coalesced into one increment
+    if modified:
+        collection._dataset._increment_write_count(deferred=True)
+
+
+def _parse_metadata(metadata, is_video):
+    if not metadata:
+        return None
+
+    if is_video:
+        width = metadata.get("frame_width", None)
+        height = metadata.get("frame_height", None)
+        frame_rate = metadata.get("frame_rate", None)
+
+        if width and height and frame_rate:
+            return dict(aspect_ratio=width / height, frame_rate=frame_rate)
+
+        return None
+
+    width = metadata.get("width", None)
+    height = metadata.get("height", None)
+
+    if width and height:
+        return dict(aspect_ratio=width / height)
+
+    return None
+
+
 class Reader(object):
     """Asynchronous file-like reader.
 
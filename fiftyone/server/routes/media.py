@@ -20,6 +20,9 @@ from starlette.responses import (
     StreamingResponse,
     guess_type,
 )
+from starlette.staticfiles import NotModifiedResponse
+
+from fiftyone.server.media_cache import get_media_cache, validate_format
 
 
 async def ranged(
@@ -61,21 +64,55 @@ class Media(HTTPEndpoint):
 
         response: t.Union[FileResponse, StreamingResponse]
 
+        try:
+            params = _parse_cache_params(request)
+        except ValueError as e:
+            return Response(content=str(e), status_code=400)
+
         try:
             await anyio.to_thread.run_sync(os.stat, path)
         except FileNotFoundError:
             return Response(content="Not found", status_code=404)
 
+        path = await self.get_cached_path(path, *params)
+
         if request.headers.get("range"):
             response = await self.ranged_file_response(path, request)
         else:
-            response = FileResponse(
-                path,
-            )
+            stat_result = await aio_stat(path)
+            response = FileResponse(path, stat_result=stat_result)
+
+            if_none_match = request.headers.get("if-none-match")
+            if if_none_match is not None and if_none_match == (
+                response.headers.get("etag")
+            ):
+                return NotModifiedResponse(response.headers)
+
         response.headers["Accept-Ranges"] = "bytes"
 
         return response
 
+    async def get_cached_path(
+        self,
+        path: str,
+        width: t.Optional[int],
+        image_format: t.Optional[str],
+        proxy: bool,
+    ) -> str:
+        """Returns the path to serve for the requested media.
+
+        A resized thumbnail is served when a ``width`` is requested, and a
+        browser-friendly proxy is served when ``proxy`` is requested and the
+        media is not browser-friendly. The ``format`` (``jpg`` or ``webp``)
+        of images can optionally be provided.
+        """
+        if width is None and image_format is None and not proxy:
+            return path
+
+        return await get_media_cache().get(
+            path, width=width, format=image_format
+        )
+
     async def ranged_file_response(
         self, path: str, request: Request
     ) -> StreamingResponse:
@@ -128,6 +165,13 @@ class Media(HTTPEndpoint):
 
     async def head(self, request: Request) -> Response:
         path = request.query_params["filepath"]
+
+        try:
+            params = _parse_cache_params(request)
+        except ValueError as e:
+            return Response(content=str(e), status_code=400)
+
+        path = await self.get_cached_path(path, *params)
         response = Response()
         size = (await aio_stat(path)).st_size
         response.headers.update(
@@ -144,3 +188,24 @@ class Media(HTTPEndpoint):
         response.headers["Accept-Ranges"] = "bytes"
         response.headers["Allow"] = "OPTIONS, GET, HEAD"
         return response
+
+
+def _parse_cache_params(
+    request: Request,
+) -> t.Tuple[t.Optional[int], t.Optional[str], bool]:
+    width = request.query_params.get("width", None)
+    image_format = request.query_params.get("format", None)
+    proxy = request.query_params.get("proxy", "false").lower() == "true"
+
+    if width is not None:
+        if not width.isdigit() or int(width) <= 0:
+            raise ValueError(
+                "Invalid width '%s'; must be a positive integer" % width
+            )
+
+        width = int(width)
+
+    if image_format is not None:
+        validate_format(image_format)
+
+    return width, image_format, proxy
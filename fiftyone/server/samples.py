@@ -5,12 +5,10 @@ FiftyOne Server samples pagination
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
-import asyncio
 import strawberry as gql
 import typing as t
 
 
-from fiftyone.core.collections import SampleCollection
 import fiftyone.core.media as fom
 import fiftyone.core.odm as foo
 from fiftyone.core.utils import run_sync_task
@@ -132,16 +130,14 @@ async def paginate_samples(
         samples = samples[:first]
         more = True
 
-    metadata_cache = {}
-    url_cache = {}
-    nodes = await asyncio.gather(
-        *[
-            _create_sample_item(
-                view, sample, metadata_cache, url_cache, pagination_data
-            )
-            for sample in samples
-        ]
-    )
+    media_types = [_get_media_type(sample) for sample in samples]
+    metadatas = await fosm.get_metadata_batch(view, samples, media_types)
+    nodes = [
+        _create_sample_item(sample, media_type, metadata, pagination_data)
+        for sample, media_type, metadata in zip(
+            samples, media_types, metadatas
+        )
+    ]
 
     edges = []
     for idx, node in enumerate(nodes):
@@ -163,29 +159,21 @@ async def paginate_samples(
     )
 
 
-async def _create_sample_item(
-    dataset: SampleCollection,
-    sample: t.Dict,
-    metadata_cache: t.Dict[str, t.Dict],
-    url_cache: t.Dict[str, str],
-    pagination_data: bool,
-) -> SampleItem:
+def _get_media_type(sample: t.Dict) -> str:
     media_type = fom.get_media_type(sample["filepath"])
-
-    if media_type == fom.IMAGE:
-        cls = ImageSample
-    elif media_type == fom.VIDEO:
-        cls = VideoSample
-    elif media_type == fom.POINT_CLOUD:
-        cls = PointCloudSample
-    elif media_type == fom.THREE_D:
-        cls = ThreeDSample
-    else:
+    if media_type not in MEDIA_TYPES:
         raise ValueError(f"unknown media type '{media_type}'")
 
-    metadata = await fosm.get_metadata(
-        dataset, sample, media_type, metadata_cache, url_cache
-    )
+    return media_type
+
+
+def _create_sample_item(
+    sample: t.Dict,
+    media_type: str,
+    metadata: t.Dict,
+    pagination_data: bool,
+) -> SampleItem:
+    cls = MEDIA_TYPES[media_type]
 
     if cls == VideoSample:
         metadata = dict(**metadata, frame_number=sample.get("frame_number", 1))
@@ -6,9 +6,13 @@ FiftyOne Server view.
 |
 """
 
+from copy import copy
+from dataclasses import asdict
+import threading
 from typing import List, Optional, Tuple
 
-from bson import ObjectId
+from bson import json_util, ObjectId
+import cachetools
 import strawberry as gql
 
 import fiftyone.core.collections as foc
@@ -17,6 +21,7 @@ from fiftyone.core.expressions import ViewField as F, VALUE
 import fiftyone.core.fields as fof
 import fiftyone.core.labels as fol
 import fiftyone.core.media as fom
+import fiftyone.core.odm as foo
 import fiftyone.core.stages as fosg
 import fiftyone.core.utils as fou
 import fiftyone.core.view as fov
@@ -26,6 +31,10 @@ from fiftyone.server.scalars import BSONArray, JSON
 
 
 _LABEL_TAGS = "_label_tags"
+_VIEW_CACHE_SIZE = 64
+
+_view_cache = cachetools.LRUCache(maxsize=_VIEW_CACHE_SIZE)
+_view_cache_lock = threading.Lock()
 
 
 @gql.input
@@ -97,7 +106,8 @@ def get_view(
         extended_stages (None): extended view stages
         sample_filter (None): an optional
             :class:`fiftyone.server.filters.SampleFilter`
-        reload (True): whether to reload the dataset
+        reload (True): whether to reload the dataset. Cached views are only
+            used when this is False
         awaitable (False): whether to return an awaitable coroutine
 
     Returns:
@@ -105,15 +115,57 @@ def get_view(
     """
 
     def run(dataset, stages):
+        if view_name is not None:
+            if isinstance(dataset, str):
+                dataset = fod.load_dataset(dataset)
+
+            if reload:
+                dataset.reload()
+
+            return dataset.load_saved_view(view_name)
+
+        # Reloading requests always rebuild their view
+        if reload:
+            return build(dataset, stages)
+
+        key = _make_view_cache_key(
+            dataset,
+            stages,
+            filters,
+            pagination_data,
+            extended_stages,
+            sample_filter,
+        )
+
+        if key is not None:
+            with _view_cache_lock:
+                view = _view_cache.get(key, None)
+
+            if view is not None:
+                return copy(view)
+
+            # Only cache views of an up-to-date dataset
+            if isinstance(dataset, str):
+                dataset = fod.load_dataset(dataset)
+
+            if dataset._doc.last_modified_at != key[1]:
+                dataset.reload()
+
+        view = build(dataset, stages)
+
+        if key is not None:
+            with _view_cache_lock:
+                _view_cache[key] = copy(view)
+
+        return view
+
+    def build(dataset, stages):
         if isinstance(dataset, str):
             dataset = fod.load_dataset(dataset)
 
         if reload:
             dataset.reload()
 
-        if view_name is not None:
-            return dataset.load_saved_view(view_name)
-
         if stages:
             view = fov.DatasetView._build(dataset, stages)
         else:
@@ -146,6 +198,44 @@ def get_view(
     return run(dataset, stages)
 
 
+def clear_view_cache():
+    """Clears the cache of views built by :func:`get_view`."""
+    with _view_cache_lock:
+        _view_cache.clear()
+
+
+def _make_view_cache_key(
+    dataset,
+    stages,
+    filters,
+    pagination_data,
+    extended_stages,
+    sample_filter,
+):
+    # Views are only reusable while the dataset's document (schema, group
+    # slices, skeletons, etc) is unchanged, which its modification time tracks
+    name = dataset if isinstance(dataset, str) else dataset.name
+    dataset_doc = foo.get_db_conn().datasets.find_one(
+        {"name": name}, {"_id": True, "last_modified_at": True}
+    )
+    if dataset_doc is None:
+        return None
+
+    if sample_filter is not None:
+        sample_filter = asdict(sample_filter)
+
+    request = json_util.dumps(
+        [stages, filters, extended_stages, sample_filter], sort_keys=True
+    )
+
+    return (
+        str(dataset_doc["_id"]),
+        dataset_doc.get("last_modified_at", None),
+        request,
+        bool(pagination_data),
+    )
+
+
 def get_extended_view(
     view,
     filters=None,
@@ -77,6 +77,8 @@ class ActivityNetEvaluation(DetectionEvaluation):
     def __init__(self, config):
         super().__init__(config)
 
+        self._sweep = None
+
         if config.iou is None:
             raise ValueError(
                 "You must specify an `iou` threshold in order to run "
@@ -118,8 +120,11 @@ class ActivityNetEvaluation(DetectionEvaluation):
             gts = _copy_labels(gts)
             preds = _copy_labels(preds)
 
+        if self.config.compute_mAP and self._sweep is None:
+            self._sweep = _IoUSweep(self.config)
+
         return _activitynet_evaluation_single_iou(
-            gts, preds, eval_key, self.config
+            gts, preds, eval_key, self.config, sweep=self._sweep
         )
 
     def generate_results(
@@ -133,13 +138,17 @@ class ActivityNetEvaluation(DetectionEvaluation):
     ):
         """Generates aggregate evaluation results for the samples.
 
-        If ``self.config.compute_mAP`` is True, this method performs
-        ActivityNet-style evaluation as in :meth:`evaluate` to generate
+        If ``self.config.compute_mAP`` is True, this method generates
         precision and recall sweeps over the range of IoU thresholds in
         ``self.config.iou_threshs``. In this case, an
         :class:`ActivityNetDetectionResults` instance is returned that can
         compute mAP and PR curves.
 
+        The sweeps are accumulated by :meth:`evaluate` from the same IoUs that
+        it uses for matching. If :meth:`evaluate` has not been called,
+        ActivityNet-style evaluation is performed on ``samples`` to generate
+        the sweeps.
+
         Args:
             samples: a :class:`fiftyone.core.collections.SampleCollection`
             matches: a list of
@@ -170,120 +179,20 @@ class ActivityNetEvaluation(DetectionEvaluation):
                 backend=self,
             )
 
-        gt_field = self.config.gt_field
-        pred_field = self.config.pred_field
-
-        _samples = samples.select_fields([gt_field, pred_field])
-
-        iou_threshs = self.config.iou_threshs
-        thresh_matches = {t: {} for t in iou_threshs}
-
-        if classes is None:
-            _classes = set()
-        else:
-            _classes = None
-
-        # IoU sweep
-        logger.info("Performing IoU sweep...")
-        for sample in _samples.iter_samples(progress=progress):
-            # Don't edit user's data during sweep
-            gts = _copy_labels(sample[self.gt_field])
-            preds = _copy_labels(sample[self.pred_field])
-
-            video_matches = _activitynet_evaluation_iou_sweep(
-                gts, preds, self.config
-            )
-
-            for t, t_matches in video_matches.items():
-                for match in t_matches:
-                    gt_label = match[0]
-                    pred_label = match[1]
-
-                    if _classes is not None:
-                        _classes.add(gt_label)
-                        _classes.add(pred_label)
-
-                    c = gt_label if gt_label is not None else pred_label
-
-                    if c not in thresh_matches[t]:
-                        thresh_matches[t][c] = {
-                            "tp": [],
-                            "fp": [],
-                            "num_gt": 0,
-                        }
-
-                    if gt_label == pred_label:
-                        thresh_matches[t][c]["tp"].append(match)
-                    elif pred_label:
-                        thresh_matches[t][c]["fp"].append(match)
-
-                    if gt_label:
-                        thresh_matches[t][c]["num_gt"] += 1
-
-        if _classes is not None:
-            _classes.discard(None)
-            classes = sorted(_classes)
-
-        # Compute precision-recall array
-        # https://github.com/activitynet/ActivityNet/blob/master/Evaluation/eval_detection.py
-        num_threshs = len(iou_threshs)
-        num_classes = len(classes)
-        precision = -np.ones((num_threshs, num_classes, 101))
-        thresholds = -np.ones((num_threshs, num_classes, 101))
-        classwise_AP = -np.ones((num_threshs, num_classes))
-        recall = np.linspace(0, 1, 101)
-        for t in thresh_matches.keys():
-            for c in thresh_matches[t].keys():
-                tp = thresh_matches[t][c]["tp"]
-                fp = thresh_matches[t][c]["fp"]
-                num_gt = thresh_matches[t][c]["num_gt"]
-                if num_gt == 0:
-                    continue
-
-                tp_fp = np.array([1] * len(tp) + [0] * len(fp))
-                confs = np.array([m[3] for m in tp] + [m[3] for m in fp])
-                if None in confs:
-                    raise ValueError(
-                        "All predicted segments must have their `confidence` "
-                        "attribute populated in order to compute "
-                        "precision-recall curves"
-                    )
-                inds = np.argsort(-confs, kind="mergesort")
-                tp_fp = tp_fp[inds]
-                confs = confs[inds]
-
-                tp_sum = np.cumsum(tp_fp).astype(dtype=float)
-                total = np.arange(1, len(tp_fp) + 1).astype(dtype=float)
+        sweep = self._sweep
+        self._sweep = None
 
-                pre = tp_sum / total
-                rec = tp_sum / num_gt
-
-                for i in range(len(pre) - 1, 0, -1):
-                    if pre[i] > pre[i - 1]:
-                        pre[i - 1] = pre[i]
+        if sweep is None:
+            sweep = _compute_iou_sweep(samples, self.config, progress=progress)
 
-                # ActivityNet mAP is calculated without interpolated precision
-                # This slightly differs from COCO evaluation
-                mprec = np.hstack([[0], pre, [0]])
-                mrec = np.hstack([[0], rec, [1]])
-                idx = np.where(mrec[1::] != mrec[0:-1])[0] + 1
-                ap = np.sum((mrec[idx] - mrec[idx - 1]) * mprec[idx])
-
-                q = np.zeros(101)
-                tr = np.zeros(101)
-
-                # Interpolate precision values for PR curve plotting purposes
-                inds = np.searchsorted(rec, recall, side="left")
-                try:
-                    for ri, pi in enumerate(inds):
-                        q[ri] = pre[pi]
-                        tr[ri] = confs[pi]
-                except:
-                    pass
-
-                precision[iou_threshs.index(t)][classes.index(c)] = q
-                thresholds[iou_threshs.index(t)][classes.index(c)] = tr
-                classwise_AP[iou_threshs.index(t)][classes.index(c)] = ap
+        (
+            precision,
+            recall,
+            thresholds,
+            classwise_AP,
+            iou_threshs,
+            classes,
+        ) = sweep.compute_pr_curves(classes=classes)
 
         return ActivityNetDetectionResults(
             samples,
@@ -353,12 +262,13 @@ class ActivityNetDetectionResults(DetectionResults):
 
         self.precision = np.asarray(precision)
         self.recall = np.asarray(recall)
+        self.classwise_AP = np.asarray(classwise_AP)
         self.iou_threshs = np.asarray(iou_threshs)
         self.thresholds = (
             np.asarray(thresholds) if thresholds is not None else None
         )
 
-        self._classwise_AP = classwise_AP.mean(0)
+        self._classwise_AP = self.classwise_AP.mean(0)
 
     def plot_pr_curves(
         self, classes=None, iou_thresh=None, backend="plotly", **kwargs
@@ -476,6 +386,7 @@ class ActivityNetDetectionResults(DetectionResults):
     def _from_dict(cls, d, samples, config, eval_key, **kwargs):
         precision = d["precision"]
         recall = d["recall"]
+        classwise_AP = d["classwise_AP"]
         iou_threshs = d["iou_threshs"]
         thresholds = d.get("thresholds", None)
         return super()._from_dict(
@@ -485,6 +396,7 @@ class ActivityNetDetectionResults(DetectionResults):
             eval_key,
             precision=precision,
             recall=recall,
+            classwise_AP=classwise_AP,
             iou_threshs=iou_threshs,
             thresholds=thresholds,
             **kwargs,
@@ -495,18 +407,20 @@ _NO_MATCH_ID = ""
 _NO_MATCH_IOU = None
 
 
-def _activitynet_evaluation_single_iou(gts, preds, eval_key, config):
+def _activitynet_evaluation_single_iou(
+    gts, preds, eval_key, config, sweep=None
+):
     iou_thresh = min(config.iou, 1 - 1e-10)
     id_key = "%s_id" % eval_key
     iou_key = "%s_iou" % eval_key
 
-    cats, pred_ious = _activitynet_evaluation_setup(
-        gts, preds, [id_key], iou_key, config
-    )
+    cats = _activitynet_evaluation_setup(gts, preds, [id_key], iou_key, config)
+
+    if sweep is not None:
+        sweep.add(cats)
 
     matches = _compute_matches(
         cats,
-        pred_ious,
         iou_thresh,
         eval_key=eval_key,
         id_key=id_key,
@@ -516,30 +430,6 @@ def _activitynet_evaluation_single_iou(gts, preds, eval_key, config):
     return matches
 
 
-def _activitynet_evaluation_iou_sweep(gts, preds, config):
-    iou_threshs = config.iou_threshs
-    id_keys = ["eval_id_%s" % str(i).replace(".", "_") for i in iou_threshs]
-    iou_key = "eval_iou"
-
-    cats, pred_ious = _activitynet_evaluation_setup(
-        gts, preds, id_keys, iou_key, config
-    )
-
-    matches_dict = {
-        i: _compute_matches(
-            cats,
-            pred_ious,
-            i,
-            eval_key="eval",
-            id_key=k,
-            iou_key=iou_key,
-        )
-        for i, k in zip(iou_threshs, id_keys)
-    }
-
-    return matches_dict
-
-
 def _activitynet_evaluation_setup(
     gts,
     preds,
@@ -555,7 +445,9 @@ def _activitynet_evaluation_setup(
 
     if gts is not None:
         for obj in gts[gts._LABEL_LIST_FIELD]:
-            obj[iou_key] = _NO_MATCH_IOU
+            if iou_key is not None:
+                obj[iou_key] = _NO_MATCH_IOU
+
             for id_key in id_keys:
                 obj[id_key] = _NO_MATCH_ID
 
@@ -564,7 +456,9 @@ def _activitynet_evaluation_setup(
 
     if preds is not None:
         for obj in preds[preds._LABEL_LIST_FIELD]:
-            obj[iou_key] = _NO_MATCH_IOU
+            if iou_key is not None:
+                obj[iou_key] = _NO_MATCH_IOU
+
             for id_key in id_keys:
                 obj[id_key] = _NO_MATCH_ID
 
@@ -572,7 +466,6 @@ def _activitynet_evaluation_setup(
             cats[label]["preds"].append(obj)
 
     # Compute IoUs within each category
-    pred_ious = {}
     for segments in cats.values():
         gts = segments["gts"]
         preds = segments["preds"]
@@ -583,75 +476,46 @@ def _activitynet_evaluation_setup(
         segments["preds"] = preds
 
         # Compute ``num_preds x num_gts`` IoUs
-        ious = foui.compute_segment_ious(preds, gts)
-
-        gt_ids = [g.id for g in gts]
-        for pred, gt_ious in zip(preds, ious):
-            pred_ious[pred.id] = list(zip(gt_ids, gt_ious))
+        segments["ious"] = foui.compute_segment_ious(preds, gts)
 
-    return cats, pred_ious
+    return cats
 
 
-def _compute_matches(cats, pred_ious, iou_thresh, eval_key, id_key, iou_key):
+def _compute_matches(cats, iou_thresh, eval_key, id_key, iou_key):
     matches = []
 
     # Match preds to GT, highest confidence first
-    for cat, segments in cats.items():
-        gt_map = {gt.id: gt for gt in segments["gts"]}
-
-        # Match each prediction to the highest available IoU ground truth
-        for pred in segments["preds"]:
-            if pred.id in pred_ious:
-                best_match = None
-                best_match_iou = iou_thresh
-                for gt_id, iou in pred_ious[pred.id]:
-                    gt = gt_map[gt_id]
-
-                    # Each gt can only match with one prediction
-                    if gt[id_key] != _NO_MATCH_ID:
-                        continue
-
-                    if iou < best_match_iou:
-                        continue
-
-                    best_match_iou = iou
-                    best_match = gt_id
-
-                if best_match:
-                    gt = gt_map[best_match]
-
-                    gt[eval_key] = "tp" if gt.label == pred.label else "fn"
-                    gt[id_key] = pred.id
-                    gt[iou_key] = best_match_iou
-
-                    pred[eval_key] = "tp" if gt.label == pred.label else "fp"
-                    pred[id_key] = best_match
-                    pred[iou_key] = best_match_iou
-
-                    matches.append(
-                        (
-                            gt.label,
-                            pred.label,
-                            best_match_iou,
-                            pred.confidence,
-                            gt.id,
-                            pred.id,
-                        )
-                    )
-                else:
-                    pred[eval_key] = "fp"
-                    matches.append(
-                        (
-                            None,
-                            pred.label,
-                            None,
-                            pred.confidence,
-                            None,
-                            pred.id,
-                        )
-                    )
+    for segments in cats.values():
+        gts = segments["gts"]
+        preds = segments["preds"]
+        ious = segments["ious"]
+
+        gt_inds = _match_segments(ious, [iou_thresh])[0]
+
+        for pred, gt_idx, pred_ious in zip(preds, gt_inds, ious):
+            if gt_idx >= 0:
+                gt = gts[gt_idx]
+                iou = pred_ious[gt_idx]
+
+                gt[eval_key] = "tp" if gt.label == pred.label else "fn"
+                gt[id_key] = pred.id
+                gt[iou_key] = iou
+
+                pred[eval_key] = "tp" if gt.label == pred.label else "fp"
+                pred[id_key] = gt.id
+                pred[iou_key] = iou
 
-            elif pred.label == cat:
+                matches.append(
+                    (
+                        gt.label,
+                        pred.label,
+                        iou,
+                        pred.confidence,
+                        gt.id,
+                        pred.id,
+                    )
+                )
+            else:
                 pred[eval_key] = "fp"
                 matches.append(
                     (
@@ -665,7 +529,7 @@ def _compute_matches(cats, pred_ious, iou_thresh, eval_key, id_key, iou_key):
                 )
 
         # Leftover GTs are false negatives
-        for gt in segments["gts"]:
+        for gt in gts:
             if gt[id_key] == _NO_MATCH_ID:
                 gt[eval_key] = "fn"
                 matches.append((gt.label, None, None, None, gt.id, None))
@@ -673,6 +537,247 @@ def _compute_matches(cats, pred_ious, iou_thresh, eval_key, id_key, iou_key):
     return matches
 
 
+def _match_segments(ious, iou_threshs):
+    # Returns a ``num_iou_threshs x num_preds`` array containing the index of
+    # the ground truth segment that each prediction matches at each threshold,
+    # or -1 if the prediction is unmatched
+    threshs = np.asarray(iou_threshs, dtype=float)[:, np.newaxis]
+    num_threshs = threshs.shape[0]
+    num_preds, num_gts = ious.shape
+
+    matches = np.full((num_threshs, num_preds), -1, dtype=int)
+    if num_gts == 0:
+        return matches
+
+    thresh_inds = np.arange(num_threshs)
+    gt_matched = np.zeros((num_threshs, num_gts), dtype=bool)
+
+    for pred_idx in range(num_preds):
+        # Match the highest IoU unmatched ground truth, breaking ties in favor
+        # of the last such segment
+        valid = (ious[pred_idx] >= threshs) & ~gt_matched
+        found = valid.any(axis=1)
+        best = _last_argmax(np.where(valid, ious[pred_idx], -1))
+
+        matches[found, pred_idx] = best[found]
+
+        # Each ground truth segment can only match one prediction
+        gt_matched[thresh_inds[found], best[found]] = True
+
+    return matches
+
+
+def _last_argmax(values):
+    return values.shape[1] - 1 - np.argmax(values[:, ::-1], axis=1)
+
+
+def _compute_iou_sweep(samples, config, progress=None):
+    gt_field = config.gt_field
+    pred_field = config.pred_field
+
+    samples = samples.select_fields([gt_field, pred_field])
+
+    sweep = _IoUSweep(config)
+
+    logger.info("Performing IoU sweep...")
+    for sample in samples.iter_samples(progress=progress):
+        # Passing no keys ensures that the user's labels are not edited
+        cats = _activitynet_evaluation_setup(
+            sample[gt_field], sample[pred_field], [], None, config
+        )
+        sweep.add(cats)
+
+    return sweep
+
+
+class _IoUSweep(object):
+    """Accumulates the true and false positives of ActivityNet-style matching
+    at multiple IoU thresholds, from which precision-recall curves and average
+    precisions are computed.
+
+    Args:
+        config: a :class:`ActivityNetEvaluationConfig`
+    """
+
+    _TP = 1
+    _FP = 2
+
+    def __init__(self, config):
+        self.iou_threshs = config.iou_threshs
+
+        self._class_inds = {}
+        self._num_gt = defaultdict(int)
+        self._pred_classes = []
+        self._pred_results = []
+        self._pred_confs = []
+
+    def add(self, cats):
+        """Matches the segments in the given categories at each IoU threshold.
+
+        Args:
+            cats: a dict of categories in the format returned by
+                ``_activitynet_evaluation_setup()``
+        """
+        for segments in cats.values():
+            gts = segments["gts"]
+            preds = segments["preds"]
+            ious = segments["ious"]
+
+            gt_inds = np.array(
+                [self._get_class_index(gt.label) for gt in gts], dtype=int
+            )
+
+            for gt in gts:
+                self._num_gt[gt.label] += 1
+
+            if not preds:
+                continue
+
+            pred_inds = np.array(
+                [self._get_class_index(pred.label) for pred in preds],
+                dtype=int,
+            )
+            confs = np.array(
+                [
+                    pred.confidence if pred.confidence is not None else np.nan
+                    for pred in preds
+                ],
+                dtype=float,
+            )
+
+            matches = _match_segments(ious, self.iou_threshs)
+
+            # Predictions are scored for the class of their matching ground
+            # truth, or for their own class if they are unmatched
+            matched = matches >= 0
+            if gt_inds.size > 0:
+                classes = np.where(
+                    matched, gt_inds[np.where(matched, matches, 0)], pred_inds
+                )
+            else:
+                classes = np.broadcast_to(pred_inds, matches.shape)
+
+            results = np.full(matches.shape, self._FP, dtype=np.int8)
+            results[matched & (classes == pred_inds)] = self._TP
+
+            self._pred_classes.append(classes.astype(np.int32))
+            self._pred_results.append(results)
+            self._pred_confs.append(confs)
+
+    def compute_pr_curves(self, classes=None):
+        """Computes precision-recall curves and average precisions from the
+        accumulated matches.
+
+        Args:
+            classes (None): the list of classes for which to compute curves.
+                By default, all observed classes are used
+
+        Returns:
+            a tuple of
+
+            -   an array of precision values of shape
+                ``num_iou_threshs x num_classes x num_recall``
+            -   an array of recall values
+            -   an array of decision thresholds of shape
+                ``num_iou_threshs x num_classes x num_recall``
+            -   an array of average precision values of shape
+                ``num_iou_threshs x num_classes``
+            -   the list of IoU thresholds
+            -   the list of classes
+        """
+        if classes is None:
+            classes = sorted(c for c in self._class_inds if c is not None)
+
+        num_threshs = len(self.iou_threshs)
+        num_classes = len(classes)
+
+        if self._pred_confs:
+            pred_classes = np.concatenate(self._pred_classes, axis=1)
+            pred_results = np.concatenate(self._pred_results, axis=1)
+            pred_confs = np.concatenate(self._pred_confs)
+        else:
+            pred_classes = np.zeros((num_threshs, 0), dtype=np.int32)
+            pred_results = np.zeros((num_threshs, 0), dtype=np.int8)
+            pred_confs = np.zeros(0, dtype=float)
+
+        # Compute precision-recall array
+        # https://github.com/activitynet/ActivityNet/blob/master/Evaluation/eval_detection.py
+        precision = -np.ones((num_threshs, num_classes, 101))
+        thresholds = -np.ones((num_threshs, num_classes, 101))
+        classwise_AP = -np.ones((num_threshs, num_classes))
+        recall = np.linspace(0, 1, 101)
+        for c_idx, c in enumerate(classes):
+            class_ind = self._class_inds.get(c, None)
+            num_gt = self._num_gt.get(c, 0)
+
+            if class_ind is None or num_gt == 0:
+                continue
+
+            for idx in range(num_threshs):
+                in_class = pred_classes[idx] == class_ind
+                tp = in_class & (pred_results[idx] == self._TP)
+                fp = in_class & (pred_results[idx] == self._FP)
+
+                tp_fp = np.concatenate([np.ones(tp.sum()), np.zeros(fp.sum())])
+                confs = np.concatenate([pred_confs[tp], pred_confs[fp]])
+                if np.isnan(confs).any():
+                    raise ValueError(
+                        "All predicted segments must have their `confidence` "
+                        "attribute populated in order to compute "
+                        "precision-recall curves"
+                    )
+
+                inds = np.argsort(-confs, kind="mergesort")
+                tp_fp = tp_fp[inds]
+                confs = confs[inds]
+
+                tp_sum = np.cumsum(tp_fp)
+                total = np.arange(1, len(tp_fp) + 1, dtype=float)
+
+                pre = tp_sum / total
+                rec = tp_sum / num_gt
+
+                # Make precision monotonically decreasing
+                pre = np.maximum.accumulate(pre[::-1])[::-1]
+
+                # ActivityNet mAP is calculated without interpolated precision
+                # This slightly differs from COCO evaluation
+                mprec = np.hstack([[0], pre, [0]])
+                mrec = np.hstack([[0], rec, [1]])
+                inds = np.where(mrec[1::] != mrec[0:-1])[0] + 1
+                ap = np.sum((mrec[inds] - mrec[inds - 1]) * mprec[inds])
+
+                q = np.zeros(101)
+                t = np.zeros(101)
+
+                # Interpolate precision values for PR curve plotting purposes
+                inds = np.searchsorted(rec, recall, side="left")
+                valid = inds < len(pre)
+                q[valid] = pre[inds[valid]]
+                t[valid] = confs[inds[valid]]
+
+                precision[idx][c_idx] = q
+                thresholds[idx][c_idx] = t
+                classwise_AP[idx][c_idx] = ap
+
+        return (
+            precision,
+            recall,
+            thresholds,
+            classwise_AP,
+            self.iou_threshs,
+            classes,
+        )
+
+    def _get_class_index(self, label):
+        class_ind = self._class_inds.get(label, None)
+        if class_ind is None:
+            class_ind = len(self._class_inds)
+            self._class_inds[label] = class_ind
+
+        return class_ind
+
+
 def _copy_labels(labels):
     if labels is None:
         return None
@@ -311,21 +311,26 @@ class BaseEvaluationResults(foe.EvaluationResults):
         else:
             added_missing = False
 
+        (
+            ytrue,
+            ypred,
+            weights,
+            ytrue_ids,
+            ypred_ids,
+        ) = self._get_confusion_data(tabulate_ids=tabulate_ids)
+
         if include_other != False:
             labels_set = set(labels + [self.missing])
-            ypred = [y if y in labels_set else other_label for y in self.ypred]
-            ytrue = [y if y in labels_set else other_label for y in self.ytrue]
-        else:
-            ypred = self.ypred
-            ytrue = self.ytrue
+            ypred = [y if y in labels_set else other_label for y in ypred]
+            ytrue = [y if y in labels_set else other_label for y in ytrue]
 
         cmat, ids = _compute_confusion_matrix(
             ytrue,
             ypred,
             labels,
-            weights=self.weights,
-            ytrue_ids=self.ytrue_ids,
-            ypred_ids=self.ypred_ids,
+            weights=weights,
+            ytrue_ids=ytrue_ids,
+            ypred_ids=ypred_ids,
             tabulate_ids=tabulate_ids,
         )
 
@@ -362,6 +367,15 @@ class BaseEvaluationResults(foe.EvaluationResults):
 
         return cmat, labels, ids
 
+    def _get_confusion_data(self, tabulate_ids=False):
+        return (
+            self.ytrue,
+            self.ypred,
+            self.weights,
+            self.ytrue_ids,
+            self.ypred_ids,
+        )
+
     @classmethod
     def _from_dict(cls, d, samples, config, eval_key, **kwargs):
         ytrue = d["ytrue"]
@@ -494,6 +508,11 @@ def _compute_confusion_matrix(
     ytrue = ytrue[found]
     weights = weights[found]
 
+    np.add.at(confusion_matrix, (ytrue, ypred), weights)
+
+    if not tabulate_ids:
+        return confusion_matrix, ids
+
     if ytrue_ids is not None:
         ytrue_ids = ytrue_ids[found]
     else:
@@ -504,9 +523,7 @@ def _compute_confusion_matrix(
     else:
         ypred_ids = itertools.repeat(None)
 
-    for yt, yp, w, it, ip in zip(ytrue, ypred, weights, ytrue_ids, ypred_ids):
-        confusion_matrix[yt, yp] += w
-
+    for yt, yp, it, ip in zip(ytrue, ypred, ytrue_ids, ypred_ids):
         if it is not None:
             ids[yt, yp].append(it)
 
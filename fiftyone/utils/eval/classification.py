@@ -411,24 +411,20 @@ class TopKEvaluation(ClassificationEvaluation):
         targets_map = {label: idx for idx, label in enumerate(classes)}
 
         if is_frame_field:
-            confs = []
-            correct = []
-            for _ytrue, _ypred, _logits in zip(ytrue, ypred, logits):
-                _confs, _correct = _evaluate_top_k(
-                    _ytrue, _ypred, _logits, k, targets_map
-                )
-                confs.append(_confs)
-                correct.append(_correct)
-
+            counts = [len(_ytrue) for _ytrue in ytrue]
             ytrue = list(itertools.chain.from_iterable(ytrue))
             ytrue_ids = list(itertools.chain.from_iterable(ytrue_ids))
             ypred = list(itertools.chain.from_iterable(ypred))
             ypred_ids = list(itertools.chain.from_iterable(ypred_ids))
-            confs = list(itertools.chain.from_iterable(confs))
-        else:
-            confs, correct = _evaluate_top_k(
-                ytrue, ypred, logits, k, targets_map
-            )
+            logits = list(itertools.chain.from_iterable(logits))
+
+        ypred, confs, correct = _evaluate_top_k(
+            ytrue, ypred, logits, k, targets_map
+        )
+
+        if is_frame_field:
+            _correct = iter(correct)
+            correct = [list(itertools.islice(_correct, c)) for c in counts]
 
         results = ClassificationResults(
             samples,
@@ -464,68 +460,92 @@ class TopKEvaluation(ClassificationEvaluation):
 
 
 def _evaluate_top_k(ytrue, ypred, logits, k, targets_map):
-    confs = []
-    correct = []
-    for idx, (_ytrue, _logits) in enumerate(zip(ytrue, logits)):
-        if _logits is None:
-            # No logits; no prediction
-            ypred[idx] = None
-            _conf = None
-            _correct = False
-            msg = (
-                "Found sample(s) with no logits. Logits are required to "
-                + "compute top-k accuracy"
+    num_samples = len(ytrue)
+    ypred = list(ypred)
+    confs = [None] * num_samples
+    correct = [False] * num_samples
+
+    has_logits = np.array([l is not None for l in logits], dtype=bool)
+    if not has_logits.all():
+        msg = (
+            "Found sample(s) with no logits. Logits are required to "
+            + "compute top-k accuracy"
+        )
+        warnings.warn(msg)
+
+    for idx in np.flatnonzero(~has_logits):
+        # No logits; no prediction
+        ypred[idx] = None
+
+    has_gt = np.array([yt is not None for yt in ytrue], dtype=bool)
+
+    for idx in np.flatnonzero(has_logits & ~has_gt):
+        # Missing ground truth
+        correct[idx] = ypred[idx] is None
+
+    inds = np.flatnonzero(has_logits & has_gt)
+    if inds.size == 0:
+        return ypred, confs, correct
+
+    targets = np.empty(inds.size, dtype=int)
+    for i, idx in enumerate(inds):
+        try:
+            targets[i] = targets_map[ytrue[idx]]
+        except KeyError:
+            raise ValueError(
+                "Found ground truth label '%s' not in provided classes"
+                % ytrue[idx]
             )
-            warnings.warn(msg)
-        elif _ytrue is None:
-            # Missing ground truth
-            _correct = ypred[idx] is None
-            _conf = None
-        else:
-            try:
-                target = targets_map[_ytrue]
-            except KeyError:
-                raise ValueError(
-                    "Found ground truth label '%s' not in provided classes"
-                    % _ytrue
-                )
-
-            if k >= len(_logits):
-                found = True
-            else:
-                top_k = np.argpartition(_logits, -k)[-k:]
-                found = target in top_k
-
-            if found:
-                # Truth is in top-k; use it
-                ypred[idx] = _ytrue
-                logit = _logits[target]
-                _correct = True
-            elif ypred[idx] is not None:
-                # Truth is not in top-k; retain actual prediction
-                _ypred = ypred[idx]
-
-                try:
-                    _pred_idx = targets_map[_ypred]
-                except KeyError:
-                    raise ValueError(
-                        "Found predicted label '%s' not in provided classes"
-                        % _ypred
-                    )
-
-                logit = _logits[_pred_idx]
-                _correct = False
-            else:
-                # Missing prediction
-                logit = -np.inf
-                _correct = False
-
-            _conf = np.exp(logit) / np.sum(np.exp(_logits))
-
-        confs.append(_conf)
-        correct.append(_correct)
-
-    return confs, correct
+
+    # Stack logits into a matrix, padding ragged rows with -inf so that they
+    # contribute nothing to the softmax normalization
+    rows = [np.asarray(logits[idx], dtype=float) for idx in inds]
+    lengths = np.array([len(r) for r in rows], dtype=int)
+    num_classes = lengths.max()
+    if (lengths == num_classes).all():
+        _logits = np.stack(rows)
+    else:
+        _logits = np.full((inds.size, num_classes), -np.inf)
+        for i, r in enumerate(rows):
+            _logits[i, : len(r)] = r
+
+    if k >= num_classes:
+        found = np.ones(inds.size, dtype=bool)
+    else:
+        top_k = np.argpartition(_logits, -k, axis=1)[:, -k:]
+        found = (top_k == targets[:, np.newaxis]).any(axis=1)
+        found |= k >= lengths
+
+    # Truth is in top-k; use it. Otherwise, retain actual prediction
+    pred_inds = targets.copy()
+    has_pred = np.ones(inds.size, dtype=bool)
+    for i in np.flatnonzero(~found):
+        _ypred = ypred[inds[i]]
+        if _ypred is None:
+            has_pred[i] = False
+            continue
+
+        try:
+            pred_inds[i] = targets_map[_ypred]
+        except KeyError:
+            raise ValueError(
+                "Found predicted label '%s' not in provided classes" % _ypred
+            )
+
+    row_inds = np.arange(inds.size)
+    logit = _logits[row_inds, pred_inds]
+    logit[~has_pred] = -np.inf
+
+    _confs = np.exp(logit) / np.sum(np.exp(_logits), axis=1)
+
+    for i, idx in enumerate(inds):
+        if found[i]:
+            ypred[idx] = ytrue[idx]
+
+        confs[idx] = _confs[i]
+        correct[idx] = bool(found[i])
+
+    return ypred, confs, correct
 
 
 class BinaryEvaluationConfig(ClassificationEvaluationConfig):
@@ -48,7 +48,12 @@ class COCOEvaluationConfig(DetectionEvaluationConfig):
             of the provided :class:`fiftyone.core.labels.Polyline` instances
             rather than using their actual geometries
         tolerance (None): a tolerance, in pixels, when generating approximate
-            polylines for instance masks. Typical values are 1-3 pixels
+            polylines for instance masks. Typical values are 1-3 pixels. A
+            tolerance of 0 computes exact IoUs directly from the masks
+        sigmas (None): an optional list of per-keypoint standard deviations
+            to use when computing object keypoint similarities for
+            :class:`fiftyone.core.labels.Keypoints`. By default, all keypoints
+            are weighted equally
         compute_mAP (False): whether to perform the necessary computations so
             that mAP and PR curves can be generated
         iou_threshs (None): a list of IoU thresholds to use when computing mAP
@@ -77,6 +82,7 @@ class COCOEvaluationConfig(DetectionEvaluationConfig):
         use_masks=False,
         use_boxes=False,
         tolerance=None,
+        sigmas=None,
         compute_mAP=False,
         iou_threshs=None,
         max_preds=None,
@@ -97,6 +103,7 @@ class COCOEvaluationConfig(DetectionEvaluationConfig):
         self.use_masks = use_masks
         self.use_boxes = use_boxes
         self.tolerance = tolerance
+        self.sigmas = sigmas
         self.compute_mAP = compute_mAP
         self.iou_threshs = iou_threshs
         self.max_preds = max_preds
@@ -117,6 +124,8 @@ class COCOEvaluation(DetectionEvaluation):
     def __init__(self, config):
         super().__init__(config)
 
+        self._sweep = None
+
         if config.iou is None:
             raise ValueError(
                 "You must specify an `iou` threshold in order to run COCO "
@@ -163,7 +172,12 @@ class COCOEvaluation(DetectionEvaluation):
             gts = _copy_labels(gts)
             preds = _copy_labels(preds)
 
-        return _coco_evaluation_single_iou(gts, preds, eval_key, self.config)
+        if self.config.compute_mAP and self._sweep is None:
+            self._sweep = _IoUSweep(self.config)
+
+        return _coco_evaluation_single_iou(
+            gts, preds, eval_key, self.config, sweep=self._sweep
+        )
 
     def generate_results(
         self,
@@ -176,11 +190,16 @@ class COCOEvaluation(DetectionEvaluation):
     ):
         """Generates aggregate evaluation results for the samples.
 
-        If ``self.config.compute_mAP`` is True, this method performs COCO-style
-        evaluation as in :meth:`evaluate` to generate precision and recall
-        sweeps over the range of IoU thresholds in ``self.config.iou_threshs``.
-        In this case, a :class:`COCODetectionResults` instance is returned that
-        can compute mAP and PR curves.
+        If ``self.config.compute_mAP`` is True, this method generates
+        precision and recall sweeps over the range of IoU thresholds in
+        ``self.config.iou_threshs``. In this case, a
+        :class:`COCODetectionResults` instance is returned that can compute mAP
+        and PR curves.
+
+        The sweeps are accumulated by :meth:`evaluate` from the same IoUs that
+        it uses for matching. If :meth:`evaluate` has not been called,
+        COCO-style evaluation is performed on ``samples`` to generate the
+        sweeps.
 
         Args:
             samples: a :class:`fiftyone.core.collections.SampleCollection`
@@ -212,15 +231,19 @@ class COCOEvaluation(DetectionEvaluation):
                 backend=self,
             )
 
+        sweep = self._sweep
+        self._sweep = None
+
+        if sweep is None:
+            sweep = _compute_iou_sweep(samples, self.config, progress=progress)
+
         (
             precision,
             recall,
             thresholds,
             iou_threshs,
             classes,
-        ) = _compute_pr_curves(
-            samples, self.config, classes=classes, progress=progress
-        )
+        ) = sweep.compute_pr_curves(classes=classes)
 
         return COCODetectionResults(
             samples,
@@ -428,7 +451,7 @@ _NO_MATCH_ID = ""
 _NO_MATCH_IOU = None
 
 
-def _coco_evaluation_single_iou(gts, preds, eval_key, config):
+def _coco_evaluation_single_iou(gts, preds, eval_key, config, sweep=None):
     iou_thresh = min(config.iou, 1 - 1e-10)
     id_key = "%s_id" % eval_key
     iou_key = "%s_iou" % eval_key
@@ -437,6 +460,9 @@ def _coco_evaluation_single_iou(gts, preds, eval_key, config):
         gts, preds, [id_key], iou_key, config
     )
 
+    if sweep is not None:
+        sweep.add(cats, iscrowd)
+
     matches = _compute_matches(
         cats,
         pred_ious,
@@ -451,29 +477,6 @@ def _coco_evaluation_single_iou(gts, preds, eval_key, config):
     return [m[:-1] for m in matches]
 
 
-def _coco_evaluation_iou_sweep(gts, preds, config):
-    iou_threshs = config.iou_threshs
-    id_keys = ["eval_id_%s" % str(i).replace(".", "_") for i in iou_threshs]
-    iou_key = "eval_iou"
-
-    cats, pred_ious, iscrowd = _coco_evaluation_setup(
-        gts, preds, id_keys, iou_key, config, max_preds=config.max_preds
-    )
-
-    return [
-        _compute_matches(
-            cats,
-            pred_ious,
-            iou_thresh,
-            iscrowd,
-            eval_key="_eval",
-            id_key=id_key,
-            iou_key=iou_key,
-        )
-        for iou_thresh, id_key in zip(iou_threshs, id_keys)
-    ]
-
-
 def _coco_evaluation_setup(
     gts, preds, id_keys, iou_key, config, max_preds=None
 ):
@@ -488,13 +491,18 @@ def _coco_evaluation_setup(
     if config.use_boxes:
         iou_kwargs.update(use_boxes=True)
 
+    if config.sigmas is not None:
+        iou_kwargs.update(sigmas=config.sigmas)
+
     # Organize ground truth and predictions by category
 
     cats = defaultdict(lambda: defaultdict(list))
 
     if gts is not None:
         for obj in gts[gts._LABEL_LIST_FIELD]:
-            obj[iou_key] = _NO_MATCH_IOU
+            if iou_key is not None:
+                obj[iou_key] = _NO_MATCH_IOU
+
             for id_key in id_keys:
                 obj[id_key] = _NO_MATCH_ID
 
@@ -503,7 +511,9 @@ def _coco_evaluation_setup(
 
     if preds is not None:
         for obj in preds[preds._LABEL_LIST_FIELD]:
-            obj[iou_key] = _NO_MATCH_IOU
+            if iou_key is not None:
+                obj[iou_key] = _NO_MATCH_IOU
+
             for id_key in id_keys:
                 obj[id_key] = _NO_MATCH_ID
 
@@ -530,6 +540,10 @@ def _coco_evaluation_setup(
         # Compute ``num_preds x num_gts`` IoUs
         ious = foui.compute_ious(preds, gts, **iou_kwargs)
 
+        # Store the IoU matrix so that it can be reused by IoU sweeps
+        objects["sorted_gts"] = gts
+        objects["ious"] = ious
+
         gt_ids = [g.id for g in gts]
         for pred, gt_ious in zip(preds, ious):
             pred_ious[pred.id] = list(zip(gt_ids, gt_ious))
@@ -644,21 +658,16 @@ def _compute_matches(
     return matches
 
 
-def _compute_pr_curves(samples, config, classes=None, progress=None):
+def _compute_iou_sweep(samples, config, progress=None):
     gt_field = config.gt_field
     pred_field = config.pred_field
-    iou_threshs = config.iou_threshs
 
     samples = samples.select_fields([gt_field, pred_field])
 
     gt_field, processing_frames = samples._handle_frame_field(gt_field)
     pred_field, _ = samples._handle_frame_field(pred_field)
 
-    num_threshs = len(iou_threshs)
-    thresh_matches = [{} for _ in range(num_threshs)]
-
-    if classes is None:
-        _classes = set()
+    sweep = _IoUSweep(config)
 
     logger.info("Performing IoU sweep...")
     for sample in samples.iter_samples(progress=progress):
@@ -668,103 +677,237 @@ def _compute_pr_curves(samples, config, classes=None, progress=None):
             images = [sample]
 
         for image in images:
-            # Don't edit user's data during sweep
-            gts = _copy_labels(image[gt_field])
-            preds = _copy_labels(image[pred_field])
+            # Passing no keys ensures that the user's labels are not edited
+            cats, _, iscrowd = _coco_evaluation_setup(
+                image[gt_field], image[pred_field], [], None, config
+            )
+            sweep.add(cats, iscrowd)
 
-            matches_list = _coco_evaluation_iou_sweep(gts, preds, config)
+    return sweep
 
-            for idx, matches in enumerate(matches_list):
-                for match in matches:
-                    gt_label = match[0]
-                    pred_label = match[1]
-                    iscrowd = match[-1]
 
-                    if classes is None:
-                        _classes.add(gt_label)
-                        _classes.add(pred_label)
+class _IoUSweep(object):
+    """Accumulates the true and false positives of COCO-style matching at
+    multiple IoU thresholds, from which precision-recall curves are computed.
 
-                    if iscrowd:
-                        continue
+    Args:
+        config: a :class:`COCOEvaluationConfig`
+    """
+
+    _TP = 1
+    _FP = 2
+
+    def __init__(self, config):
+        self.iou_threshs = config.iou_threshs
+        self.max_preds = config.max_preds
+
+        self._threshs = np.array(config.iou_threshs, dtype=float)[:, None]
+        self._class_inds = {}
+        self._num_gt = defaultdict(int)
+        self._pred_classes = []
+        self._pred_results = []
+        self._pred_confs = []
 
-                    c = gt_label if gt_label is not None else pred_label
-
-                    if c not in thresh_matches[idx]:
-                        thresh_matches[idx][c] = {
-                            "tp": [],
-                            "fp": [],
-                            "num_gt": 0,
-                        }
-
-                    if gt_label == pred_label:
-                        thresh_matches[idx][c]["tp"].append(match)
-                    elif pred_label:
-                        thresh_matches[idx][c]["fp"].append(match)
-
-                    if gt_label:
-                        thresh_matches[idx][c]["num_gt"] += 1
-
-    if classes is None:
-        _classes.discard(None)
-        classes = sorted(_classes)
-
-    num_classes = len(classes)
-    class_idx_map = {c: idx for idx, c in enumerate(classes)}
-
-    # Compute precision-recall
-    # https://github.com/cocodataset/cocoapi/blob/master/PythonAPI/pycocotools/cocoeval.py
-    precision = -np.ones((num_threshs, num_classes, 101))
-    thresholds = -np.ones((num_threshs, num_classes, 101))
-    recall = np.linspace(0, 1, 101)
-    for idx, _thresh_matches in enumerate(thresh_matches):
-        for c, matches in _thresh_matches.items():
-            c_idx = class_idx_map.get(c, None)
-            num_gt = matches["num_gt"]
-
-            if c_idx is None or num_gt == 0:
+    def add(self, cats, iscrowd):
+        """Matches the objects in the given categories at each IoU threshold.
+
+        Args:
+            cats: a dict of categories in the format returned by
+                ``_coco_evaluation_setup()``
+            iscrowd: a function that returns whether an object is a crowd
+        """
+        for objects in cats.values():
+            gts = objects["sorted_gts"]
+            preds = objects["preds"]
+            ious = objects["ious"]
+
+            if self.max_preds is not None:
+                preds = preds[: self.max_preds]
+                ious = ious[: self.max_preds]
+
+            gt_crowds = np.array([iscrowd(gt) for gt in gts], dtype=bool)
+            gt_inds = np.array(
+                [self._get_class_index(gt.label) for gt in gts], dtype=int
+            )
+
+            for gt, gt_crowd in zip(gts, gt_crowds):
+                if not gt_crowd:
+                    self._num_gt[gt.label] += 1
+
+            if not preds:
                 continue
 
-            tp = matches["tp"]
-            fp = matches["fp"]
-            tp_fp = np.array([1] * len(tp) + [0] * len(fp))
-            confs = np.array([m[3] for m in tp] + [m[3] for m in fp])
-            if None in confs:
-                raise ValueError(
-                    "All predicted objects must have their `confidence` "
-                    "attribute populated in order to compute precision-recall "
-                    "curves"
-                )
+            pred_inds = np.array(
+                [self._get_class_index(pred.label) for pred in preds],
+                dtype=int,
+            )
+            confs = np.array(
+                [
+                    pred.confidence if pred.confidence is not None else np.nan
+                    for pred in preds
+                ],
+                dtype=float,
+            )
+
+            matches = self._match(ious, gt_crowds, gt_inds, pred_inds)
+
+            # Predictions are scored for the class of their matching ground
+            # truth, or for their own class if they are unmatched
+            matched = matches >= 0
+            _matches = np.where(matched, matches, 0)
+            if gt_inds.size > 0:
+                classes = np.where(matched, gt_inds[_matches], pred_inds)
+                is_crowd = matched & gt_crowds[_matches]
+            else:
+                classes = np.broadcast_to(pred_inds, matches.shape)
+                is_crowd = np.zeros(matches.shape, dtype=bool)
+
+            results = np.full(matches.shape, self._FP, dtype=np.int8)
+            results[matched & (classes == pred_inds)] = self._TP
+            results[is_crowd] = 0
+
+            self._pred_classes.append(classes.astype(np.int32))
+            self._pred_results.append(results)
+            self._pred_confs.append(confs)
 
-            inds = np.argsort(-confs, kind="mergesort")
-            tp_fp = tp_fp[inds]
-            confs = confs[inds]
+    def compute_pr_curves(self, classes=None):
+        """Computes precision-recall curves from the accumulated matches.
 
-            tp_sum = np.cumsum(tp_fp).astype(dtype=float)
-            total = np.arange(1, len(tp_fp) + 1).astype(dtype=float)
+        Args:
+            classes (None): the list of classes for which to compute curves.
+                By default, all observed classes are used
+
+        Returns:
+            a tuple of
+
+            -   an array of precision values of shape
+                ``num_iou_threshs x num_classes x num_recall``
+            -   an array of recall values
+            -   an array of decision thresholds of shape
+                ``num_iou_threshs x num_classes x num_recall``
+            -   the list of IoU thresholds
+            -   the list of classes
+        """
+        if classes is None:
+            classes = sorted(c for c in self._class_inds if c is not None)
+
+        num_threshs = len(self.iou_threshs)
+        num_classes = len(classes)
+
+        if self._pred_confs:
+            pred_classes = np.concatenate(self._pred_classes, axis=1)
+            pred_results = np.concatenate(self._pred_results, axis=1)
+            pred_confs = np.concatenate(self._pred_confs)
+        else:
+            pred_classes = np.zeros((num_threshs, 0), dtype=np.int32)
+            pred_results = np.zeros((num_threshs, 0), dtype=np.int8)
+            pred_confs = np.zeros(0, dtype=float)
+
+        # Compute precision-recall
+        # https://github.com/cocodataset/cocoapi/blob/master/PythonAPI/pycocotools/cocoeval.py
+        precision = -np.ones((num_threshs, num_classes, 101))
+        thresholds = -np.ones((num_threshs, num_classes, 101))
+        recall = np.linspace(0, 1, 101)
+        for c_idx, c in enumerate(classes):
+            class_ind = self._class_inds.get(c, None)
+            num_gt = self._num_gt.get(c, 0)
+
+            if class_ind is None or num_gt == 0:
+                continue
+
+            for idx in range(num_threshs):
+                in_class = pred_classes[idx] == class_ind
+                tp = in_class & (pred_results[idx] == self._TP)
+                fp = in_class & (pred_results[idx] == self._FP)
+
+                tp_fp = np.concatenate([np.ones(tp.sum()), np.zeros(fp.sum())])
+                confs = np.concatenate([pred_confs[tp], pred_confs[fp]])
+                if np.isnan(confs).any():
+                    raise ValueError(
+                        "All predicted objects must have their `confidence` "
+                        "attribute populated in order to compute "
+                        "precision-recall curves"
+                    )
 
-            pre = tp_sum / total
-            rec = tp_sum / num_gt
+                inds = np.argsort(-confs, kind="mergesort")
+                tp_fp = tp_fp[inds]
+                confs = confs[inds]
 
-            for i in range(len(pre) - 1, 0, -1):
-                if pre[i] > pre[i - 1]:
-                    pre[i - 1] = pre[i]
+                tp_sum = np.cumsum(tp_fp)
+                total = np.arange(1, len(tp_fp) + 1, dtype=float)
 
-            q = np.zeros(101)
-            t = np.zeros(101)
+                pre = tp_sum / total
+                rec = tp_sum / num_gt
 
-            inds = np.searchsorted(rec, recall, side="left")
+                # Make precision monotonically decreasing
+                pre = np.maximum.accumulate(pre[::-1])[::-1]
 
-            try:
-                for ri, pi in enumerate(inds):
-                    q[ri] = pre[pi]
-                    t[ri] = confs[pi]
-            except:
-                pass
+                q = np.zeros(101)
+                t = np.zeros(101)
 
-            precision[idx][c_idx] = q
-            thresholds[idx][c_idx] = t
+                inds = np.searchsorted(rec, recall, side="left")
+                valid = inds < len(pre)
+                q[valid] = pre[inds[valid]]
+                t[valid] = confs[inds[valid]]
 
-    return precision, recall, thresholds, iou_threshs, classes
+                precision[idx][c_idx] = q
+                thresholds[idx][c_idx] = t
+
+        return precision, recall, thresholds, self.iou_threshs, classes
+
+    def _get_class_index(self, label):
+        class_ind = self._class_inds.get(label, None)
+        if class_ind is None:
+            class_ind = len(self._class_inds)
+            self._class_inds[label] = class_ind
+
+        return class_ind
+
+    def _match(self, ious, gt_crowds, gt_inds, pred_inds):
+        # Returns a ``num_iou_threshs x num_preds`` array containing the index
+        # of the ground truth object that each prediction matches at each
+        # threshold, or -1 if the prediction is unmatched
+        num_threshs = self._threshs.shape[0]
+        num_preds, num_gts = ious.shape
+
+        matches = np.full((num_threshs, num_preds), -1, dtype=int)
+        if num_gts == 0:
+            return matches
+
+        thresh_inds = np.arange(num_threshs)
+        gt_matched = np.zeros((num_threshs, num_gts), dtype=bool)
+        has_crowds = gt_crowds.any()
+
+        for pred_idx in range(num_preds):
+            above = ious[pred_idx] >= self._threshs
+
+            # Match the highest IoU unmatched non-crowd ground truth, breaking
+            # ties in favor of the last such object
+            valid = above & ~gt_crowds & ~gt_matched
+            found = valid.any(axis=1)
+            best = _last_argmax(np.where(valid, ious[pred_idx], -1))
+
+            if has_crowds:
+                # Otherwise, match the highest IoU crowd of the same class
+                crowd = gt_crowds & (gt_inds == pred_inds[pred_idx])
+                valid = above & crowd & ~found[:, None]
+                found_crowd = valid.any(axis=1)
+                best_crowd = _last_argmax(np.where(valid, ious[pred_idx], -1))
+                best = np.where(found, best, best_crowd)
+            else:
+                found_crowd = False
+
+            is_match = found | found_crowd
+            matches[is_match, pred_idx] = best[is_match]
+
+            # Only non-crowd ground truth objects can be matched once
+            gt_matched[thresh_inds[found], best[found]] = True
+
+        return matches
+
+
+def _last_argmax(values):
+    return values.shape[1] - 1 - np.argmax(values[:, ::-1], axis=1)
 
 
 def _copy_labels(labels):
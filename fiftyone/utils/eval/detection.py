@@ -10,6 +10,7 @@ import inspect
 import itertools
 import logging
 
+from bson import Binary
 import numpy as np
 
 import eta.core.utils as etau
@@ -186,7 +187,11 @@ def evaluate_detections(
     else:
         _samples = samples.select_fields([gt_field, pred_field])
 
-    matches = []
+    if config.compact:
+        matches = _CompactMatches()
+    else:
+        matches = []
+
     logger.info("Evaluating detections...")
     for sample in _samples.iter_samples(progress=progress, autosave=save):
         if processing_frames:
@@ -243,16 +248,28 @@ class DetectionEvaluationConfig(foe.EvaluationMethodConfig):
         iou (None): the IoU threshold to use to determine matches
         classwise (None): whether to only match objects with the same class
             label (True) or allow matches between classes (False)
+        compact (False): whether to store the matches in the results as
+            compact typed arrays rather than as per-match lists of labels and
+            IDs. This greatly reduces the memory and storage footprint of the
+            results of large evaluations. See :class:`DetectionResults` for
+            details
     """
 
     def __init__(
-        self, pred_field, gt_field, iou=None, classwise=None, **kwargs
+        self,
+        pred_field,
+        gt_field,
+        iou=None,
+        classwise=None,
+        compact=False,
+        **kwargs,
     ):
         super().__init__(**kwargs)
         self.pred_field = pred_field
         self.gt_field = gt_field
         self.iou = iou
         self.classwise = classwise
+        self.compact = compact
 
     @property
     def type(self):
@@ -515,6 +532,14 @@ class DetectionEvaluation(foe.EvaluationMethod):
 class DetectionResults(BaseEvaluationResults):
     """Class that stores the results of a detection evaluation.
 
+    If the evaluation's ``config.compact`` parameter is True, the matches are
+    stored in compact form: labels are encoded as integer codes, IoUs and
+    confidences as float arrays with ``nan`` for missing values, and IDs as
+    raw ObjectId bytes. In this case, the :attr:`ytrue`, :attr:`ypred`, and
+    :attr:`weights` attributes contain the number of matches for each
+    observed ``(gt_label, pred_label)`` pair, from which all metrics are
+    computed, and :attr:`ytrue_ids` and :attr:`ypred_ids` are None.
+
     Args:
         samples: the :class:`fiftyone.core.collections.SampleCollection` used
         config: the :class:`DetectionEvaluationConfig` used
@@ -540,6 +565,31 @@ class DetectionResults(BaseEvaluationResults):
         missing=None,
         backend=None,
     ):
+        if config.compact and not isinstance(matches, _CompactMatches):
+            _matches = _CompactMatches()
+            _matches.extend(matches)
+            matches = _matches
+
+        if isinstance(matches, _CompactMatches):
+            ytrue, ypred, weights = matches.count_pairs()
+
+            super().__init__(
+                samples,
+                config,
+                eval_key,
+                ytrue,
+                ypred,
+                weights=weights,
+                classes=classes,
+                missing=missing,
+                backend=backend,
+            )
+
+            self.confs = matches.confs
+            self.ious = matches.ious
+            self._matches = matches
+            return
+
         if matches:
             ytrue, ypred, ious, confs, ytrue_ids, ypred_ids = zip(*matches)
         else:
@@ -567,9 +617,51 @@ class DetectionResults(BaseEvaluationResults):
         )
 
         self.ious = np.array(ious)
+        self._matches = None
+
+    def attributes(self):
+        attrs = super().attributes()
+
+        if self._matches is not None:
+            attrs = [a for a in attrs if a not in _MATCH_ATTRS]
+
+        return attrs
+
+    def serialize(self, reflective=False):
+        d = super().serialize(reflective=reflective)
+
+        if self._matches is not None:
+            d["matches"] = self._matches.serialize()
+
+        return d
+
+    def _get_confusion_data(self, tabulate_ids=False):
+        if self._matches is None or not tabulate_ids:
+            return super()._get_confusion_data(tabulate_ids=tabulate_ids)
+
+        # IDs can only be tabulated from the individual matches
+        ytrue, ypred, ytrue_ids, ypred_ids = self._matches.decode(
+            missing=self.missing
+        )
+        return ytrue, ypred, None, ytrue_ids, ypred_ids
 
     @classmethod
     def _from_dict(cls, d, samples, config, eval_key, **kwargs):
+        classes = d.get("classes", None)
+        missing = d.get("missing", None)
+
+        if "matches" in d:
+            matches = _CompactMatches.from_dict(d["matches"])
+            return cls(
+                samples,
+                config,
+                eval_key,
+                matches,
+                classes=classes,
+                missing=missing,
+                **kwargs,
+            )
+
         ytrue = d["ytrue"]
         ypred = d["ypred"]
         ious = d["ious"]
@@ -586,9 +678,6 @@ class DetectionResults(BaseEvaluationResults):
         if ypred_ids is None:
             ypred_ids = itertools.repeat(None)
 
-        classes = d.get("classes", None)
-        missing = d.get("missing", None)
-
         matches = list(zip(ytrue, ypred, ious, confs, ytrue_ids, ypred_ids))
 
         return cls(
@@ -602,6 +691,268 @@ class DetectionResults(BaseEvaluationResults):
         )
 
 
+_MATCH_ATTRS = (
+    "ytrue",
+    "ypred",
+    "confs",
+    "weights",
+    "ytrue_ids",
+    "ypred_ids",
+    "ious",
+)
+
+
+class _CompactMatches(object):
+    """Compact storage for
+    ``(gt_label, pred_label, iou, pred_confidence, gt_id, pred_id)`` matches.
+
+    Labels are stored as ``int32`` codes into :attr:`labels`, with ``-1``
+    for missing labels. IoUs and confidences are stored as float arrays with
+    ``nan`` for missing values, and IDs are stored as ``num_matches x 12``
+    arrays of ObjectId bytes, with zeros for missing IDs.
+
+    Matches can be added incrementally via :meth:`extend`.
+
+    Args:
+        labels (None): the list of labels that the codes refer to
+        arrays (None): an optional tuple of
+            ``(ytrue, ypred, ious, confs, ytrue_ids, ypred_ids)`` arrays
+    """
+
+    _BATCH_SIZE = 100000
+
+    def __init__(self, labels=None, arrays=None):
+        if labels is None:
+            labels = []
+
+        self.labels = list(labels)
+
+        self._codes = {label: idx for idx, label in enumerate(self.labels)}
+        self._chunks = [arrays] if arrays is not None else []
+        self._buffer = []
+
+    def __len__(self):
+        return sum(len(c[0]) for c in self._chunks) + len(self._buffer)
+
+    def __iter__(self):
+        ytrue, ypred, ytrue_ids, ypred_ids = self.decode()
+        ious = [None if np.isnan(i) else i for i in self.ious.tolist()]
+        confs = [None if np.isnan(c) else c for c in self.confs.tolist()]
+        return zip(ytrue, ypred, ious, confs, ytrue_ids, ypred_ids)
+
+    @property
+    def ytrue(self):
+        """The ``int32`` codes of the ground truth labels."""
+        return self._get_arrays()[0]
+
+    @property
+    def ypred(self):
+        """The ``int32`` codes of the predicted labels."""
+        return self._get_arrays()[1]
+
+    @property
+    def ious(self):
+        """The IoUs of the matches."""
+        return self._get_arrays()[2]
+
+    @property
+    def confs(self):
+        """The confidences of the predictions."""
+        return self._get_arrays()[3]
+
+    @property
+    def ytrue_ids(self):
+        """The ObjectId bytes of the ground truth labels."""
+        return self._get_arrays()[4]
+
+    @property
+    def ypred_ids(self):
+        """The ObjectId bytes of the predicted labels."""
+        return self._get_arrays()[5]
+
+    def extend(self, matches):
+        """Adds the given matches.
+
+        Args:
+            matches: an iterable of
+                ``(gt_label, pred_label, iou, pred_confidence, gt_id, pred_id)``
+                tuples
+        """
+        self._buffer.extend(matches)
+        if len(self._buffer) >= self._BATCH_SIZE:
+            self._flush()
+
+    def count_pairs(self):
+        """Counts the number of matches for each observed
+        ``(gt_label, pred_label)`` pair.
+
+        Returns:
+            a tuple of
+
+            -   a list of ground truth labels
+            -   a list of predicted labels
+            -   an array of counts
+        """
+        ytrue, ypred = self._get_arrays()[:2]
+
+        num_codes = len(self.labels) + 1
+        pairs = (ytrue.astype(np.int64) + 1) * num_codes + (ypred + 1)
+        pairs, counts = np.unique(pairs, return_counts=True)
+
+        labels = [None] + self.labels
+        ytrue = [labels[i] for i in pairs // num_codes]
+        ypred = [labels[i] for i in pairs % num_codes]
+
+        return ytrue, ypred, counts
+
+    def decode(self, missing=None):
+        """Decodes the labels and IDs of the matches.
+
+        Args:
+            missing (None): the value to use for missing labels
+
+        Returns:
+            a tuple of ``(ytrue, ypred, ytrue_ids, ypred_ids)`` object arrays
+        """
+        ytrue, ypred, _, _, ytrue_ids, ypred_ids = self._get_arrays()
+
+        labels = np.array(self.labels + [missing], dtype=object)
+        ytrue = labels[ytrue]
+        ypred = labels[ypred]
+        ytrue_ids = _decode_ids(ytrue_ids)
+        ypred_ids = _decode_ids(ypred_ids)
+
+        return ytrue, ypred, ytrue_ids, ypred_ids
+
+    def serialize(self):
+        """Serializes the matches into a dict of binary arrays.
+
+        Returns:
+            a dict
+        """
+        ytrue, ypred, ious, confs, ytrue_ids, ypred_ids = self._get_arrays()
+        return {
+            "labels": self.labels,
+            "ytrue": _serialize_array(ytrue),
+            "ypred": _serialize_array(ypred),
+            "ious": _serialize_array(ious),
+            "confs": _serialize_array(confs),
+            "ytrue_ids": _serialize_array(ytrue_ids),
+            "ypred_ids": _serialize_array(ypred_ids),
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        """Loads matches from a dict generated by :meth:`serialize`.
+
+        Args:
+            d: a dict
+
+        Returns:
+            a :class:`_CompactMatches`
+        """
+        arrays = tuple(
+            fou.deserialize_numpy_array(d[key])
+            for key in ("ytrue", "ypred", "ious", "confs")
+        ) + tuple(
+            fou.deserialize_numpy_array(d[key]).reshape(-1, 12)
+            for key in ("ytrue_ids", "ypred_ids")
+        )
+        return cls(labels=d["labels"], arrays=arrays)
+
+    def _get_arrays(self):
+        self._flush()
+
+        if not self._chunks:
+            self._chunks.append(_empty_arrays())
+        elif len(self._chunks) > 1:
+            self._chunks = [
+                tuple(np.concatenate(arrays) for arrays in zip(*self._chunks))
+            ]
+
+        return self._chunks[0]
+
+    def _flush(self):
+        if not self._buffer:
+            return
+
+        ytrue, ypred, ious, confs, ytrue_ids, ypred_ids = zip(*self._buffer)
+        self._buffer = []
+
+        self._chunks.append(
+            (
+                self._encode_labels(ytrue),
+                self._encode_labels(ypred),
+                _to_float_array(ious),
+                _to_float_array(confs),
+                _encode_ids(ytrue_ids),
+                _encode_ids(ypred_ids),
+            )
+        )
+
+    def _encode_labels(self, labels):
+        codes = np.empty(len(labels), dtype=np.int32)
+        for idx, label in enumerate(labels):
+            if label is None:
+                codes[idx] = -1
+                continue
+
+            code = self._codes.get(label, None)
+            if code is None:
+                code = len(self.labels)
+                self._codes[label] = code
+                self.labels.append(label)
+
+            codes[idx] = code
+
+        return codes
+
+
+def _empty_arrays():
+    return (
+        np.zeros(0, dtype=np.int32),
+        np.zeros(0, dtype=np.int32),
+        np.zeros(0, dtype=float),
+        np.zeros(0, dtype=float),
+        np.zeros((0, 12), dtype=np.uint8),
+        np.zeros((0, 12), dtype=np.uint8),
+    )
+
+
+def _to_float_array(values):
+    return np.array(
+        [v if v is not None else np.nan for v in values], dtype=float
+    )
+
+
+def _encode_ids(ids):
+    null_id = bytes(12)
+    raw = b"".join(
+        bytes.fromhex(_id) if _id is not None else null_id for _id in ids
+    )
+
+    if len(raw) != 12 * len(ids):
+        raise ValueError(
+            "Compact detection results require ObjectId label IDs"
+        )
+
+    return np.frombuffer(raw, dtype=np.uint8).reshape(-1, 12)
+
+
+def _decode_ids(ids):
+    hex_ids = ids.tobytes().hex()
+    _ids = np.array(
+        [hex_ids[i : i + 24] for i in range(0, len(hex_ids), 24)],
+        dtype=object,
+    )
+    _ids[~ids.any(axis=1)] = None
+    return _ids
+
+
+def _serialize_array(array):
+    return Binary(fou.serialize_numpy_array(array))
+
+
 def _parse_config(pred_field, gt_field, method, is_temporal, **kwargs):
     if method is None:
         if is_temporal:
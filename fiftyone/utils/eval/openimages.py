@@ -17,6 +17,7 @@ from .detection import (
     DetectionEvaluation,
     DetectionEvaluationConfig,
     DetectionResults,
+    _CompactMatches,
 )
 
 
@@ -43,7 +44,8 @@ class OpenImagesEvaluationConfig(DetectionEvaluationConfig):
             of the provided :class:`fiftyone.core.labels.Polyline` instances
             rather than using their actual geometries
         tolerance (None): a tolerance, in pixels, when generating approximate
-            polylines for instance masks. Typical values are 1-3 pixels
+            polylines for instance masks. Typical values are 1-3 pixels. A
+            tolerance of 0 computes exact IoUs directly from the masks
         max_preds (None): the maximum number of predicted objects to evaluate
             when computing mAP and PR curves
         error_level (1): the error level to use when manipulating instance
@@ -116,11 +118,7 @@ class OpenImagesEvaluationConfig(DetectionEvaluationConfig):
             self.expand_gt_hierarchy = False
 
         if self.expand_gt_hierarchy or self.expand_pred_hierarchy:
-            (
-                self._hierarchy_keyed_parent,
-                self._hierarchy_keyed_child,
-                _,
-            ) = _build_plain_hierarchy(self.hierarchy, skip_root=True)
+            self._hierarchy_index = _HierarchyIndex(self.hierarchy)
 
     @property
     def method(self):
@@ -443,26 +441,92 @@ _NO_MATCH_ID = ""
 _NO_MATCH_IOU = None
 
 
-def _expand_label_hierarchy(labels, config, expand_child=True):
-    keyed_nodes = config._hierarchy_keyed_parent
-    if expand_child:
-        keyed_nodes = config._hierarchy_keyed_child
+class _HierarchyIndex(object):
+    """Precompiled index of a class hierarchy.
+
+    The ancestors and descendants of each class are stored as packed bitsets
+    over the classes in the hierarchy, so that sets of labels can be expanded
+    via bitwise operations.
+
+    Args:
+        hierarchy: a class hierarchy dict
+    """
+
+    def __init__(self, hierarchy):
+        keyed_parent, keyed_child, _ = _build_plain_hierarchy(
+            hierarchy, skip_root=True
+        )
+
+        classes = sorted(set(keyed_parent.keys()) | set(keyed_child.keys()))
+        inds = {c: i for i, c in enumerate(classes)}
+
+        self._classes = np.array(classes, dtype=object)
+        self._inds = inds
+        self._ancestors = self._pack(keyed_child, inds)
+        self._descendants = self._pack(keyed_parent, inds)
 
-    additional_labs = []
-    for lab in labels:
-        if lab in keyed_nodes:
-            additional_labs += list(keyed_nodes[lab])
+        # Decode each class' ancestors once for use when expanding objects
+        self._ancestor_labels = {
+            c: tuple(self._decode(self._ancestors[i])) for c, i in inds.items()
+        }
 
-    return list(set(labels + additional_labs))
+    @staticmethod
+    def _pack(keyed_nodes, inds):
+        num_classes = len(inds)
+        bits = np.zeros((num_classes, (num_classes + 7) // 8), dtype=np.uint8)
+        row = np.zeros(num_classes, dtype=bool)
+        for label, nodes in keyed_nodes.items():
+            if not nodes:
+                continue
 
+            row[:] = False
+            row[[inds[n] for n in nodes]] = True
+            bits[inds[label]] = np.packbits(row)
 
-def _expand_detection_hierarchy(cats, obj, config, label_type):
-    keyed_children = config._hierarchy_keyed_child
-    for parent in keyed_children[obj.label]:
-        new_obj = obj.copy()
-        new_obj.id = obj.id  # we need ID to stay the same
-        new_obj.label = parent
-        cats[parent][label_type].append(new_obj)
+        return bits
+
+    def _decode(self, bits):
+        mask = np.unpackbits(bits, count=len(self._classes)).astype(bool)
+        return self._classes[mask].tolist()
+
+    def expand_labels(self, labels, ancestors=True):
+        """Expands the given labels to include all of their ancestors or
+        descendants in the hierarchy.
+
+        Args:
+            labels: an iterable of labels
+            ancestors (True): whether to add ancestors (True) or descendants
+                (False) of the labels
+
+        Returns:
+            a set of labels
+        """
+        labels = set(labels)
+        inds = [self._inds[l] for l in labels if l in self._inds]
+        if not inds:
+            return labels
+
+        bits = self._ancestors if ancestors else self._descendants
+        labels.update(self._decode(np.bitwise_or.reduce(bits[inds], axis=0)))
+        return labels
+
+    def get_ancestors(self, label):
+        """Returns the ancestors of the given label in the hierarchy.
+
+        Args:
+            label: a label
+
+        Returns:
+            a tuple of labels, which is empty if the label is not in the
+            hierarchy
+        """
+        return self._ancestor_labels.get(label, ())
+
+
+def _expand_label_hierarchy(labels, config, expand_child=True):
+    return config._hierarchy_index.expand_labels(
+        labels, ancestors=expand_child
+    )
 
 
 def _open_images_evaluation_single_iou(
@@ -472,7 +536,7 @@ def _open_images_evaluation_single_iou(
     id_key = "%s_id" % eval_key
     iou_key = "%s_iou" % eval_key
 
-    cats, pred_ious, iscrowd = _open_images_evaluation_setup(
+    cats = _open_images_evaluation_setup(
         gts,
         preds,
         id_key,
@@ -485,9 +549,8 @@ def _open_images_evaluation_single_iou(
 
     matches = _compute_matches(
         cats,
-        pred_ious,
         iou_thresh,
-        iscrowd,
+        config.classwise,
         eval_key=eval_key,
         id_key=id_key,
         iou_key=iou_key,
@@ -504,7 +567,10 @@ def _open_images_evaluation_setup(
     elif neg_labs is None:
         relevant_labs = pos_labs
     else:
-        relevant_labs = list(set(pos_labs + neg_labs))
+        relevant_labs = set(pos_labs) | set(neg_labs)
+
+    if relevant_labs is not None:
+        relevant_labs = set(relevant_labs)
 
     iscrowd = lambda l: bool(l.get_attribute_value(config.iscrowd, False))
     classwise = config.classwise
@@ -517,36 +583,42 @@ def _open_images_evaluation_setup(
     if config.use_boxes:
         iou_kwargs.update(use_boxes=True)
 
-    # Organize ground truth and predictions by category
-
+    # Organize ground truth and predictions by category. When expanding the
+    # hierarchy, objects are also added to the categories of their ancestors,
+    # where they are treated as having the ancestor's label
     cats = defaultdict(lambda: defaultdict(list))
 
     if gts is not None:
-        for obj in gts[gts._LABEL_LIST_FIELD]:
-            if relevant_labs is None or obj.label in relevant_labs:
-                obj[iou_key] = _NO_MATCH_IOU
-                obj[id_key] = _NO_MATCH_ID
-
-                label = obj.label if classwise else "all"
-                cats[label]["gts"].append(obj)
-
-                if config.expand_gt_hierarchy and label != "all":
-                    _expand_detection_hierarchy(cats, obj, config, "gts")
+        hierarchy_index = (
+            config._hierarchy_index if config.expand_gt_hierarchy else None
+        )
+        _add_objects(
+            cats,
+            gts,
+            "gts",
+            id_key,
+            iou_key,
+            classwise,
+            relevant_labs,
+            hierarchy_index,
+        )
 
     if preds is not None:
-        for obj in preds[preds._LABEL_LIST_FIELD]:
-            if relevant_labs is None or obj.label in relevant_labs:
-                obj[iou_key] = _NO_MATCH_IOU
-                obj[id_key] = _NO_MATCH_ID
-
-                label = obj.label if classwise else "all"
-                cats[label]["preds"].append(obj)
-
-                if config.expand_pred_hierarchy and label != "all":
-                    _expand_detection_hierarchy(cats, obj, config, "preds")
+        hierarchy_index = (
+            config._hierarchy_index if config.expand_pred_hierarchy else None
+        )
+        _add_objects(
+            cats,
+            preds,
+            "preds",
+            id_key,
+            iou_key,
+            classwise,
+            relevant_labs,
+            hierarchy_index,
+        )
 
     # Compute IoUs within each category
-    pred_ious = {}
     for objects in cats.values():
         gts = objects["gts"]
         preds = objects["preds"]
@@ -560,21 +632,43 @@ def _open_images_evaluation_setup(
         objects["preds"] = preds
 
         # Sort ground truth so crowds are last
-        gts = sorted(gts, key=iscrowd)
+        crowds = [iscrowd(g) for g in gts]
+        inds = sorted(range(len(gts)), key=crowds.__getitem__)
+        objects["gts"] = [gts[i] for i in inds]
+        objects["crowds"] = [crowds[i] for i in inds]
 
         # Compute ``num_preds x num_gts`` IoUs
-        ious = foui.compute_ious(preds, gts, **iou_kwargs)
-
-        gt_ids = [g.id for g in gts]
-        for pred, gt_ious in zip(preds, ious):
-            pred_ious[pred.id] = list(zip(gt_ids, gt_ious))
+        objects["ious"] = foui.compute_ious(
+            preds, objects["gts"], **iou_kwargs
+        )
 
-    return cats, pred_ious, iscrowd
+    return cats
 
 
-def _compute_matches(
-    cats, pred_ious, iou_thresh, iscrowd, eval_key, id_key, iou_key
+def _add_objects(
+    cats,
+    labels,
+    label_type,
+    id_key,
+    iou_key,
+    classwise,
+    relevant_labs,
+    hierarchy_index,
 ):
+    for obj in labels[labels._LABEL_LIST_FIELD]:
+        if relevant_labs is None or obj.label in relevant_labs:
+            obj[iou_key] = _NO_MATCH_IOU
+            obj[id_key] = _NO_MATCH_ID
+
+            label = obj.label if classwise else "all"
+            cats[label][label_type].append(obj)
+
+            if hierarchy_index is not None and label != "all":
+                for parent in hierarchy_index.get_ancestors(label):
+                    cats[parent][label_type].append(obj)
+
+
+def _compute_matches(cats, iou_thresh, classwise, eval_key, id_key, iou_key):
     matches = []
 
     # For efficient rounding
@@ -582,203 +676,234 @@ def _compute_matches(
 
     # Match preds to GT, highest confidence first
     for cat, objects in cats.items():
-        gt_map = {gt.id: gt for gt in objects["gts"]}
+        gts = objects["gts"]
+        preds = objects["preds"]
+        crowds = objects["crowds"]
+        num_gts = len(gts)
+
+        # Objects added to an ancestor's category take on its label, and
+        # their results are only stored on the objects in their own category
+        if classwise:
+            gt_labels = [cat] * num_gts
+            pred_labels = [cat] * len(preds)
+            gt_store = [gt.label == cat for gt in gts]
+            pred_store = [pred.label == cat for pred in preds]
+        else:
+            gt_labels = [gt.label for gt in gts]
+            pred_labels = [pred.label for pred in preds]
+            gt_store = [True] * num_gts
+            pred_store = [True] * len(preds)
+
+        ious = np.floor(np.asarray(objects["ious"]) * p_round + 0.5) / p_round
+        ious = ious.reshape(len(preds), num_gts).tolist()
+
+        # Index of the first prediction matched to each GT
+        gt_matches = [None] * num_gts
 
         # Match each prediction to the highest available IoU ground truth
-        for pred in objects["preds"]:
-            if pred.id in pred_ious:
-                best_match = None
-                best_match_iou = iou_thresh
-                highest_already_matched_iou = iou_thresh
-                for gt_id, iou in pred_ious[pred.id]:
-                    iou = int(iou * p_round + 0.5) / p_round
-                    gt = gt_map[gt_id]
-                    gt_iscrowd = iscrowd(gt)
-
-                    # Only iscrowd GTs can have multiple matches
-                    if gt[id_key] != _NO_MATCH_ID and not gt_iscrowd:
-                        if iou > highest_already_matched_iou:
-                            highest_already_matched_iou = iou
-                            if iou > best_match_iou:
-                                best_match = None
-                                best_match_iou = iou_thresh
-
-                        continue
-
-                    # If matching classwise=False
-                    # Only objects with the same class can match a crowd
-                    if gt_iscrowd and gt.label != pred.label:
-                        continue
-
-                    # Crowds are last in order of GTs
-                    # If we already matched a non-crowd and are on a crowd,
-                    # then break
-                    if (
-                        best_match
-                        and not iscrowd(gt_map[best_match])
-                        and gt_iscrowd
-                    ):
-                        break
-
-                    # If you already perfectly matched a GT
-                    # then there is no reason to continue looking
-                    # if you match multiple crowds with iou=1, choose the first
-                    if best_match_iou == 1:
-                        break
-
-                    if iou < best_match_iou:
-                        continue
-
-                    best_match_iou = iou
-                    best_match = gt_id
-
-                if highest_already_matched_iou > best_match_iou:
-                    if best_match is not None and not iscrowd(
-                        gt_map[best_match]
-                    ):
-                        # Note: This differs from COCO in that Open Images
-                        # objects are only matched with the highest IoU GT or a
-                        # crowd. An object will not be matched with a secondary
-                        # highest IoU GT if the highest IoU GT was already
-                        # matched with a different object
-
-                        best_match = None
-
-                if best_match:
-                    gt = gt_map[best_match]
-
-                    # For crowd GTs, record info for first (highest confidence)
-                    # matching prediction on the GT object
-                    if gt[id_key] == _NO_MATCH_ID:
-                        record_match = True
-
-                        gt[eval_key] = "tp" if gt.label == pred.label else "fn"
+        for pidx, (pred, pred_label, gt_ious) in enumerate(
+            zip(preds, pred_labels, ious)
+        ):
+            best_match = None
+            best_match_iou = iou_thresh
+            highest_already_matched_iou = iou_thresh
+            for gidx, iou in enumerate(gt_ious):
+                gt_iscrowd = crowds[gidx]
+
+                # Only iscrowd GTs can have multiple matches
+                if gt_matches[gidx] is not None and not gt_iscrowd:
+                    if iou > highest_already_matched_iou:
+                        highest_already_matched_iou = iou
+                        if iou > best_match_iou:
+                            best_match = None
+                            best_match_iou = iou_thresh
+
+                    continue
+
+                # If matching classwise=False
+                # Only objects with the same class can match a crowd
+                if gt_iscrowd and gt_labels[gidx] != pred_label:
+                    continue
+
+                # Crowds are last in order of GTs
+                # If we already matched a non-crowd and are on a crowd,
+                # then break
+                if (
+                    best_match is not None
+                    and not crowds[best_match]
+                    and gt_iscrowd
+                ):
+                    break
+
+                # If you already perfectly matched a GT
+                # then there is no reason to continue looking
+                # if you match multiple crowds with iou=1, choose the first
+                if best_match_iou == 1:
+                    break
+
+                if iou < best_match_iou:
+                    continue
+
+                best_match_iou = iou
+                best_match = gidx
+
+            if highest_already_matched_iou > best_match_iou:
+                if best_match is not None and not crowds[best_match]:
+                    # Note: This differs from COCO in that Open Images
+                    # objects are only matched with the highest IoU GT or a
+                    # crowd. An object will not be matched with a secondary
+                    # highest IoU GT if the highest IoU GT was already
+                    # matched with a different object
+
+                    best_match = None
+
+            if best_match is not None:
+                gt = gts[best_match]
+                gt_label = gt_labels[best_match]
+
+                # For crowd GTs, record info for first (highest confidence)
+                # matching prediction on the GT object
+                if gt_matches[best_match] is None:
+                    record_match = True
+
+                    gt_matches[best_match] = pidx
+                    if gt_store[best_match]:
+                        gt[eval_key] = "tp" if gt_label == pred_label else "fn"
                         gt[id_key] = pred.id
                         gt[iou_key] = best_match_iou
-                    else:
-                        # In Open Images-style evaluation, only the first match
-                        # for a crowd GT is recorded in `matches`
-                        record_match = False
+                else:
+                    # In Open Images-style evaluation, only the first match
+                    # for a crowd GT is recorded in `matches`
+                    record_match = False
 
-                    pred[eval_key] = "tp" if gt.label == pred.label else "fp"
-                    pred[id_key] = best_match
+                if pred_store[pidx]:
+                    pred[eval_key] = "tp" if gt_label == pred_label else "fp"
+                    pred[id_key] = gt.id
                     pred[iou_key] = best_match_iou
 
-                    if record_match:
-                        matches.append(
-                            (
-                                gt.label,
-                                pred.label,
-                                best_match_iou,
-                                pred.confidence,
-                                gt.id,
-                                pred.id,
-                            )
-                        )
-                else:
-                    pred[eval_key] = "fp"
+                if record_match:
                     matches.append(
                         (
-                            None,
-                            pred.label,
-                            None,
+                            gt_label,
+                            pred_label,
+                            best_match_iou,
                             pred.confidence,
-                            None,
+                            gt.id,
                             pred.id,
                         )
                     )
-            elif pred.label == cat:
-                pred[eval_key] = "fp"
+            else:
+                if pred_store[pidx]:
+                    pred[eval_key] = "fp"
+
                 matches.append(
-                    (None, pred.label, None, pred.confidence, None, pred.id)
+                    (None, pred_label, None, pred.confidence, None, pred.id)
                 )
 
         # Leftover GTs are false negatives
-        for gt in objects["gts"]:
-            if gt[id_key] == _NO_MATCH_ID:
-                gt[eval_key] = "fn"
-                matches.append((gt.label, None, None, None, gt.id, None))
+        for gt, gt_label, store, pidx in zip(
+            gts, gt_labels, gt_store, gt_matches
+        ):
+            if pidx is None:
+                if store:
+                    gt[eval_key] = "fn"
+
+                matches.append((gt_label, None, None, None, gt.id, None))
 
     return matches
 
 
 def _compute_pr_curves(matches, classes=None):
-    if classes is None:
-        _classes = set()
-
-    class_matches = {}
-
-    # For crowds, GTs are only counted once
-    counted_gts = []
-
-    # Sort matches
-    for m in matches:
-        # m = (gt_label, pred_label, iou, confidence, gt.id, pred.id)
-        if classes is None:
-            _classes.add(m[0])
-            _classes.add(m[1])
+    if isinstance(matches, _CompactMatches):
+        gt_ids = matches.ytrue_ids
+    else:
+        # IDs are only needed to identify ground truth objects
+        gt_codes = {}
+        gt_ids = np.array(
+            [gt_codes.setdefault(m[4], len(gt_codes)) for m in matches],
+            dtype=np.int64,
+        )[:, np.newaxis]
+
+        _matches = _CompactMatches()
+        _matches.extend((m[0], m[1], m[2], m[3], None, None) for m in matches)
+        matches = _matches
+
+    ytrue = matches.ytrue
+    ypred = matches.ypred
+    confs = matches.confs
+    labels = matches.labels
 
-        c = m[0] if m[0] is not None else m[1]
+    if classes is None:
+        classes = sorted(labels)
 
-        if c not in class_matches:
-            class_matches[c] = {
-                "tp": [],
-                "fp": [],
-                "num_gt": 0,
-            }
+    # Missing labels have code -1
+    is_label = np.array([bool(l) for l in labels] + [False], dtype=bool)
 
-        if m[0] == m[1]:
-            class_matches[c]["tp"].append(m)
-        elif m[1]:
-            class_matches[c]["fp"].append(m)
+    match_classes = np.where(ytrue >= 0, ytrue, ypred)
+    is_tp = ytrue == ypred
+    is_fp = ~is_tp & is_label[ypred]
 
-        if m[0] and m[4] not in counted_gts:
-            class_matches[c]["num_gt"] += 1
-            counted_gts.append(m[4])
+    # For crowds, GTs are only counted once per class
+    gt_inds = np.flatnonzero(is_label[ytrue])
+    gt_keys = np.column_stack([match_classes[gt_inds], gt_ids[gt_inds]])
+    _, first_inds = np.unique(gt_keys, axis=0, return_index=True)
+    num_gts = np.bincount(
+        match_classes[gt_inds[first_inds]], minlength=len(labels)
+    )
 
-    if classes is None:
-        _classes.discard(None)
-        classes = sorted(_classes)
+    # Group matches by class in order of appearance, preserving their order
+    inds = np.argsort(match_classes, kind="stable")
+    codes, starts = np.unique(match_classes[inds], return_index=True)
+    class_inds = dict(zip(codes, np.split(inds, starts[1:])))
+    codes = codes[np.argsort(inds[starts])]
 
     # Compute precision-recall array
     precision = {}
     recall = {}
     thresholds = {}
-    for c in class_matches.keys():
-        tp = class_matches[c]["tp"]
-        fp = class_matches[c]["fp"]
-        num_gt = class_matches[c]["num_gt"]
-        if num_gt == 0:
+    for code in codes:
+        if code < 0 or num_gts[code] == 0:
             continue
 
-        tp_fp = np.array([1] * len(tp) + [0] * len(fp))
-        confs = np.array([p[3] for p in tp] + [p[3] for p in fp])
+        c = labels[code]
+        num_gt = num_gts[code]
+
+        c_inds = class_inds[code]
+        tp_inds = c_inds[is_tp[c_inds]]
+        fp_inds = c_inds[is_fp[c_inds]]
+
+        tp_fp = np.concatenate([np.ones(tp_inds.size), np.zeros(fp_inds.size)])
+        confs_c = np.concatenate([confs[tp_inds], confs[fp_inds]])
+        if np.isnan(confs_c).any():
+            raise ValueError(
+                "All predicted objects must have their `confidence` "
+                "attribute populated in order to compute precision-recall "
+                "curves"
+            )
 
-        inds = np.argsort(-confs)
+        inds = np.argsort(-confs_c)
         tp_fp = tp_fp[inds]
-        confs = confs[inds]
+        confs_c = confs_c[inds]
 
-        tp_sum = np.cumsum(tp_fp).astype(dtype=float)
-        total = np.arange(1, len(tp_fp) + 1).astype(dtype=float)
+        tp_sum = np.cumsum(tp_fp)
+        total = np.arange(1, len(tp_fp) + 1, dtype=float)
 
         pre = tp_sum / total
         rec = tp_sum / num_gt
 
         pre0 = pre[0] if pre.size > 0 else 1
-        conf0 = max(1, confs[0]) if confs.size > 0 else 1
+        conf0 = max(1, confs_c[0]) if confs_c.size > 0 else 1
 
         pre = np.concatenate([[pre0], pre, [0]])
-        confs = np.concatenate([[conf0], confs, [0]])
+        confs_c = np.concatenate([[conf0], confs_c, [0]])
         rec = np.concatenate([[0], rec, [1]])
 
         # Ensure precision is nondecreasing
-        for i in range(len(pre) - 1, 0, -1):
-            if pre[i] > pre[i - 1]:
-                pre[i - 1] = pre[i]
+        pre = np.maximum.accumulate(pre[::-1])[::-1]
 
         precision[c] = pre
         recall[c] = rec
-        thresholds[c] = confs
+        thresholds[c] = confs_c
 
     return precision, recall, thresholds, classes
 
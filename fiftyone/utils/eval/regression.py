@@ -308,23 +308,15 @@ class SimpleEvaluation(RegressionEvaluation):
         if eval_key is None:
             return results
 
-        def compute_error(yp, yt):
-            if missing is not None:
-                if yp is None:
-                    yp = missing
-
-                if yt is None:
-                    yt = missing
-
-            try:
-                return error_fcn(yp, yt)
-            except:
-                return None
+        vectorize = not callable(metric)
+        errors = _compute_errors(
+            _ypred, _ytrue, error_fcn, missing=missing, vectorize=vectorize
+        )
 
         if is_frame_field:
+            _errors = iter(errors)
             frame_errors = [
-                list(map(compute_error, yp, yt))
-                for yp, yt in zip(ypred, ytrue)
+                list(itertools.islice(_errors, len(yt))) for yt in ytrue
             ]
             sample_errors = [_safe_mean(e) for e in frame_errors]
 
@@ -336,8 +328,6 @@ class SimpleEvaluation(RegressionEvaluation):
             # Per-frame errors
             samples.set_values(eval_frame, frame_errors)
         else:
-            errors = list(map(compute_error, ypred, ytrue))
-
             # Per-sample errors
             samples.set_values(eval_key, errors)
 
@@ -564,6 +554,40 @@ def _parse_config(pred_field, gt_field, method, **kwargs):
     return config_cls(pred_field, gt_field, **params)
 
 
+def _compute_errors(ypred, ytrue, error_fcn, missing=None, vectorize=False):
+    if missing is not None:
+        ypred = [missing if yp is None else yp for yp in ypred]
+        ytrue = [missing if yt is None else yt for yt in ytrue]
+
+    if vectorize:
+        inds = [
+            i
+            for i, (yp, yt) in enumerate(zip(ypred, ytrue))
+            if yp is not None and yt is not None
+        ]
+
+        try:
+            yp = np.array([ypred[i] for i in inds], dtype=float)
+            yt = np.array([ytrue[i] for i in inds], dtype=float)
+        except (TypeError, ValueError):
+            yp = None
+
+        if yp is not None:
+            errors = [None] * len(ypred)
+            for i, e in zip(inds, error_fcn(yp, yt).tolist()):
+                errors[i] = e
+
+            return errors
+
+    def compute_error(yp, yt):
+        try:
+            return error_fcn(yp, yt)
+        except:
+            return None
+
+    return list(map(compute_error, ypred, ytrue))
+
+
 def _safe_mean(values):
     values = [v for v in values if v is not None]
     return np.mean(values) if values else None
@@ -5,13 +5,13 @@ Segmentation evaluation.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+from collections import defaultdict
 from copy import deepcopy
 import logging
 import inspect
 import warnings
 
 import numpy as np
-import sklearn.metrics as skm
 
 import eta.core.image as etai
 import eta.core.utils as etau
@@ -292,6 +292,9 @@ class SimpleEvaluationConfig(SegmentationEvaluationConfig):
             default, the entire masks are evaluated
         average ("micro"): the averaging strategy to use when populating
             precision and recall numbers on each sample
+        num_workers (None): the number of processes to use to load and
+            compare masks. By default,
+            :meth:`fiftyone.core.utils.recommend_process_pool_workers` is used
     """
 
     def __init__(
@@ -301,6 +304,7 @@ class SimpleEvaluationConfig(SegmentationEvaluationConfig):
         compute_dice=False,
         bandwidth=None,
         average="micro",
+        num_workers=None,
         **kwargs,
     ):
         super().__init__(
@@ -308,6 +312,7 @@ class SimpleEvaluationConfig(SegmentationEvaluationConfig):
         )
         self.bandwidth = bandwidth
         self.average = average
+        self.num_workers = num_workers
 
     @property
     def method(self):
@@ -338,56 +343,72 @@ class SimpleEvaluation(SegmentationEvaluation):
 
             values, classes = zip(*sorted(mask_targets.items()))
         else:
-            logger.info("Computing possible mask values...")
-            values, classes = _get_mask_values(
-                samples, pred_field, gt_field, progress=progress
-            )
+            # The observed mask values are gathered while evaluating
+            values, classes = None, None
 
         _samples = samples.select_fields([gt_field, pred_field])
         pred_field, processing_frames = samples._handle_frame_field(pred_field)
         gt_field, _ = samples._handle_frame_field(gt_field)
 
-        nc = len(values)
-        confusion_matrix = np.zeros((nc, nc), dtype=int)
-
         bandwidth = self.config.bandwidth
         average = self.config.average
         compute_dice = self.config.compute_dice
+        num_workers = fou.recommend_process_pool_workers(
+            self.config.num_workers
+        )
         save = eval_key is not None
 
+        # Per-image confusion matrices are computed in a single pass over the
+        # masks, and are merged once the full set of mask values is known
+        sample_ids = []
+        image_results = []
+        is_rgb = False
+
+        logger.info("Evaluating segmentations...")
+        inputs = _iter_mask_pairs(
+            _samples,
+            gt_field,
+            pred_field,
+            processing_frames,
+            sample_ids,
+            values,
+            bandwidth,
+            progress,
+        )
+        for image_result in _compute_confusion_matrices(inputs, num_workers):
+            image_results.append(image_result)
+            is_rgb |= image_result[-1]
+
+        if values is None:
+            values = _get_mask_values(image_results)
+            if is_rgb:
+                classes = [_int_to_hex(v) for v in values]
+            else:
+                classes = [str(v) for v in values]
+
+        nc = len(values)
+        confusion_matrix = np.zeros((nc, nc), dtype=int)
+
         if save:
             acc_field = "%s_accuracy" % eval_key
             pre_field = "%s_precision" % eval_key
             rec_field = "%s_recall" % eval_key
-            if compute_dice:
-                dice_field = "%s_dice" % eval_key
+            dice_field = "%s_dice" % eval_key
 
-        logger.info("Evaluating segmentations...")
-        for sample in _samples.iter_samples(progress=progress, autosave=save):
-            if processing_frames:
-                images = sample.frames.values()
-            else:
-                images = [sample]
+            sample_metrics = defaultdict(dict)
+            frame_metrics = defaultdict(lambda: defaultdict(dict))
+
+        image_results = iter(image_results)
+        image_result = next(image_results, None)
 
+        for sample_id in sample_ids:
             sample_conf_mat = np.zeros((nc, nc), dtype=int)
-            for image in images:
-                gt_seg = image[gt_field]
-                if gt_seg is None or not gt_seg.has_mask:
-                    msg = "Skipping sample with missing ground truth mask"
-                    warnings.warn(msg)
-                    continue
-
-                pred_seg = image[pred_field]
-                if pred_seg is None or not pred_seg.has_mask:
-                    msg = "Skipping sample with missing prediction mask"
-                    warnings.warn(msg)
-                    continue
-
-                image_conf_mat = _compute_pixel_confusion_matrix(
-                    pred_seg.get_mask(),
-                    gt_seg.get_mask(),
-                    values,
-                    bandwidth=bandwidth,
+            while image_result is not None and image_result[0] == sample_id:
+                _, frame_number, image_values, conf_mat, _ = image_result
+                image_result = next(image_results, None)
+
+                image_conf_mat = _expand_confusion_matrix(
+                    conf_mat, image_values, values
                 )
                 sample_conf_mat += image_conf_mat
 
@@ -395,11 +416,14 @@ class SimpleEvaluation(SegmentationEvaluation):
                     facc, fpre, frec = _compute_accuracy_precision_recall(
                         image_conf_mat, values, average
                     )
-                    image[acc_field] = facc
-                    image[pre_field] = fpre
-                    image[rec_field] = frec
+                    metrics = frame_metrics
+                    metrics[acc_field][sample_id][frame_number] = facc
+                    metrics[pre_field][sample_id][frame_number] = fpre
+                    metrics[rec_field][sample_id][frame_number] = frec
                     if compute_dice:
-                        image[dice_field] = _compute_dice_score(image_conf_mat)
+                        metrics[dice_field][sample_id][
+                            frame_number
+                        ] = _compute_dice_score(image_conf_mat)
 
             confusion_matrix += sample_conf_mat
 
@@ -407,11 +431,24 @@ class SimpleEvaluation(SegmentationEvaluation):
                 sacc, spre, srec = _compute_accuracy_precision_recall(
                     sample_conf_mat, values, average
                 )
-                sample[acc_field] = sacc
-                sample[pre_field] = spre
-                sample[rec_field] = srec
+                sample_metrics[acc_field][sample_id] = sacc
+                sample_metrics[pre_field][sample_id] = spre
+                sample_metrics[rec_field][sample_id] = srec
                 if compute_dice:
-                    sample[dice_field] = _compute_dice_score(confusion_matrix)
+                    sample_metrics[dice_field][
+                        sample_id
+                    ] = _compute_dice_score(sample_conf_mat)
+
+        if save:
+            for field, field_values in sample_metrics.items():
+                samples.set_values(field, field_values, key_field="id")
+
+            for field, field_values in frame_metrics.items():
+                samples.set_values(
+                    samples._FRAMES_PREFIX + field,
+                    field_values,
+                    key_field="id",
+                )
 
         if nc > 0:
             missing = classes[0] if values[0] in (0, "#000000") else None
@@ -545,9 +582,83 @@ def _parse_config(pred_field, gt_field, method, **kwargs):
     return config_cls(pred_field, gt_field, **params)
 
 
+def _iter_mask_pairs(
+    samples,
+    gt_field,
+    pred_field,
+    processing_frames,
+    sample_ids,
+    values,
+    bandwidth,
+    progress,
+):
+    for sample in samples.iter_samples(progress=progress):
+        sample_ids.append(sample.id)
+
+        if processing_frames:
+            images = sample.frames.items()
+        else:
+            images = [(None, sample)]
+
+        for frame_number, image in images:
+            gt_seg = image[gt_field]
+            if gt_seg is None or not gt_seg.has_mask:
+                msg = "Skipping sample with missing ground truth mask"
+                warnings.warn(msg)
+                continue
+
+            pred_seg = image[pred_field]
+            if pred_seg is None or not pred_seg.has_mask:
+                msg = "Skipping sample with missing prediction mask"
+                warnings.warn(msg)
+                continue
+
+            yield (
+                sample.id,
+                frame_number,
+                gt_seg,
+                pred_seg,
+                values,
+                bandwidth,
+            )
+
+
+def _compute_confusion_matrices(inputs, num_workers):
+    if num_workers <= 1:
+        for args in inputs:
+            yield _compute_image_confusion_matrix(args)
+
+        return
+
+    # Inputs are submitted in batches so that only a bounded number of masks
+    # are in memory at once
+    batch_size = 4 * num_workers
+    with fou.get_multiprocessing_context().Pool(processes=num_workers) as pool:
+        for batch in fou.iter_batches(inputs, batch_size):
+            for result in pool.imap(_compute_image_confusion_matrix, batch):
+                yield result
+
+
+def _compute_image_confusion_matrix(args):
+    sample_id, frame_number, gt_seg, pred_seg, values, bandwidth = args
+
+    pred_mask = pred_seg.get_mask()
+    gt_mask = gt_seg.get_mask()
+    is_rgb = pred_mask.ndim == 3 or gt_mask.ndim == 3
+
+    image_values, conf_mat = _compute_pixel_confusion_matrix(
+        pred_mask, gt_mask, values=values, bandwidth=bandwidth
+    )
+
+    return sample_id, frame_number, image_values, conf_mat, is_rgb
+
+
 def _compute_pixel_confusion_matrix(
-    pred_mask, gt_mask, values, bandwidth=None
+    pred_mask, gt_mask, values=None, bandwidth=None
 ):
+    # Returns the confusion matrix of the mask values that appear in either
+    # mask, along with those values. If `values` are provided, only pixels
+    # whose ground truth and predicted values are both in `values` are counted
     if pred_mask.ndim == 3:
         pred_mask = _rgb_array_to_int(pred_mask)
 
@@ -568,15 +679,89 @@ def _compute_pixel_confusion_matrix(
             pred_mask, gt_mask, bandwidth
         )
 
-    try:
-        return skm.confusion_matrix(
-            gt_mask.ravel(), pred_mask.ravel(), labels=values
+    gt = gt_mask.ravel()
+    pred = pred_mask.ravel()
+
+    lut_size = _get_lut_size(gt, pred)
+
+    if lut_size is not None:
+        # Map values to indices via a lookup table rather than sorting
+        if values is None:
+            counts = np.bincount(gt, minlength=lut_size)
+            counts += np.bincount(pred, minlength=lut_size)
+            values = np.flatnonzero(counts)
+        else:
+            values = np.asarray(values)
+
+        in_range = (values >= 0) & (values < lut_size)
+        lut = np.full(lut_size, -1, dtype=int)
+        lut[values[in_range]] = np.flatnonzero(in_range)
+
+        gt_inds = lut[gt]
+        pred_inds = lut[pred]
+    elif values is not None:
+        values = np.asarray(values)
+        gt_inds = _get_value_indices(gt, values)
+        pred_inds = _get_value_indices(pred, values)
+    else:
+        values, inds = np.unique(
+            np.concatenate([gt, pred]), return_inverse=True
         )
-    except ValueError:
-        # Assume that no `values` appear in `gt_mask`, which causes
-        # `skm.confusion_matrix` to raise an error
-        num_classes = len(values)
-        return np.zeros((num_classes, num_classes), dtype=int)
+        gt_inds = inds[: gt.size]
+        pred_inds = inds[gt.size :]
+
+    # Ignore pixels whose values are not in `values`
+    found = (gt_inds >= 0) & (pred_inds >= 0)
+    if not found.all():
+        gt_inds = gt_inds[found]
+        pred_inds = pred_inds[found]
+
+    # Count each (gt, pred) pair via its index in a flattened matrix
+    nc = len(values)
+    conf_mat = np.bincount(
+        gt_inds * nc + pred_inds, minlength=nc * nc
+    ).reshape(nc, nc)
+
+    # Only retain the values that appear
+    inds = np.flatnonzero(conf_mat.any(axis=0) | conf_mat.any(axis=1))
+
+    return values[inds], conf_mat[np.ix_(inds, inds)]
+
+
+def _get_lut_size(gt, pred):
+    # Returns the size of a lookup table covering the values of the masks, or
+    # None if the masks are not integral or the table would be too large
+    if (
+        gt.size == 0
+        or gt.dtype.kind not in "ui"
+        or pred.dtype.kind not in "ui"
+    ):
+        return None
+
+    if min(gt.min(), pred.min()) < 0:
+        return None
+
+    lut_size = int(max(gt.max(), pred.max())) + 1
+    if lut_size > max(1024, 4 * gt.size):
+        return None
+
+    return lut_size
+
+
+def _get_value_indices(mask, values):
+    # Returns the index of each mask value in the sorted `values`, or -1
+    inds = np.searchsorted(values, mask)
+    inds[inds == len(values)] = 0
+    inds[values[inds] != mask] = -1
+    return inds
+
+
+def _expand_confusion_matrix(conf_mat, image_values, values):
+    nc = len(values)
+    inds = np.searchsorted(values, image_values)
+    confusion_matrix = np.zeros((nc, nc), dtype=int)
+    confusion_matrix[np.ix_(inds, inds)] = conf_mat
+    return confusion_matrix
 
 
 def _compute_dice_score(confusion_matrix):
@@ -593,7 +778,7 @@ def _extract_contour_band_values(pred_mask, gt_mask, bandwidth):
 
 
 def _compute_accuracy_precision_recall(confusion_matrix, values, average):
-    missing = 0 if values[0] == 0 else None
+    missing = 0 if len(values) > 0 and values[0] == 0 else None
     results = SegmentationResults(
         None, None, None, confusion_matrix, values, missing=missing
     )
@@ -604,39 +789,12 @@ def _compute_accuracy_precision_recall(confusion_matrix, values, average):
     return metrics["accuracy"], metrics["precision"], metrics["recall"]
 
 
-def _get_mask_values(samples, pred_field, gt_field, progress=None):
-    _samples = samples.select_fields([gt_field, pred_field])
-    pred_field, processing_frames = samples._handle_frame_field(pred_field)
-    gt_field, _ = samples._handle_frame_field(gt_field)
-
-    values = set()
-    is_rgb = False
-
-    for sample in _samples.iter_samples(progress=progress):
-        if processing_frames:
-            images = sample.frames.values()
-        else:
-            images = [sample]
-
-        for image in images:
-            for field in (pred_field, gt_field):
-                seg = image[field]
-                if seg is not None and seg.has_mask:
-                    mask = seg.get_mask()
-                    if mask.ndim == 3:
-                        is_rgb = True
-                        mask = _rgb_array_to_int(mask)
-
-                    values.update(mask.ravel())
-
-    values = sorted(values)
-
-    if is_rgb:
-        classes = [_int_to_hex(v) for v in values]
-    else:
-        classes = [str(v) for v in values]
+def _get_mask_values(image_results):
+    image_values = [r[2] for r in image_results]
+    if not image_values:
+        return []
 
-    return values, classes
+    return np.unique(np.concatenate(image_values)).tolist()
 
 
 def _rgb_array_to_int(mask):
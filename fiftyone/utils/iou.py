@@ -8,9 +8,9 @@ Intersection over union (IoU) utilities.
 import contextlib
 import itertools
 import logging
+import warnings
 
 import numpy as np
-import scipy.spatial as sp
 
 import eta.core.numutils as etan
 import eta.core.utils as etau
@@ -19,8 +19,9 @@ import fiftyone.core.labels as fol
 import fiftyone.core.utils as fou
 import fiftyone.core.validation as fov
 
-from .utils3d import compute_cuboid_iou
+from .utils3d import compute_cuboid_iou, compute_cuboid_ious
 
+sh = fou.lazy_import("shapely")
 sg = fou.lazy_import("shapely.geometry")
 so = fou.lazy_import("shapely.ops")
 
@@ -34,6 +35,7 @@ def compute_ious(
     use_boxes=False,
     tolerance=None,
     error_level=1,
+    sigmas=None,
 ):
     """Computes the pairwise IoUs between the predicted and ground truth
     objects.
@@ -70,7 +72,8 @@ def compute_ious(
             of the provided :class:`fiftyone.core.labels.Polyline` instances
             rather than using their actual geometries
         tolerance (None): a tolerance, in pixels, when generating approximate
-            polylines for instance masks. Typical values are 1-3 pixels
+            polylines for instance masks. Typical values are 1-3 pixels. A
+            tolerance of 0 computes exact IoUs directly from the masks
         error_level (1): the error level to use when manipulating instance
             masks or polylines. Valid values are:
 
@@ -80,6 +83,10 @@ def compute_ious(
 
             If ``error_level > 0``, any calculation that raises a geometric
             error will default to an IoU of 0
+        sigmas (None): an optional list of per-keypoint standard deviations
+            to use when computing object keypoint similarities, as in
+            `COCO <https://cocodataset.org/#keypoints-eval>`_. By default, all
+            keypoints are weighted equally
 
     Returns:
         a ``num_preds x num_gts`` array of IoUs
@@ -101,10 +108,14 @@ def compute_ious(
                 preds, gts, error_level, iscrowd=iscrowd, classwise=classwise
             )
 
-        return _compute_polyline_similarities(preds, gts, classwise=classwise)
+        return _compute_polyline_similarities(
+            preds, gts, classwise=classwise, sigmas=sigmas
+        )
 
     if isinstance(gts[0], fol.Keypoint):
-        return _compute_keypoint_similarities(preds, gts, classwise=classwise)
+        return _compute_keypoint_similarities(
+            preds, gts, classwise=classwise, sigmas=sigmas
+        )
 
     if use_masks:
         # @todo when tolerance is None, consider using dense masks rather than
@@ -112,6 +123,11 @@ def compute_ious(
         if tolerance is None:
             tolerance = 2
 
+        if tolerance == 0:
+            return _compute_dense_mask_ious(
+                preds, gts, iscrowd=iscrowd, classwise=classwise
+            )
+
         return _compute_mask_ious(
             preds,
             gts,
@@ -124,7 +140,7 @@ def compute_ious(
     return _compute_bbox_ious(preds, gts, iscrowd=iscrowd, classwise=classwise)
 
 
-def compute_segment_ious(preds, gts):
+def compute_segment_ious(preds, gts, classwise=False):
     """Computes the pairwise IoUs between the predicted and ground truth
     temporal detections.
 
@@ -133,6 +149,9 @@ def compute_segment_ious(preds, gts):
             :class:`fiftyone.core.labels.TemporalDetection` instances
         gts: a list of ground truth
             :class:`fiftyone.core.labels.TemporalDetection` instances
+        classwise (False): whether to consider segments with different
+            ``label`` values as always non-overlapping (True) or to compute
+            IoUs for all segments regardless of label (False)
 
     Returns:
         a ``num_preds x num_gts`` array of segment IoUs
@@ -140,7 +159,7 @@ def compute_segment_ious(preds, gts):
     if not preds or not gts:
         return np.zeros((len(preds), len(gts)))
 
-    return _compute_segment_ious(preds, gts)
+    return _compute_segment_ious(preds, gts, classwise=classwise)
 
 
 def compute_max_ious(
@@ -316,20 +335,24 @@ def find_duplicates(
 
     view = sample_collection.select_fields(label_field)
 
+    label_type = view._get_label_field_type(label_field)
+    list_path = label_field + "." + label_type._LABEL_LIST_FIELD
+
+    # Labels are loaded in a single pass rather than via sample iteration
+    all_labels = view.values(list_path)
+    if is_frame_field:
+        all_labels = list(itertools.chain.from_iterable(all_labels))
+
     dup_ids = []
 
-    for sample in view.iter_samples(progress=progress):
-        if is_frame_field:
-            for frame in sample.frames.values():
-                _dup_ids = _find_duplicates(
-                    frame, _label_field, iou_thresh, method, **kwargs
-                )
-                dup_ids.extend(_dup_ids)
-        else:
-            _dup_ids = _find_duplicates(
-                sample, _label_field, iou_thresh, method, **kwargs
+    with fou.ProgressBar(total=len(all_labels), progress=progress) as pb:
+        for labels in pb(all_labels):
+            if not labels:
+                continue
+
+            dup_ids.extend(
+                _find_duplicate_labels(labels, iou_thresh, method, **kwargs)
             )
-            dup_ids.extend(_dup_ids)
 
     return dup_ids
 
@@ -393,12 +416,7 @@ def _extract_max_ious(ious, labels1, labels2):
     return max1, max2, ids1, ids2
 
 
-def _find_duplicates(doc, field, iou_thresh, method, **kwargs):
-    labels = _get_labels(doc, field)
-
-    if labels is None:
-        return []
-
+def _find_duplicate_labels(labels, iou_thresh, method, **kwargs):
     ious = compute_ious(labels, labels, **kwargs)
 
     if method == "simple":
@@ -421,16 +439,18 @@ def _find_duplicates_simple(ious, iou_thresh):
 def _find_duplicates_greedy(ious, iou_thresh):
     # Choose the largest subset of indices s.t. no two are within `iou_thresh`
     A = np.triu(ious, k=1) > iou_thresh
+    A |= A.T
 
-    dup_inds = []
-    while True:
-        i, j = np.nonzero(A)
-        if j.size == 0:
-            break
+    # Number of duplicate pairs in which each index participates
+    degrees = A.sum(axis=1)
 
+    dup_inds = []
+    while degrees.size > 0 and degrees.max() > 0:
         # Remove most common value
-        k = np.argmax(np.bincount(np.concatenate((i, j))))
+        k = np.argmax(degrees)
         dup_inds.append(k)
+        degrees -= A[k]
+        degrees[k] = 0
         A[k, :] = False
         A[:, k] = False
 
@@ -502,25 +522,70 @@ def _compute_bbox_ious(preds, gts, iscrowd=None, classwise=False):
             gts = _polylines_to_detections(gts)
 
     if _get_bbox_dim(gts[0]) == 3:
-        bbox_iou_fcn = compute_cuboid_iou
+        return _compute_cuboid_ious(
+            preds, gts, gt_crowds, is_symmetric, classwise
+        )
+
+    pred_boxes = _get_bounding_boxes(preds)
+    if is_symmetric:
+        gt_boxes = pred_boxes
     else:
-        bbox_iou_fcn = compute_bbox_iou
+        gt_boxes = _get_bounding_boxes(gts)
 
-    ious = np.zeros((len(preds), len(gts)))
+    ious = _compute_box_ious(pred_boxes, gt_boxes, gt_crowds=gt_crowds)
 
-    for j, (gt, gt_crowd) in enumerate(zip(gts, gt_crowds)):
+    if classwise:
+        pred_labels = [pred.label for pred in preds]
+        gt_labels = [gt.label for gt in gts]
+        ious[~_get_matching_labels(pred_labels, gt_labels)] = 0
 
-        for i, pred in enumerate(preds):
-            if is_symmetric and i < j:
-                iou = ious[j, i]
-            elif is_symmetric and i == j:
-                iou = 1
-            elif classwise and pred.label != gt.label:
-                continue
-            else:
-                iou = bbox_iou_fcn(gt, pred, gt_crowd=gt_crowd)
+    if is_symmetric:
+        ious = np.tril(ious, k=-1)
+        ious += ious.T
+        np.fill_diagonal(ious, 1)
+
+    return ious
+
+
+def _get_bounding_boxes(detections):
+    boxes = [d.bounding_box for d in detections]
+    return np.array(boxes, dtype=float).reshape(-1, 4)
+
+
+def _compute_box_ious(boxes1, boxes2, gt_crowds=None):
+    # Boxes are [top-left-x, top-left-y, width, height]
+    x1, y1, w1, h1 = [a[:, np.newaxis] for a in boxes1.T]
+    x2, y2, w2, h2 = [a[np.newaxis, :] for a in boxes2.T]
+    area1 = h1 * w1
+    area2 = h2 * w2
 
-            ious[i, j] = iou
+    w = np.minimum(x1 + w1, x2 + w2) - np.maximum(x1, x2)
+    h = np.minimum(y1 + h1, y2 + h2) - np.maximum(y1, y2)
+    inter = np.where((w > 0) & (h > 0), h * w, 0.0)
+
+    if gt_crowds is not None and np.any(gt_crowds):
+        crowds = np.asarray(gt_crowds, dtype=bool)[np.newaxis, :]
+        union = np.where(crowds, area1, area1 + area2 - inter)
+    else:
+        union = area1 + area2 - inter
+
+    ious = np.zeros(inter.shape)
+    np.divide(inter, union, out=ious, where=union != 0)
+    return np.minimum(ious, 1, out=ious)
+
+
+def _compute_cuboid_ious(preds, gts, gt_crowds, is_symmetric, classwise):
+    ious = compute_cuboid_ious(preds, gts, gt_crowds=gt_crowds)
+
+    if classwise:
+        pred_labels = [pred.label for pred in preds]
+        gt_labels = [gt.label for gt in gts]
+        ious[~_get_matching_labels(pred_labels, gt_labels)] = 0
+
+    if is_symmetric:
+        ious = np.tril(ious, k=-1)
+        ious += ious.T
+        np.fill_diagonal(ious, 1)
 
     return ious
 
@@ -546,7 +611,7 @@ def _compute_polygon_ious(
         num_pred = len(preds)
         pred_polys = _polylines_to_shapely(preds, error_level)
         pred_labels = [pred.label for pred in preds]
-        pred_areas = [pred_poly.area for pred_poly in pred_polys]
+        pred_areas = np.array([pred_poly.area for pred_poly in pred_polys])
 
         if is_symmetric:
             num_gt = num_pred
@@ -557,64 +622,139 @@ def _compute_polygon_ious(
             num_gt = len(gts)
             gt_polys = _polylines_to_shapely(gts, error_level)
             gt_labels = [gt.label for gt in gts]
-            gt_areas = [gt_poly.area for gt_poly in gt_polys]
+            gt_areas = np.array([gt_poly.area for gt_poly in gt_polys])
 
         if iscrowd is not None:
             gt_crowds = [iscrowd(gt) for gt in gts]
         elif gt_crowds is None:
             gt_crowds = [False] * num_gt
 
+        # Only pairs whose bounds overlap can have nonzero intersection
+        pred_bounds = _get_shapely_bounds(pred_polys)
+        if is_symmetric:
+            gt_bounds = pred_bounds
+        else:
+            gt_bounds = _get_shapely_bounds(gt_polys)
+
+        candidates = _get_overlapping_bounds(pred_bounds, gt_bounds)
+
+        if classwise:
+            candidates &= _get_matching_labels(pred_labels, gt_labels)
+
+        if is_symmetric:
+            candidates = np.tril(candidates, k=-1)
+
+        inds_pred, inds_gt = np.nonzero(candidates)
+
+        inters = _compute_intersection_areas(
+            pred_polys, gt_polys, inds_pred, inds_gt, preds, gts, error_level
+        )
+
+        pred_area = pred_areas[inds_pred]
+        union = np.where(
+            np.asarray(gt_crowds, dtype=bool)[inds_gt],
+            pred_area,
+            pred_area + gt_areas[inds_gt] - inters,
+        )
+
         ious = np.zeros((num_pred, num_gt))
+        ious[inds_pred, inds_gt] = _safe_ious(inters, union)
 
-        for j, (gt_poly, gt_label, gt_area, gt_crowd) in enumerate(
-            zip(gt_polys, gt_labels, gt_areas, gt_crowds)
-        ):
-            for i, (pred_poly, pred_label, pred_area) in enumerate(
-                zip(pred_polys, pred_labels, pred_areas)
-            ):
-                if is_symmetric and i < j:
-                    iou = ious[j, i]
-                elif is_symmetric and i == j:
-                    iou = 1
-                elif classwise and pred_label != gt_label:
-                    continue
-                else:
-                    try:
-                        inter = gt_poly.intersection(pred_poly).area
-                    except Exception as e:
-                        inter = 0.0
-                        fou.handle_error(
-                            ValueError(
-                                "Failed to compute intersection of predicted "
-                                "object '%s' and ground truth object '%s'"
-                                % (preds[i].id, gts[j].id)
-                            ),
-                            error_level,
-                            base_error=e,
-                        )
-
-                    if gt_crowd:
-                        union = pred_area
-                    else:
-                        union = pred_area + gt_area - inter
-
-                    iou = min(etan.safe_divide(inter, union), 1)
-
-                ious[i, j] = iou
+        if is_symmetric:
+            ious += ious.T
+            np.fill_diagonal(ious, 1)
 
     return ious
 
 
-def _compute_polyline_similarities(preds, gts, classwise=False):
-    sims = np.zeros((len(preds), len(gts)))
-    for j, gt in enumerate(gts):
-        for i, pred in enumerate(preds):
-            if classwise and pred.label != gt.label:
-                continue
+def _get_shapely_bounds(polys):
+    if not polys:
+        return np.zeros((0, 4))
+
+    bounds = np.full((len(polys), 4), np.nan)
+    for idx, poly in enumerate(polys):
+        if not poly.is_empty:
+            bounds[idx] = poly.bounds
+
+    return bounds
+
+
+def _get_overlapping_bounds(bounds1, bounds2):
+    # Bounds are [xmin, ymin, xmax, ymax]; NaN bounds never overlap
+    return (
+        (bounds1[:, np.newaxis, 0] <= bounds2[np.newaxis, :, 2])
+        & (bounds2[np.newaxis, :, 0] <= bounds1[:, np.newaxis, 2])
+        & (bounds1[:, np.newaxis, 1] <= bounds2[np.newaxis, :, 3])
+        & (bounds2[np.newaxis, :, 1] <= bounds1[:, np.newaxis, 3])
+    )
+
+
+def _get_matching_labels(labels1, labels2):
+    label_map = {}
+    inds1 = np.array(
+        [label_map.setdefault(l, len(label_map)) for l in labels1]
+    )
+    inds2 = np.array(
+        [label_map.setdefault(l, len(label_map)) for l in labels2]
+    )
+    return inds1[:, np.newaxis] == inds2[np.newaxis, :]
+
+
+def _safe_ious(inters, unions):
+    ious = np.zeros(len(inters))
+    np.divide(inters, unions, out=ious, where=unions != 0)
+    return np.minimum(ious, 1)
+
+
+def _compute_intersection_areas(
+    pred_polys, gt_polys, inds_pred, inds_gt, preds, gts, error_level
+):
+    if len(inds_pred) == 0:
+        return np.zeros(0)
+
+    # Shapely 2 provides vectorized operations over arrays of geometries
+    if hasattr(sh, "intersection") and hasattr(sh, "area"):
+        _pred_polys = np.empty(len(pred_polys), dtype=object)
+        _pred_polys[:] = pred_polys
+        _gt_polys = np.empty(len(gt_polys), dtype=object)
+        _gt_polys[:] = gt_polys
+
+        try:
+            return sh.area(
+                sh.intersection(_gt_polys[inds_gt], _pred_polys[inds_pred])
+            )
+        except Exception:
+            # Fallback to pairwise computations so that the offending pair(s)
+            # can be reported
+            pass
+
+    inters = np.zeros(len(inds_pred))
+    for idx, (i, j) in enumerate(zip(inds_pred, inds_gt)):
+        try:
+            inters[idx] = gt_polys[j].intersection(pred_polys[i]).area
+        except Exception as e:
+            fou.handle_error(
+                ValueError(
+                    "Failed to compute intersection of predicted "
+                    "object '%s' and ground truth object '%s'"
+                    % (preds[i].id, gts[j].id)
+                ),
+                error_level,
+                base_error=e,
+            )
+
+    return inters
 
-            gtp = list(itertools.chain.from_iterable(gt.points))
-            predp = list(itertools.chain.from_iterable(pred.points))
-            sims[i, j] = _compute_object_keypoint_similarity(gtp, predp)
+
+def _compute_polyline_similarities(preds, gts, classwise=False, sigmas=None):
+    predps = [list(itertools.chain.from_iterable(p.points)) for p in preds]
+    gtps = [list(itertools.chain.from_iterable(g.points)) for g in gts]
+    sims = _compute_object_keypoint_similarities(predps, gtps, sigmas=sigmas)
+
+    if classwise:
+        pred_labels = [pred.label for pred in preds]
+        gt_labels = [gt.label for gt in gts]
+        sims[~_get_matching_labels(pred_labels, gt_labels)] = 0
 
     return sims
 
@@ -653,85 +793,286 @@ def _compute_mask_ious(
     )
 
 
-def _compute_segment_ious(preds, gts):
+def _compute_dense_mask_ious(preds, gts, iscrowd=None, classwise=False):
     is_symmetric = preds is gts
 
+    pred_masks = [_get_mask_grid(pred) for pred in preds]
+    pred_areas = np.array([_get_mask_area(m) for m in pred_masks])
+    pred_labels = [pred.label for pred in preds]
+
+    if is_symmetric:
+        gt_masks = pred_masks
+        gt_areas = pred_areas
+        gt_labels = pred_labels
+    else:
+        gt_masks = [_get_mask_grid(gt) for gt in gts]
+        gt_areas = np.array([_get_mask_area(m) for m in gt_masks])
+        gt_labels = [gt.label for gt in gts]
+
+    if iscrowd is not None:
+        gt_crowds = np.array([iscrowd(gt) for gt in gts], dtype=bool)
+    else:
+        gt_crowds = np.zeros(len(gts), dtype=bool)
+
+    # Only pairs whose boxes overlap can have nonzero intersection
+    pred_bounds = _get_mask_bounds(pred_masks)
+    if is_symmetric:
+        gt_bounds = pred_bounds
+    else:
+        gt_bounds = _get_mask_bounds(gt_masks)
+
+    candidates = _get_overlapping_bounds(pred_bounds, gt_bounds)
+
+    if classwise:
+        candidates &= _get_matching_labels(pred_labels, gt_labels)
+
+    if is_symmetric:
+        candidates = np.tril(candidates, k=-1)
+
+    inds_pred, inds_gt = np.nonzero(candidates)
+
+    inters = np.array(
+        [
+            _compute_mask_intersection(gt_masks[j], pred_masks[i])
+            for i, j in zip(inds_pred, inds_gt)
+        ],
+        dtype=float,
+    )
+
+    pred_area = pred_areas[inds_pred]
+    union = np.where(
+        gt_crowds[inds_gt],
+        pred_area,
+        pred_area + gt_areas[inds_gt] - inters,
+    )
+
     ious = np.zeros((len(preds), len(gts)))
-    for j, gt in enumerate(gts):
-        gst, get = gt.support
-        gt_len = get - gst
-
-        for i, pred in enumerate(preds):
-            if is_symmetric and i < j:
-                iou = ious[j, i]
-            elif is_symmetric and i == j:
-                iou = 1
-            else:
-                pst, pet = pred.support
-                pred_len = pet - pst
-
-                if pred_len == 0 and gt_len == 0:
-                    iou = float(pet == get)
-                else:
-                    # Length of temporal intersection
-                    inter = min(get, pet) - max(gst, pst)
-                    if inter <= 0:
-                        continue
-
-                    union = pred_len + gt_len - inter
-                    iou = min(etan.safe_divide(inter, union), 1)
-
-            ious[i, j] = iou
+    ious[inds_pred, inds_gt] = _safe_ious(inters, union)
+
+    if is_symmetric:
+        ious += ious.T
+        np.fill_diagonal(ious, 1)
 
     return ious
 
 
-def _compute_keypoint_similarities(preds, gts, classwise=False):
-    sims = np.zeros((len(preds), len(gts)))
-    for j, gt in enumerate(gts):
-        for i, pred in enumerate(preds):
-            if classwise and pred.label != gt.label:
-                continue
+def _get_mask_grid(detection):
+    # Returns the edges of the mask's pixels in relative coordinates, so that
+    # masks with different resolutions can be compared exactly
+    x, y, w, h = detection.bounding_box
 
-            gtp = gt.points
-            predp = pred.points
-            sims[i, j] = _compute_object_keypoint_similarity(gtp, predp)
+    mask = detection.mask
+    if mask is None:
+        mask = np.ones((1, 1), dtype=bool)
+    else:
+        mask = np.asarray(mask)
+        if mask.ndim > 2:
+            mask = mask[:, :, 0]
 
-    return sims
+        mask = mask.astype(bool)
 
+    mh, mw = mask.shape
+    xedges = x + w * np.arange(mw + 1) / mw
+    yedges = y + h * np.arange(mh + 1) / mh
 
-def _compute_object_keypoint_similarity(gtp, predp):
-    gtp = np.asarray(gtp, dtype=float)
-    predp = np.asarray(predp, dtype=float)
+    return xedges, yedges, mask
 
-    # Use extent of GT points as proxy for box area
-    scale = np.sqrt(np.prod(np.nanmax(gtp, axis=0) - np.nanmin(gtp, axis=0)))
-    scale = np.maximum(0.0, np.minimum(scale, 1.0))
 
-    # If GT points are None/nan/inf: skip
-    # If pred points are None/nan/inf: use max distance
-    dists = []
-    for g, p in zip(gtp, predp):
-        if not np.isfinite(g).all():
-            continue
+def _get_mask_area(mask_grid):
+    xedges, yedges, mask = mask_grid
+    return np.diff(yedges) @ mask @ np.diff(xedges)
 
-        if np.isfinite(p).all():
-            d = sp.distance.euclidean(g, p)
-        else:
-            # Max distance
-            d = 1
 
-        dists.append(d)
+def _get_mask_bounds(mask_grids):
+    bounds = np.zeros((len(mask_grids), 4))
+    for idx, (xedges, yedges, _) in enumerate(mask_grids):
+        bounds[idx] = (xedges[0], yedges[0], xedges[-1], yedges[-1])
+
+    return bounds
 
-    dists = np.array(dists)
-    n = len(dists)
 
-    if n == 0:
+def _compute_mask_intersection(mask_grid1, mask_grid2):
+    xedges1, yedges1, mask1 = mask_grid1
+    xedges2, yedges2, mask2 = mask_grid2
+
+    # Merge the pixel grids of both masks in their overlapping region. Every
+    # cell of the merged grid lies entirely inside a single pixel of each mask
+    xedges, cols1, cols2 = _merge_edges(xedges1, xedges2)
+    if xedges is None:
+        return 0.0
+
+    yedges, rows1, rows2 = _merge_edges(yedges1, yedges2)
+    if yedges is None:
         return 0.0
 
-    # object keypoint similarity with kappa == 1
-    # https://cocodataset.org/#keypoints-eval
-    return np.sum(np.exp(-(dists**2) / (2 * (scale**2)))) / n
+    inter = mask1[np.ix_(rows1, cols1)] & mask2[np.ix_(rows2, cols2)]
+    return np.diff(yedges) @ inter @ np.diff(xedges)
+
+
+def _merge_edges(edges1, edges2):
+    start = max(edges1[0], edges2[0])
+    stop = min(edges1[-1], edges2[-1])
+    if stop <= start:
+        return None, None, None
+
+    edges = np.unique(np.concatenate([edges1, edges2, [start, stop]]))
+    edges = edges[(edges >= start) & (edges <= stop)]
+
+    centers = 0.5 * (edges[:-1] + edges[1:])
+    inds1 = np.searchsorted(edges1, centers, side="right") - 1
+    inds2 = np.searchsorted(edges2, centers, side="right") - 1
+    inds1 = np.clip(inds1, 0, len(edges1) - 2)
+    inds2 = np.clip(inds2, 0, len(edges2) - 2)
+
+    return edges, inds1, inds2
+
+
+def _compute_segment_ious(preds, gts, classwise=False):
+    is_symmetric = preds is gts
+
+    pred_supports = _get_supports(preds)
+    if is_symmetric:
+        gt_supports = pred_supports
+    else:
+        gt_supports = _get_supports(gts)
+
+    ious = _compute_support_ious(pred_supports, gt_supports)
+
+    if classwise:
+        pred_labels = [pred.label for pred in preds]
+        gt_labels = [gt.label for gt in gts]
+        ious[~_get_matching_labels(pred_labels, gt_labels)] = 0
+
+    if is_symmetric:
+        ious = np.tril(ious, k=-1)
+        ious += ious.T
+        np.fill_diagonal(ious, 1)
+
+    return ious
+
+
+def _get_supports(segments):
+    supports = [s.support for s in segments]
+    return np.array(supports, dtype=float).reshape(-1, 2)
+
+
+def _compute_support_ious(supports1, supports2):
+    # Supports are [first, last]
+    st1, et1 = [a[:, np.newaxis] for a in supports1.T]
+    st2, et2 = [a[np.newaxis, :] for a in supports2.T]
+    len1 = et1 - st1
+    len2 = et2 - st2
+
+    inter = np.minimum(et1, et2) - np.maximum(st1, st2)
+    union = len1 + len2 - inter
+
+    ious = np.zeros(inter.shape)
+    np.divide(inter, union, out=ious, where=(inter > 0) & (union != 0))
+    np.minimum(ious, 1, out=ious)
+
+    # Pairs of zero-length segments match only if they coincide
+    instants = (len1 == 0) & (len2 == 0)
+    if instants.any():
+        ious[instants] = np.broadcast_to(et1 == et2, ious.shape)[instants]
+
+    return ious
+
+
+def _compute_keypoint_similarities(preds, gts, classwise=False, sigmas=None):
+    predps = [pred.points for pred in preds]
+    gtps = [gt.points for gt in gts]
+    sims = _compute_object_keypoint_similarities(predps, gtps, sigmas=sigmas)
+
+    if classwise:
+        pred_labels = [pred.label for pred in preds]
+        gt_labels = [gt.label for gt in gts]
+        sims[~_get_matching_labels(pred_labels, gt_labels)] = 0
+
+    return sims
+
+
+def _compute_object_keypoint_similarities(predps, gtps, sigmas=None):
+    # Stack points into (num objects, num keypoints, num dims) arrays, padded
+    # with NaN, along with masks indicating which keypoints are present
+    pred_points, pred_exists = _stack_points(predps)
+    gt_points, _ = _stack_points(gtps)
+
+    num_points = max(pred_points.shape[1], gt_points.shape[1])
+    if num_points == 0:
+        return np.zeros((len(predps), len(gtps)))
+
+    pred_points = _pad_points(pred_points, num_points)
+    pred_exists = _pad_points(pred_exists, num_points)
+    gt_points = _pad_points(gt_points, num_points)
+
+    if sigmas is None:
+        # object keypoint similarity with kappa == 1
+        kappas = np.ones(num_points)
+    else:
+        # https://cocodataset.org/#keypoints-eval
+        kappas = np.ones(num_points)
+        _sigmas = np.asarray(sigmas, dtype=float)[:num_points]
+        kappas[: len(_sigmas)] = 2 * _sigmas
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Use extent of GT points as proxy for box area
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            extent = np.nanmax(gt_points, axis=1) - np.nanmin(
+                gt_points, axis=1
+            )
+
+        scale = np.sqrt(np.prod(extent, axis=1))
+        scale = np.maximum(0.0, np.minimum(scale, 1.0))
+
+        # If GT points are None/nan/inf: skip
+        # If pred points are None/nan/inf: use max distance
+        gt_valid = np.isfinite(gt_points).all(axis=2)
+        pred_valid = np.isfinite(pred_points).all(axis=2)
+        valid = pred_exists[:, np.newaxis, :] & gt_valid[np.newaxis, :, :]
+
+        diffs = pred_points[:, np.newaxis] - gt_points[np.newaxis, :]
+        dists = np.sqrt(np.sum(diffs**2, axis=3))
+        dists = np.where(pred_valid[:, np.newaxis, :], dists, 1)
+
+        denom = 2 * (scale[np.newaxis, :, np.newaxis] ** 2) * kappas**2
+        sims = np.exp(-(dists**2) / denom)
+        sims = np.where(valid, sims, 0).sum(axis=2)
+
+    n = valid.sum(axis=2)
+    return np.divide(sims, n, out=np.zeros(sims.shape), where=n > 0)
+
+
+def _stack_points(points_list):
+    num_objects = len(points_list)
+    arrays = [
+        np.asarray(p, dtype=float).reshape(len(p), -1)
+        if len(p)
+        else np.zeros((0, 2))
+        for p in points_list
+    ]
+    num_points = max((a.shape[0] for a in arrays), default=0)
+    num_dims = max((a.shape[1] for a in arrays), default=2)
+
+    points = np.full((num_objects, num_points, num_dims), np.nan)
+    exists = np.zeros((num_objects, num_points), dtype=bool)
+    for idx, a in enumerate(arrays):
+        points[idx, : a.shape[0], : a.shape[1]] = a
+        exists[idx, : a.shape[0]] = True
+
+    return points, exists
+
+
+def _pad_points(arr, num_points):
+    pad = num_points - arr.shape[1]
+    if pad <= 0:
+        return arr
+
+    pad_width = [(0, 0), (0, pad)] + [(0, 0)] * (arr.ndim - 2)
+    if arr.dtype == bool:
+        return np.pad(arr, pad_width, constant_values=False)
+
+    return np.pad(arr, pad_width, constant_values=np.nan)
 
 
 def _polylines_to_detections(polylines):
@@ -5,6 +5,11 @@ Label utilities.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+import itertools
+
+import numpy as np
+from pymongo import UpdateOne
+
 import eta.core.utils as etau
 
 import fiftyone.core.labels as fol
@@ -692,6 +697,7 @@ def perform_nms(
     iou_thresh=0.5,
     confidence_thresh=None,
     classwise=True,
+    num_workers=None,
     progress=None,
 ):
     """Performs non-maximum suppression (NMS) on the specified
@@ -718,6 +724,8 @@ def perform_nms(
             lower than this threshold will be discarded
         classwise (True): whether to treat each class ``label`` separately
             (True) or suppress all detections jointly (False)
+        num_workers (None): an optional number of processes to use to perform
+            NMS. By default, NMS is performed in the main process
         progress (None): whether to render a progress bar (True/False), use the
             default value ``fiftyone.config.show_progress_bars`` (None), or a
             progress callback function to invoke instead
@@ -731,9 +739,92 @@ def perform_nms(
         out_field = in_field
 
     samples = sample_collection.select_fields(in_field)
-    in_field, processing_frames = samples._handle_frame_field(in_field)
-    out_field, _ = samples._handle_frame_field(out_field)
+    _in_field, processing_frames = samples._handle_frame_field(in_field)
+    _out_field, _ = samples._handle_frame_field(out_field)
+
+    # Generated views and views that filter the input field must be edited
+    # through their samples so that the changes are synced appropriately
+    if not _can_bulk_edit_detections(samples, _in_field, processing_frames):
+        _perform_nms_samples(
+            samples,
+            _in_field,
+            _out_field,
+            processing_frames,
+            iou_thresh,
+            confidence_thresh,
+            classwise,
+            progress,
+        )
+        return
+
+    # Detections are loaded in a single pass as raw documents, which are
+    # written back in bulk for only the images whose detections change
+    if processing_frames:
+        ids, docs = samples.values(["frames._id", in_field], _raw=True)
+        ids = list(itertools.chain.from_iterable(ids))
+        docs = list(itertools.chain.from_iterable(docs))
+    else:
+        ids, docs = samples.values(["_id", in_field], _raw=True)
+
+    inputs = [
+        (_get_nms_inputs(doc), iou_thresh, confidence_thresh, classwise)
+        for doc in docs
+    ]
+    keep_inds = _compute_nms_inds(inputs, num_workers, progress)
+
+    if out_field != in_field:
+        dataset = samples._dataset
+        schema = {_out_field: samples.get_field(in_field)}
+        if processing_frames:
+            dataset._merge_frame_field_schema(schema)
+        else:
+            dataset._merge_sample_field_schema(schema)
+
+    update_ids = []
+    ops = []
+    for _id, doc, keep in zip(ids, docs, keep_inds):
+        if doc is None:
+            continue
+
+        detections = doc.get("detections", None) or []
+        if out_field == in_field and keep == list(range(len(detections))):
+            continue
+
+        nms_doc = {
+            "_cls": "Detections",
+            "detections": [detections[i] for i in keep],
+        }
+
+        update_ids.append(_id)
+        ops.append(UpdateOne({"_id": _id}, {"$set": {_out_field: nms_doc}}))
+
+    if ops:
+        samples._dataset._bulk_write(
+            ops, ids=update_ids, frames=processing_frames
+        )
+
 
+def _can_bulk_edit_detections(view, field_name, is_frame_field):
+    if not view._has_bulk_label_edits():
+        return False
+
+    filtered_fields = view._get_filtered_fields(frames=is_frame_field)
+    if not filtered_fields:
+        return True
+
+    return field_name + ".detections" not in filtered_fields
+
+
+def _perform_nms_samples(
+    samples,
+    in_field,
+    out_field,
+    processing_frames,
+    iou_thresh,
+    confidence_thresh,
+    classwise,
+    progress,
+):
     for sample in samples.iter_samples(autosave=True, progress=progress):
         if processing_frames:
             images = sample.frames.values()
@@ -753,6 +844,110 @@ def perform_nms(
                 image[out_field] = fol.Detections(detections=nms_detections)
 
 
+def _get_nms_inputs(doc):
+    if doc is None:
+        return None
+
+    detections = doc.get("detections", None) or []
+
+    boxes = [d.get("bounding_box", None) for d in detections]
+    confs = [d.get("confidence", None) for d in detections]
+    labels = [d.get("label", None) for d in detections]
+
+    return boxes, confs, labels
+
+
+def _compute_nms_inds(inputs, num_workers, progress):
+    keep_inds = []
+
+    with fou.ProgressBar(total=len(inputs), progress=progress) as pb:
+        if not num_workers or num_workers <= 1:
+            for args in pb(inputs):
+                keep_inds.append(_do_nms(args))
+
+            return keep_inds
+
+        # Images are submitted in chunks to amortize the transfer overhead
+        chunksize = max(1, min(1000, len(inputs) // (4 * num_workers)))
+        ctx = fou.get_multiprocessing_context()
+        with ctx.Pool(processes=num_workers) as pool:
+            for keep in pool.imap(_do_nms, inputs, chunksize=chunksize):
+                keep_inds.append(keep)
+                pb.update()
+
+    return keep_inds
+
+
+def _do_nms(args):
+    nms_inputs, iou_thresh, confidence_thresh, classwise = args
+
+    if nms_inputs is None:
+        return []
+
+    boxes, confs, labels = nms_inputs
+
+    return _perform_nms_inds(
+        boxes,
+        confs,
+        labels,
+        iou_thresh=iou_thresh,
+        confidence_thresh=confidence_thresh,
+        classwise=classwise,
+    )
+
+
+def _perform_nms_inds(
+    boxes,
+    confs,
+    labels,
+    iou_thresh=0.5,
+    confidence_thresh=None,
+    classwise=True,
+):
+    num = len(boxes)
+    if num == 0:
+        return []
+
+    # Sort by descending confidence, with missing confidences last, and break
+    # ties by original order
+    has_conf = np.array([c is not None for c in confs], dtype=bool)
+    _confs = np.array(
+        [c if c is not None else 0.0 for c in confs], dtype=float
+    )
+    order = np.lexsort((np.arange(num), -_confs, ~has_conf))
+
+    if confidence_thresh is not None:
+        valid = has_conf[order] & (_confs[order] >= confidence_thresh)
+        order = order[valid]
+
+    if order.size == 0:
+        return []
+
+    _boxes = np.array(boxes, dtype=float).reshape(-1, 4)[order]
+    ious = foui._compute_box_ious(_boxes, _boxes)
+    suppress = ious >= iou_thresh
+
+    if classwise:
+        label_map = {}
+        label_inds = np.array(
+            [label_map.setdefault(labels[i], len(label_map)) for i in order]
+        )
+        suppress &= label_inds[:, np.newaxis] == label_inds[np.newaxis, :]
+
+    # Greedily keep the most confident remaining detection and suppress all
+    # detections that overlap it
+    suppressed = np.zeros(order.size, dtype=bool)
+    keep = []
+    for i in range(order.size):
+        if suppressed[i]:
+            continue
+
+        keep.append(int(order[i]))
+        suppressed |= suppress[i]
+
+    return keep
+
+
 def _perform_nms(
     detections, iou_thresh=0.5, confidence_thresh=None, classwise=True
 ):
@@ -142,6 +142,235 @@ def compute_cuboid_iou(gt, pred, gt_crowd=False):
     return min(etan.safe_divide(inter, union), 1)
 
 
+def compute_cuboid_ious(preds, gts, gt_crowds=None):
+    """Computes the pairwise IoUs between the given predicted and ground truth
+    cuboids.
+
+    Pairs of cuboids whose bounds do not overlap are skipped, and pairs of
+    cuboids that are axis-aligned or rotated about a common axis (eg, yaw-only
+    LiDAR boxes) are computed in a vectorized fashion. Any other pairs are
+    computed via :func:`compute_cuboid_iou`.
+
+    Args:
+        preds: a list of predicted :class:`fiftyone.core.labels.Detection`
+            instances
+        gts: a list of ground truth :class:`fiftyone.core.labels.Detection`
+            instances
+        gt_crowds (None): an optional list of booleans indicating whether each
+            ground truth cuboid is a crowd
+
+    Returns:
+        a ``num_preds x num_gts`` array of IoUs
+    """
+    ious = np.zeros((len(preds), len(gts)))
+    if not preds or not gts:
+        return ious
+
+    if gt_crowds is None:
+        gt_crowds = np.zeros(len(gts), dtype=bool)
+    else:
+        gt_crowds = np.asarray(gt_crowds, dtype=bool)
+
+    pred_locs, pred_dims, pred_rots = _parse_cuboids(preds)
+    gt_locs, gt_dims, gt_rots = _parse_cuboids(gts)
+
+    pred_axes, pred_angles = _get_rotation_axes(pred_rots)
+    gt_axes, gt_angles = _get_rotation_axes(gt_rots)
+
+    # Only pairs whose bounds overlap can have nonzero intersection
+    pred_bounds = _get_cuboid_bounds(pred_locs, pred_dims, pred_rots)
+    gt_bounds = _get_cuboid_bounds(gt_locs, gt_dims, gt_rots)
+    candidates = np.all(
+        (pred_bounds[:, np.newaxis, 0] <= gt_bounds[np.newaxis, :, 1])
+        & (gt_bounds[np.newaxis, :, 0] <= pred_bounds[:, np.newaxis, 1]),
+        axis=2,
+    )
+
+    # Axis -1 means axis-aligned and axis 3 means a general rotation
+    pa = pred_axes[:, np.newaxis]
+    ga = gt_axes[np.newaxis, :]
+    aligned = candidates & (pa == -1) & (ga == -1)
+    shared = (
+        candidates
+        & ~aligned
+        & ((pa == ga) | (pa == -1) | (ga == -1))
+        & (pa != 3)
+        & (ga != 3)
+    )
+    general = candidates & ~aligned & ~shared
+
+    inters = np.zeros((len(preds), len(gts)))
+
+    # Axis-aligned cuboids intersect in an axis-aligned cuboid
+    inds_pred, inds_gt = np.nonzero(aligned)
+    overlaps = np.minimum(
+        pred_bounds[inds_pred, 1], gt_bounds[inds_gt, 1]
+    ) - np.maximum(pred_bounds[inds_pred, 0], gt_bounds[inds_gt, 0])
+    inters[inds_pred, inds_gt] = np.prod(np.maximum(overlaps, 0), axis=1)
+
+    # Cuboids rotated about a common axis intersect in a prism whose base is
+    # the intersection of their rotated rectangles orthogonal to that axis
+    inds_pred, inds_gt = np.nonzero(shared)
+    axes = np.maximum(pred_axes[inds_pred], gt_axes[inds_gt])
+    for axis in range(3):
+        i = inds_pred[axes == axis]
+        j = inds_gt[axes == axis]
+        if i.size == 0:
+            continue
+
+        plane = [(axis + 1) % 3, (axis + 2) % 3]
+        areas = _compute_rect_intersection_areas(
+            pred_locs[i][:, plane],
+            pred_dims[i][:, plane],
+            pred_angles[i],
+            gt_locs[j][:, plane],
+            gt_dims[j][:, plane],
+            gt_angles[j],
+        )
+        heights = np.minimum(
+            pred_bounds[i, 1, axis], gt_bounds[j, 1, axis]
+        ) - np.maximum(pred_bounds[i, 0, axis], gt_bounds[j, 0, axis])
+        inters[i, j] = areas * np.maximum(heights, 0)
+
+    pred_vols = np.prod(pred_dims, axis=1)
+    gt_vols = np.prod(gt_dims, axis=1)
+    unions = np.where(
+        gt_crowds[np.newaxis, :],
+        pred_vols[:, np.newaxis],
+        pred_vols[:, np.newaxis] + gt_vols[np.newaxis, :] - inters,
+    )
+
+    vectorized = aligned | shared
+    np.divide(inters, unions, out=ious, where=vectorized & (unions != 0))
+    np.minimum(ious, 1, out=ious)
+
+    for i, j in zip(*np.nonzero(general)):
+        ious[i, j] = compute_cuboid_iou(
+            gts[j], preds[i], gt_crowd=gt_crowds[j]
+        )
+
+    return ious
+
+
+def _parse_cuboids(detections):
+    locs = np.array([d.location for d in detections], dtype=float)
+    dims = np.array([d.dimensions for d in detections], dtype=float)
+    rots = np.array([d.rotation for d in detections], dtype=float)
+    return locs, dims, rots
+
+
+def _get_rotation_axes(rots):
+    # Returns -1 for axis-aligned cuboids, the index of the rotation axis for
+    # cuboids rotated about a single axis, and 3 otherwise
+    nonzero = rots != 0
+    num_nonzero = nonzero.sum(axis=1)
+
+    axes = np.argmax(nonzero, axis=1)
+    axes[num_nonzero == 0] = -1
+    axes[num_nonzero > 1] = 3
+
+    angles = np.take_along_axis(rots, np.argmax(nonzero, axis=1)[:, None], 1)
+    return axes, angles[:, 0]
+
+
+def _get_cuboid_bounds(locs, dims, rots):
+    rotations = sp.transform.Rotation.from_rotvec(rots).as_matrix()
+    offsets = _UNIT_BOX[np.newaxis, 1:] * dims[:, np.newaxis, :]
+    vertices = np.einsum("nij,nkj->nki", rotations, offsets)
+    vertices += locs[:, np.newaxis, :]
+    return np.stack([vertices.min(axis=1), vertices.max(axis=1)], axis=1)
+
+
+def _compute_rect_intersection_areas(
+    centers1, sizes1, angles1, centers2, sizes2, angles2
+):
+    """Computes the intersection areas of pairs of rotated rectangles.
+
+    The intersection of two convex polygons is the convex polygon whose
+    vertices are the vertices of each polygon that lie inside the other and
+    the pairwise intersections of their edges.
+    """
+    corners1 = _get_rect_corners(centers1, sizes1, angles1)
+    corners2 = _get_rect_corners(centers2, sizes2, angles2)
+
+    eps = 1e-9 * np.maximum(sizes1.max(axis=1), sizes2.max(axis=1))
+    inside1 = _points_in_rects(corners1, centers2, sizes2, angles2, eps)
+    inside2 = _points_in_rects(corners2, centers1, sizes1, angles1, eps)
+
+    # Pairwise edge intersections p + t * r = q + u * s
+    p = corners1[:, :, np.newaxis, :]
+    r = np.roll(corners1, -1, axis=1)[:, :, np.newaxis, :] - p
+    q = corners2[:, np.newaxis, :, :]
+    s = np.roll(corners2, -1, axis=1)[:, np.newaxis, :, :] - q
+
+    denom = _cross(r, s)
+    parallel = np.abs(denom) <= 1e-12
+    denom = np.where(parallel, 1, denom)
+    t = _cross(q - p, s) / denom
+    u = _cross(q - p, r) / denom
+    crossing = ~parallel & (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)
+
+    num = len(corners1)
+    points = np.concatenate(
+        [corners1, corners2, (p + t[..., np.newaxis] * r).reshape(num, 16, 2)],
+        axis=1,
+    )
+    valid = np.concatenate(
+        [inside1, inside2, crossing.reshape(num, 16)], axis=1
+    )
+
+    counts = valid.sum(axis=1)
+    centroids = np.sum(points * valid[..., np.newaxis], axis=1)
+    centroids /= np.maximum(counts, 1)[:, np.newaxis]
+
+    # Sort the vertices counterclockwise and sum the triangle fan about the
+    # centroid
+    deltas = points - centroids[:, np.newaxis, :]
+    angles = np.arctan2(deltas[..., 1], deltas[..., 0])
+    angles[~valid] = np.inf
+    order = np.argsort(angles, axis=1)
+    deltas = np.take_along_axis(deltas, order[..., np.newaxis], axis=1)
+
+    inds = np.arange(points.shape[1])[np.newaxis, :]
+    next_inds = np.where(inds + 1 < counts[:, np.newaxis], inds + 1, 0)
+    next_deltas = np.take_along_axis(deltas, next_inds[..., np.newaxis], 1)
+
+    fan = _cross(deltas, next_deltas)
+    fan[inds >= counts[:, np.newaxis]] = 0
+
+    return np.maximum(0.5 * fan.sum(axis=1), 0)
+
+
+def _get_rect_corners(centers, sizes, angles):
+    local = np.array([[-0.5, -0.5], [0.5, -0.5], [0.5, 0.5], [-0.5, 0.5]])
+    local = local[np.newaxis, :, :] * sizes[:, np.newaxis, :]
+
+    cos = np.cos(angles)[:, np.newaxis]
+    sin = np.sin(angles)[:, np.newaxis]
+    x = cos * local[..., 0] - sin * local[..., 1]
+    y = sin * local[..., 0] + cos * local[..., 1]
+
+    return np.stack([x, y], axis=2) + centers[:, np.newaxis, :]
+
+
+def _points_in_rects(points, centers, sizes, angles, eps):
+    deltas = points - centers[:, np.newaxis, :]
+
+    cos = np.cos(angles)[:, np.newaxis]
+    sin = np.sin(angles)[:, np.newaxis]
+    x = cos * deltas[..., 0] + sin * deltas[..., 1]
+    y = -sin * deltas[..., 0] + cos * deltas[..., 1]
+
+    eps = eps[:, np.newaxis]
+    return (np.abs(x) <= 0.5 * sizes[:, 0:1] + eps) & (
+        np.abs(y) <= 0.5 * sizes[:, 1:2] + eps
+    )
+
+
+def _cross(a, b):
+    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+
 class _Box(object):
     def __init__(self, rotation, location, scale):
         rotation = np.array(rotation)
@@ -12,6 +12,7 @@ import os
 import random
 import string
 import unittest
+from unittest.mock import patch
 
 from bson import ObjectId
 from mongoengine import ValidationError
@@ -21,6 +22,7 @@ import pytz
 import eta.core.utils as etau
 
 import fiftyone as fo
+import fiftyone.core.dataset as fod
 import fiftyone.core.fields as fof
 import fiftyone.core.odm as foo
 import fiftyone.utils.data as foud
@@ -2892,6 +2894,96 @@ class DatasetExtrasTests(unittest.TestCase):
         also_dataset.reload()
         self.assertListEqual(also_dataset.list_saved_views(), [])
 
+    def test_materialized_saved_views(self):
+        dataset = self.dataset
+        conn = foo.get_db_conn()
+
+        def _get_filenames(view):
+            return [os.path.basename(f) for f in view.values("filepath")]
+
+        view = (
+            dataset.match(F("predictions.confidence") > 0.5)
+            .sort_by("filepath", reverse=True)
+            .select_fields("predictions")
+        )
+
+        with self.assertRaises(ValueError):
+            dataset.save_view(
+                "bad", dataset.select_fields("predictions"), materialize=True
+            )
+
+        dataset.save_view("view", view, materialize=True)
+
+        view_doc = dataset._get_saved_view_doc("view")
+        coll_name = view_doc.materialized_collection
+        self.assertEqual(view_doc.materialized_stages, 2)
+        self.assertEqual(conn[coll_name].count_documents({}), 2)
+
+        self.assertListEqual(
+            [d["index"] for d in conn[coll_name].find().sort("index", 1)],
+            [0, 1],
+        )
+
+        # The stored sample IDs are joined in the pipeline, not loaded
+        also_view = dataset.load_saved_view("view")
+        self.assertEqual(also_view, view)
+        self.assertEqual(
+            also_view._pipeline()[0]["$lookup"]["from"], coll_name
+        )
+        self.assertFalse(hasattr(also_view._materialized, "sample_ids"))
+        self.assertListEqual(
+            _get_filenames(also_view), ["image2.png", "image1.png"]
+        )
+        self.assertEqual(
+            also_view.count("predictions"), view.count("predictions")
+        )
+        self.assertEqual(len(also_view.limit(1)), 1)
+
+        # Writes to the dataset invalidate the stored result. Document saves
+        # are coalesced into a single deferred increment of the write count
+        write_count = dataset._get_write_count()
+
+        with patch.object(fod, "_WRITE_COUNT_DELAY", 60):
+            sample = dataset.first()
+            sample.predictions.confidence = 0.1
+            sample.save()
+            sample.save()
+
+            d = conn.datasets.find_one({"_id": dataset._doc.id})
+            self.assertEqual(d["write_count"], write_count)
+
+            also_view = dataset.load_saved_view("view")
+            self.assertEqual(dataset._get_write_count(), write_count + 1)
+
+        self.assertListEqual(_get_filenames(also_view), ["image2.png"])
+
+        view_doc = dataset._get_saved_view_doc("view")
+        self.assertNotEqual(view_doc.materialized_collection, coll_name)
+        self.assertNotIn(coll_name, conn.list_collection_names())
+
+        dataset.set_values("predictions.confidence", [0.9, 0.9, 0.9])
+
+        also_view = dataset.load_saved_view("view")
+        self.assertListEqual(
+            _get_filenames(also_view),
+            ["image3.png", "image2.png", "image1.png"],
+        )
+
+        coll_name = view_doc.materialized_collection
+        dataset.delete_saved_view("view")
+        self.assertNotIn(coll_name, conn.list_collection_names())
+
+        # Unordered results don't store an index
+        unordered_view = dataset.match(F("predictions.confidence") > 0.5)
+        dataset.save_view("unordered", unordered_view, materialize=True)
+
+        view_doc = dataset._get_saved_view_doc("unordered")
+        d = conn[view_doc.materialized_collection].find_one()
+        self.assertNotIn("index", d)
+
+        also_view = dataset.load_saved_view("unordered")
+        self.assertEqual(len(also_view), len(unordered_view))
+
     def test_workspaces(self):
         dataset = self.dataset
 
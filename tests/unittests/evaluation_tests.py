@@ -24,6 +24,7 @@ import fiftyone.utils.eval.regression as four
 import fiftyone.utils.eval.segmentation as fous
 import fiftyone.utils.labels as foul
 import fiftyone.utils.iou as foui
+import fiftyone.utils.utils3d as fou3d
 
 from decorators import drop_datasets
 
@@ -157,6 +158,42 @@ class RegressionTests(unittest.TestCase):
 
         results.print_metrics()
 
+    @drop_datasets
+    def test_evaluate_regressions_metrics(self):
+        dataset = self._make_regression_dataset()
+
+        dataset.evaluate_regressions(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval",
+            metric="absolute_error",
+            missing=0.0,
+        )
+
+        actual = dataset.values("eval")
+        expected = [0.0, 1.0, 1.0, 0.1, 0.2]
+
+        for a, e in zip(actual, expected):
+            self.assertAlmostEqual(a, e)
+
+        dataset.delete_evaluation("eval")
+
+        dataset.evaluate_regressions(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval",
+            metric=lambda yp, yt: yp - yt,
+        )
+
+        actual = dataset.values("eval")
+        expected = [None, None, None, -0.1, 0.2]
+
+        for a, e in zip(actual, expected):
+            if e is None:
+                self.assertIsNone(a)
+            else:
+                self.assertAlmostEqual(a, e)
+
     def test_custom_regression_evaluation(self):
         dataset = self._make_regression_dataset()
 
@@ -1696,6 +1733,172 @@ class DetectionsTests(unittest.TestCase):
 
         self._evaluate_coco(dataset, kwargs)
 
+    @drop_datasets
+    def test_coco_iou_sweep(self):
+        dataset = fo.Dataset()
+        dataset.add_sample(
+            fo.Sample(
+                filepath="image.jpg",
+                ground_truth=fo.Detections(
+                    detections=[
+                        fo.Detection(
+                            label="cat", bounding_box=[0.1, 0.1, 0.4, 0.4]
+                        ),
+                        fo.Detection(
+                            label="dog",
+                            bounding_box=[0.5, 0.5, 0.4, 0.4],
+                            iscrowd=True,
+                        ),
+                    ]
+                ),
+                predictions=fo.Detections(
+                    detections=[
+                        fo.Detection(
+                            label="cat",
+                            bounding_box=[0.1, 0.1, 0.4, 0.4],
+                            confidence=0.9,
+                        ),
+                        fo.Detection(
+                            label="cat",
+                            bounding_box=[0.12, 0.1, 0.4, 0.4],
+                            confidence=0.8,
+                        ),
+                        fo.Detection(
+                            label="dog",
+                            bounding_box=[0.6, 0.6, 0.2, 0.2],
+                            confidence=0.7,
+                        ),
+                    ]
+                ),
+            )
+        )
+
+        results = dataset.evaluate_detections(
+            "predictions",
+            gt_field="ground_truth",
+            method="coco",
+            compute_mAP=True,
+        )
+
+        # The second cat is a false positive, and the dog matches a crowd
+        self.assertListEqual(list(results.classes), ["cat", "dog"])
+        self.assertEqual(results.mAP(), 1.0)
+        self.assertTrue((results.precision[:, 1] == -1).all())
+
+        # Results are the same when the sweep is performed separately
+        eval_method = results.config.build()
+        _results = eval_method.generate_results(dataset, [])
+
+        self.assertTrue(np.array_equal(results.precision, _results.precision))
+        self.assertTrue(
+            np.array_equal(results.thresholds, _results.thresholds)
+        )
+
+    def test_polygon_ious(self):
+        def _square(label, x, y, size):
+            points = [
+                (x, y),
+                (x + size, y),
+                (x + size, y + size),
+                (x, y + size),
+            ]
+            return fo.Polyline(
+                label=label,
+                points=[points],
+                closed=True,
+                filled=True,
+            )
+
+        preds = [
+            _square("cat", 0.1, 0.1, 0.2),
+            _square("dog", 0.2, 0.1, 0.2),
+            _square("cat", 0.7, 0.7, 0.1),
+        ]
+        gts = [_square("cat", 0.1, 0.1, 0.2), _square("cat", 0.75, 0.7, 0.1)]
+
+        ious = foui.compute_ious(preds, gts)
+        expected = np.array([[1, 0], [1 / 3, 0], [0, 1 / 3]])
+        self.assertTrue(np.allclose(ious, expected))
+
+        ious = foui.compute_ious(preds, gts, classwise=True)
+        expected = np.array([[1, 0], [0, 0], [0, 1 / 3]])
+        self.assertTrue(np.allclose(ious, expected))
+
+        ious = foui.compute_ious(preds, gts, iscrowd=lambda l: True)
+        expected = np.array([[1, 0], [0.5, 0], [0, 0.5]])
+        self.assertTrue(np.allclose(ious, expected))
+
+        ious = foui.compute_ious(preds, preds)
+        expected = np.array([[1, 1 / 3, 0], [1 / 3, 1, 0], [0, 0, 1]])
+        self.assertTrue(np.allclose(ious, expected))
+
+    def test_dense_mask_ious(self):
+        preds = [
+            fo.Detection(
+                label="cat",
+                bounding_box=[0.0, 0.0, 0.5, 0.5],
+                mask=np.array([[1, 0], [0, 0]], dtype=bool),
+            ),
+            fo.Detection(
+                label="cat",
+                bounding_box=[0.6, 0.6, 0.2, 0.2],
+                mask=np.ones((4, 4), dtype=bool),
+            ),
+        ]
+        gts = [
+            fo.Detection(
+                label="cat",
+                bounding_box=[0.0, 0.0, 0.25, 0.25],
+                mask=np.ones((3, 3), dtype=bool),
+            ),
+            fo.Detection(
+                label="cat",
+                bounding_box=[0.125, 0.0, 0.25, 0.25],
+                mask=np.ones((1, 1), dtype=bool),
+            ),
+        ]
+
+        ious = foui.compute_ious(preds, gts, use_masks=True, tolerance=0)
+        expected = np.array([[1, 1 / 3], [0, 0]])
+        self.assertTrue(np.allclose(ious, expected))
+
+        ious = foui.compute_ious(gts, gts, use_masks=True, tolerance=0)
+        expected = np.array([[1, 1 / 3], [1 / 3, 1]])
+        self.assertTrue(np.allclose(ious, expected))
+
+    def test_keypoint_similarities(self):
+        nan = float("nan")
+        gts = [
+            fo.Keypoint(label="person", points=[(0, 0), (0.5, 0.5)]),
+            fo.Keypoint(label="cat", points=[(0.8, 0.8), (0.9, 0.9)]),
+        ]
+        preds = [
+            fo.Keypoint(label="person", points=[(0, 0), (0.5, 0.5)]),
+            fo.Keypoint(label="person", points=[(0, 0), (nan, nan)]),
+            fo.Keypoint(label="person", points=[(0, 0)]),
+            fo.Keypoint(label="person", points=[]),
+        ]
+
+        sims = foui.compute_ious(preds, gts)
+        self.assertEqual(sims.shape, (4, 2))
+        self.assertAlmostEqual(sims[0, 0], 1.0)
+        self.assertAlmostEqual(sims[1, 0], (1 + np.exp(-2)) / 2)
+        self.assertAlmostEqual(sims[2, 0], 1.0)
+        self.assertTrue((sims[3] == 0).all())
+
+        empty = [fo.Keypoint(label="person", points=[])]
+        sims_empty = foui.compute_ious(empty, empty)
+        self.assertEqual(sims_empty.shape, (1, 1))
+        self.assertEqual(sims_empty[0, 0], 0)
+
+        sims_classwise = foui.compute_ious(preds, gts, classwise=True)
+        self.assertTrue(np.allclose(sims_classwise[:, 0], sims[:, 0]))
+        self.assertTrue((sims_classwise[:, 1] == 0).all())
+
+        sims = foui.compute_ious(preds, gts, sigmas=[0.25, 0.25])
+        self.assertAlmostEqual(sims[0, 0], 1.0)
+        self.assertAlmostEqual(sims[1, 0], (1 + np.exp(-8)) / 2)
+
     @drop_datasets
     def test_evaluate_instances_coco(self):
         dataset = self._make_instances_dataset()
@@ -1731,6 +1934,155 @@ class DetectionsTests(unittest.TestCase):
 
         self._evaluate_open_images(dataset, kwargs)
 
+    @drop_datasets
+    def test_evaluate_detections_open_images_hierarchy(self):
+        dataset = fo.Dataset()
+        dataset.add_sample(
+            fo.Sample(
+                filepath="image.jpg",
+                ground_truth=fo.Detections(
+                    detections=[
+                        fo.Detection(
+                            label="cat", bounding_box=[0.1, 0.1, 0.4, 0.4]
+                        ),
+                        fo.Detection(
+                            label="other", bounding_box=[0.6, 0.6, 0.3, 0.3]
+                        ),
+                    ]
+                ),
+                predictions=fo.Detections(
+                    detections=[
+                        fo.Detection(
+                            label="dog",
+                            bounding_box=[0.1, 0.1, 0.4, 0.4],
+                            confidence=0.9,
+                        ),
+                        fo.Detection(
+                            label="cat",
+                            bounding_box=[0.1, 0.1, 0.4, 0.4],
+                            confidence=0.8,
+                        ),
+                        fo.Detection(
+                            label="other",
+                            bounding_box=[0.6, 0.6, 0.3, 0.3],
+                            confidence=0.7,
+                        ),
+                    ]
+                ),
+                labels=fo.Classifications(
+                    classifications=[fo.Classification(label="cat")]
+                ),
+            )
+        )
+
+        hierarchy = {
+            "LabelName": "root",
+            "Subcategory": [
+                {
+                    "LabelName": "animal",
+                    "Subcategory": [
+                        {"LabelName": "cat"},
+                        {"LabelName": "dog"},
+                    ],
+                }
+            ],
+        }
+
+        # Objects are expanded to their ancestors, but their own results are
+        # computed within their own class
+        results = dataset.evaluate_detections(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval",
+            method="open-images",
+            hierarchy=hierarchy,
+            expand_pred_hierarchy=True,
+        )
+
+        self.assertListEqual(
+            dataset.values("ground_truth.detections.eval"), [["tp", "tp"]]
+        )
+        self.assertListEqual(
+            dataset.values("predictions.detections.eval"),
+            [["fp", "tp", "tp"]],
+        )
+        self.assertEqual(results._classwise_AP["animal"], 1.0)
+        self.assertEqual(results._classwise_AP["cat"], 1.0)
+        self.assertEqual(results._classwise_AP["dog"], -1)
+        self.assertEqual(results.mAP(), 1.0)
+
+        # Only objects with positive labels (or their ancestors) are evaluated
+        results = dataset.evaluate_detections(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval",
+            method="open-images",
+            hierarchy=hierarchy,
+            pos_label_field="labels",
+        )
+
+        self.assertListEqual(
+            dataset.values("ground_truth.detections.eval"), [["tp", None]]
+        )
+        self.assertListEqual(
+            dataset.values("predictions.detections.eval"),
+            [[None, "tp", None]],
+        )
+        self.assertEqual(results._classwise_AP["animal"], 0.0)
+        self.assertEqual(results._classwise_AP["cat"], 1.0)
+
+    @drop_datasets
+    def test_evaluate_detections_compact(self):
+        dataset = self._make_detections_dataset()
+
+        for method, kwargs in [
+            ("coco", dict(compute_mAP=True)),
+            ("open-images", {}),
+        ]:
+            results = dataset.evaluate_detections(
+                "predictions",
+                gt_field="ground_truth",
+                eval_key="eval",
+                method=method,
+                classwise=False,
+                **kwargs,
+            )
+            compact_results = dataset.evaluate_detections(
+                "predictions",
+                gt_field="ground_truth",
+                eval_key="eval_compact",
+                method=method,
+                classwise=False,
+                compact=True,
+                **kwargs,
+            )
+
+            self.assertIsNone(compact_results.ytrue_ids)
+            self.assertEqual(compact_results.weights.sum(), 4)
+            self.assertEqual(compact_results.confs.dtype, float)
+
+            loaded_results = dataset.load_evaluation_results(
+                "eval_compact", cache=False
+            )
+
+            for _results in (compact_results, loaded_results):
+                self.assertDictEqual(_results.report(), results.report())
+                self.assertAlmostEqual(_results.mAP(), results.mAP())
+                self.assertTrue(
+                    np.array_equal(
+                        _results.confusion_matrix(),
+                        results.confusion_matrix(),
+                    )
+                )
+
+                _, _, ids = _results._confusion_matrix(tabulate_ids=True)
+                _, _, expected_ids = results._confusion_matrix(
+                    tabulate_ids=True
+                )
+                self.assertListEqual(ids.tolist(), expected_ids.tolist())
+
+            dataset.delete_evaluations()
+
     @drop_datasets
     def test_load_evaluation_view_select_fields(self):
         dataset = self._make_detections_dataset()
@@ -1980,6 +2332,54 @@ class CuboidTests(unittest.TestCase):
         self._check_iou(dataset, "test4_box1", "test4_box3", expected_iou)
         self._check_iou(dataset, "test4_box1", "test4_box4", expected_iou)
 
+    def test_batch_ious(self):
+        rng = np.random.default_rng(51)
+
+        def _make_box(axis):
+            rotation = [0.0, 0.0, 0.0]
+            if axis is not None:
+                rotation[axis] = float(rng.uniform(-np.pi, np.pi))
+
+            return fo.Detection(
+                label=str(rng.integers(2)),
+                location=rng.uniform(0, 3, 3).tolist(),
+                dimensions=rng.uniform(0.5, 2, 3).tolist(),
+                rotation=rotation,
+            )
+
+        # Axis-aligned, rotated about each axis, and general rotations
+        dets = [_make_box(axis) for axis in [None, 0, 1, 2] * 4]
+        dets.append(
+            fo.Detection(
+                label="0",
+                location=[1.0, 1.0, 1.0],
+                dimensions=[1.0, 1.0, 1.0],
+                rotation=[0.3, 0.2, 0.1],
+            )
+        )
+
+        preds = dets[::2]
+        gts = dets[1::2]
+
+        ious = foui.compute_ious(preds, gts)
+        expected = np.array(
+            [[fou3d.compute_cuboid_iou(g, p) for g in gts] for p in preds]
+        )
+        self.assertTrue(np.allclose(ious, expected))
+        self.assertTrue((ious > 0).any())
+
+        ious = foui.compute_ious(preds, gts, classwise=True)
+        for i, pred in enumerate(preds):
+            for j, gt in enumerate(gts):
+                if pred.label != gt.label:
+                    self.assertEqual(ious[i, j], 0)
+                else:
+                    self.assertAlmostEqual(ious[i, j], expected[i, j])
+
+        ious = foui.compute_ious(dets, dets)
+        self.assertTrue(np.allclose(ious, ious.T))
+        self.assertTrue((np.diag(ious) == 1).all())
+
 
 class VideoDetectionsTests(unittest.TestCase):
     def _make_video_detections_dataset(self):
@@ -2511,6 +2911,81 @@ class VideoDetectionsTests(unittest.TestCase):
             [[], [0], [1, 0], [0, 1]],
         )
 
+    @drop_datasets
+    def test_evaluate_temporal_detections_activitynet(self):
+        dataset = fo.Dataset()
+        dataset.add_sample(
+            fo.Sample(
+                filepath="video1.mp4",
+                ground_truth=fo.TemporalDetections(
+                    detections=[
+                        fo.TemporalDetection(label="a", support=[1, 10]),
+                        fo.TemporalDetection(label="a", support=[20, 30]),
+                        fo.TemporalDetection(label="b", support=[40, 50]),
+                    ]
+                ),
+                predictions=fo.TemporalDetections(
+                    detections=[
+                        fo.TemporalDetection(
+                            label="a", support=[42, 50], confidence=0.6
+                        ),
+                        fo.TemporalDetection(
+                            label="b", support=[1, 10], confidence=0.7
+                        ),
+                        fo.TemporalDetection(
+                            label="a", support=[21, 30], confidence=0.8
+                        ),
+                        fo.TemporalDetection(
+                            label="a", support=[1, 10], confidence=0.9
+                        ),
+                    ]
+                ),
+            )
+        )
+
+        sample = dataset.first()
+        gts = sample.ground_truth.detections
+        preds = sample.predictions.detections
+
+        ious = foui.compute_segment_ious(preds, gts)
+        expected = [[0, 0, 0.8], [1, 0, 0], [0, 0.9, 0], [1, 0, 0]]
+        self.assertTrue(np.allclose(ious, expected))
+
+        ious = foui.compute_segment_ious(preds, gts, classwise=True)
+        expected = [[0, 0, 0], [0, 0, 0], [0, 0.9, 0], [1, 0, 0]]
+        self.assertTrue(np.allclose(ious, expected))
+
+        results = dataset.evaluate_detections(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval",
+            method="activitynet",
+            compute_mAP=True,
+            classwise=True,
+        )
+
+        self.assertEqual(dataset.values("eval_tp"), [2])
+        self.assertEqual(dataset.values("eval_fp"), [2])
+        self.assertEqual(dataset.values("eval_fn"), [1])
+
+        sample = dataset.first()
+        gts = sample.ground_truth.detections
+        preds = sample.predictions.detections
+
+        self.assertListEqual([p.eval for p in preds], ["fp", "fp", "tp", "tp"])
+        self.assertListEqual([g.eval for g in gts], ["tp", "tp", "fn"])
+        self.assertEqual(gts[0].eval_id, preds[3].id)
+        self.assertEqual(gts[1].eval_id, preds[2].id)
+        self.assertAlmostEqual(preds[2].eval_iou, 0.9)
+
+        # Class "a" has AP 1 at all thresholds except 0.95, where its second
+        # prediction is unmatched and its AP is 0.5. Class "b" has AP 0
+        self.assertAlmostEqual(results.mAP(), 0.475)
+        self.assertAlmostEqual(results.mAP(classes=["a"]), 0.95)
+
+        results = dataset.load_evaluation_results("eval", cache=False)
+        self.assertAlmostEqual(results.mAP(), 0.475)
+
 
 class CustomSegmentationEvaluationConfig(fous.SimpleEvaluationConfig):
     pass
@@ -2653,6 +3128,41 @@ class SegmentationTests(unittest.TestCase):
         self.assertNotIn("eval2_precision", dataset.get_field_schema())
         self.assertNotIn("eval2_recall", dataset.get_field_schema())
 
+    @drop_datasets
+    def test_evaluate_segmentations_num_workers(self):
+        dataset = self._make_segmentation_dataset()
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # suppress missing masks warning
+
+            results1 = dataset.evaluate_segmentations(
+                "predictions",
+                gt_field="ground_truth",
+                eval_key="eval1",
+                num_workers=1,
+            )
+            results2 = dataset.evaluate_segmentations(
+                "predictions",
+                gt_field="ground_truth",
+                eval_key="eval2",
+                num_workers=2,
+            )
+
+        # Mask values are observed during evaluation
+        self.assertListEqual(list(results1.classes), ["0", "1", "2"])
+        self.assertListEqual(list(results2.classes), ["0", "1", "2"])
+
+        expected = np.array([[2, 1, 1], [1, 1, 0], [1, 0, 1]], dtype=int)
+        self.assertTrue((results1.pixel_confusion_matrix == expected).all())
+        self.assertTrue((results2.pixel_confusion_matrix == expected).all())
+
+        self.assertListEqual(
+            dataset.values("eval1_accuracy"), dataset.values("eval2_accuracy")
+        )
+        self.assertListEqual(
+            dataset.values("eval1_accuracy"), [None, None, None, 1.0, 0.0]
+        )
+
     @drop_datasets
     def test_evaluate_segmentations_on_disk_simple(self):
         dataset = self._make_segmentation_dataset()
@@ -253,6 +253,25 @@ class GroupTests(unittest.TestCase):
         self.assertNotIn("ego", group)
         self.assertIn("right", group)
 
+    @drop_datasets
+    def test_iter_groups_order(self):
+        dataset = _make_group_dataset()
+
+        view = dataset.sort_by("field", reverse=True)
+        fields = [g["left"].field for g in view.iter_groups()]
+        self.assertListEqual(fields, [4, 1])
+
+        # Groups are reassembled in order across query batches
+        docs = view._aggregate()
+        make_sample = view._make_sample_fcn()
+        groups = list(
+            dataset._hydrate_groups(
+                docs, make_sample, group_slices="right", batch_size=1
+            )
+        )
+        self.assertListEqual([list(g.keys()) for g in groups], [["right"]] * 2)
+        self.assertListEqual([g["right"].field for g in groups], [6, 3])
+
     @drop_datasets
     def test_one_fo3d_group_slice(self):
         dataset = fo.Dataset()
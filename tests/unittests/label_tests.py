@@ -13,6 +13,7 @@ import numpy.testing as nptest
 
 import fiftyone as fo
 import fiftyone.core.labels as focl
+import fiftyone.utils.iou as foui
 import fiftyone.utils.labels as foul
 from fiftyone import ViewField as F
 
@@ -560,6 +561,79 @@ class LabelUtilsTests(unittest.TestCase):
         ids3 = dataset.values("nms3.detections.id", unwind=True)
         self.assertListEqual(ids3, [id2])
 
+        # In-place, on a view
+        foul.perform_nms(dataset.limit(1), "predictions", iou_thresh=0.5)
+        ids4 = dataset.values("predictions.detections.id", unwind=True)
+        self.assertListEqual(ids4, [id2, id3])
+
+    @drop_datasets
+    def test_perform_nms_frames(self):
+        detections = [
+            fo.Detection(
+                label="cat", bounding_box=[0, 0, 0.30, 0.30], confidence=0.9
+            ),
+            fo.Detection(
+                label="cat", bounding_box=[0, 0, 0.29, 0.29], confidence=1
+            ),
+            fo.Detection(
+                label="dog", bounding_box=[0.5, 0.5, 0.3, 0.3], confidence=0.4
+            ),
+        ]
+
+        sample = fo.Sample(filepath="video.mp4")
+        sample.frames[1] = fo.Frame(
+            predictions=fo.Detections(detections=detections)
+        )
+        sample.frames[2] = fo.Frame()
+
+        dataset = fo.Dataset()
+        dataset.add_sample(sample)
+
+        foul.perform_nms(
+            dataset,
+            "frames.predictions",
+            out_field="frames.nms",
+            iou_thresh=0.5,
+        )
+        ids = dataset.values("frames.nms.detections.id", unwind=True)
+        self.assertListEqual(ids, [detections[1].id, detections[2].id])
+        self.assertIn("nms", dataset.get_frame_field_schema())
+
+        # Filtered labels are preserved
+        view = dataset.filter_labels("frames.predictions", F("label") == "cat")
+        foul.perform_nms(view, "frames.predictions", iou_thresh=0.5)
+
+        ids = dataset.values("frames.predictions.detections.id", unwind=True)
+        self.assertIn(detections[2].id, ids)
+
+    @drop_datasets
+    def test_find_duplicates(self):
+        detections = [
+            fo.Detection(label="cat", bounding_box=[0, 0, 0.3, 0.3]),
+            fo.Detection(label="cat", bounding_box=[0, 0, 0.3, 0.29]),
+            fo.Detection(label="cat", bounding_box=[0, 0, 0.3, 0.28]),
+            fo.Detection(label="dog", bounding_box=[0.5, 0.5, 0.3, 0.3]),
+        ]
+
+        sample = fo.Sample(
+            filepath="image.jpg",
+            predictions=fo.Detections(detections=detections),
+        )
+
+        dataset = fo.Dataset()
+        dataset.add_sample(sample)
+
+        dup_ids = foui.find_duplicates(
+            dataset, "predictions", iou_thresh=0.95, method="simple"
+        )
+        self.assertListEqual(dup_ids, [detections[1].id, detections[2].id])
+
+        # Removing the middle box resolves both duplicate pairs
+        dup_ids = foui.find_duplicates(
+            dataset, "predictions", iou_thresh=0.95, method="greedy"
+        )
+        self.assertListEqual(dup_ids, [detections[1].id])
+
 
 if __name__ == "__main__":
     fo.config.show_progress_bars = False
@@ -6,11 +6,15 @@ FiftyOne patches-related unit tests.
 |
 """
 from copy import deepcopy
+from datetime import timedelta
+import gc
+from unittest.mock import patch
 
 from bson import ObjectId
 import unittest
 
 import fiftyone as fo
+import fiftyone.core.dataset as fod
 from fiftyone import ViewField as F
 
 from decorators import drop_datasets
@@ -658,6 +662,84 @@ class PatchesTests(unittest.TestCase):
         self.assertTrue(still_view.is_saved)
         self.assertEqual(still_view, view)
 
+    @drop_datasets
+    def test_to_patches_cache(self):
+        dataset = fo.Dataset()
+        dataset.add_samples(
+            [
+                fo.Sample(
+                    filepath="image%d.png" % i,
+                    ground_truth=fo.Detections(
+                        detections=[
+                            fo.Detection(label="cat"),
+                            fo.Detection(label="dog"),
+                        ]
+                    ),
+                )
+                for i in range(3)
+            ]
+        )
+
+        view1 = dataset.to_patches("ground_truth")
+        view2 = dataset.to_patches("ground_truth")
+        view3 = dataset.limit(1).to_patches("ground_truth")
+
+        # Generated datasets are reused for identical sources and parameters
+        self.assertEqual(view1._patches_dataset, view2._patches_dataset)
+        self.assertNotEqual(view1._patches_dataset, view3._patches_dataset)
+        self.assertEqual(len(view2), 6)
+        self.assertEqual(len(view3), 2)
+
+        # Modifying the source dataset invalidates the cache
+        sample = dataset.first()
+        sample.ground_truth.detections = sample.ground_truth.detections[:1]
+        sample.save()
+
+        view4 = dataset.to_patches("ground_truth")
+        self.assertNotEqual(view4._patches_dataset, view1._patches_dataset)
+        self.assertEqual(len(view4), 5)
+
+        # Reloading a view does not delete datasets shared with other views
+        view1.reload()
+        self.assertEqual(len(view1), 5)
+        self.assertEqual(len(view2), 6)
+
+        max_generated_datasets = fo.config.max_generated_datasets
+        try:
+            fo.config.max_generated_datasets = 2
+
+            # Datasets used by live views are never evicted
+            view5 = dataset.to_patches("ground_truth", other_fields=True)
+            self.assertFalse(view2._patches_dataset.deleted)
+            self.assertEqual(len(view2), 6)
+            self.assertEqual(len(view3), 2)
+
+            # Least recently used datasets are evicted once no view uses them
+            # and their lease has expired
+            name2 = view2._patches_dataset.name
+            name3 = view3._patches_dataset.name
+            del view2, view3
+            gc.collect()
+
+            with patch.object(
+                fod, "_GENERATED_DATASET_LEASE", timedelta(seconds=-1)
+            ):
+                view6 = dataset.to_patches("ground_truth", other_fields="id")
+        finally:
+            fo.config.max_generated_datasets = max_generated_datasets
+
+        self.assertFalse(fo.dataset_exists(name2))
+        self.assertFalse(fo.dataset_exists(name3))
+        self.assertEqual(len(view1), 5)
+        self.assertEqual(len(view5), 5)
+        self.assertEqual(len(view6), 5)
+
+        # Views regenerate datasets that have been deleted elsewhere
+        view7 = dataset.limit(1).to_patches("ground_truth")
+        view7._patches_dataset.delete()
+        view7.reload()
+        self.assertEqual(len(view7), 1)
+
 
 if __name__ == "__main__":
     fo.config.show_progress_bars = False
@@ -6,13 +6,20 @@ FiftyOne Server events tests.
 |
 """
 
+import asyncio
+from datetime import datetime
 import unittest
 
+from bson import ObjectId
+
 import fiftyone as fo
+import fiftyone.core.odm as foo
 import fiftyone.core.state as fos
 import fiftyone.core.session.events as fose
+import fiftyone.server.events.changes as fosc
 import fiftyone.server.events.initialize as fosi
 import fiftyone.server.events.dispatch as fosd
+import fiftyone.server.events.listener as fosl
 import fiftyone.server.events.state as foss
 
 from decorators import drop_datasets
@@ -89,9 +96,158 @@ class ServerEventsTests(unittest.TestCase):
         foss.set_state(state)
         self.assertEqual(state, foss.get_state())
 
+    @drop_datasets
+    def test_state_stamp(self):
+        dataset: fo.Dataset = fo.Dataset("mydataset")
+        dataset.add_sample(fo.Sample(filepath="image1.png"))
+        foss.set_state(fos.StateDescription(dataset=dataset))
+
+        stamp = fosc._get_state_stamp()
+        self.assertEqual(stamp, fosc._get_state_stamp())
+
+        dataset._update_last_loaded_at(force=True)
+        self.assertEqual(stamp, fosc._get_state_stamp())
+
+        # Sample writes don't affect the App's state
+        dataset.add_sample(fo.Sample(filepath="image2.png"))
+        sample = dataset.first()
+        sample["tags"] = ["test"]
+        sample.save()
+        self.assertEqual(stamp, fosc._get_state_stamp())
+
+        dataset.save_view("myview", dataset.limit(1))
+        new_stamp = fosc._get_state_stamp()
+        self.assertNotEqual(stamp, new_stamp)
+
+        dataset.add_sample_field("int", fo.IntField)
+        self.assertNotEqual(new_stamp, fosc._get_state_stamp())
+
+        foss.set_state(fos.StateDescription())
+        self.assertIsNone(fosc._get_state_stamp())
+
+    @drop_datasets
+    def test_affects_state(self):
+        dataset: fo.Dataset = fo.Dataset("mydataset")
+        foss.set_state(fos.StateDescription(dataset=dataset))
+
+        listener = foss.Listener(
+            queue=asyncio.LifoQueue(), subscription="subscription"
+        )
+        event_name = fose.Refresh.get_event_name()
+        foss.get_listeners()[event_name].add(listener)
+
+        def _change(updated_fields, removed_fields=None):
+            return {
+                "ns": {"coll": "datasets"},
+                "documentKey": {"_id": dataset._doc.id},
+                "updateDescription": {
+                    "updatedFields": updated_fields,
+                    "removedFields": removed_fields or [],
+                },
+            }
+
+        try:
+            self.assertFalse(
+                fosc._affects_state(
+                    _change(
+                        {"write_count": 2, "sort_keys.field": 2},
+                        removed_fields=["frame_summaries.field"],
+                    )
+                )
+            )
+            self.assertTrue(
+                fosc._affects_state(
+                    _change({"write_count": 2, "sample_fields": []})
+                )
+            )
+
+            dataset.save_view("myview", dataset.limit(1))
+            view_id = dataset._doc.saved_views[0].id
+            self.assertTrue(
+                fosc._affects_state(
+                    {"ns": {"coll": "views"}, "documentKey": {"_id": view_id}}
+                )
+            )
+            self.assertFalse(
+                fosc._affects_state(
+                    {
+                        "ns": {"coll": "views"},
+                        "documentKey": {"_id": ObjectId()},
+                    }
+                )
+            )
+        finally:
+            foss.get_listeners()[event_name].remove(listener)
+            foss.set_state(fos.StateDescription())
+
+    def test_change_stream_pipeline(self):
+        def _change(coll, op, updated_fields=None, removed_fields=None):
+            change = {"ns": {"coll": coll}, "operationType": op}
+            if op == "update":
+                change["updateDescription"] = {
+                    "updatedFields": updated_fields or {},
+                    "removedFields": removed_fields or [],
+                }
+
+            return change
+
+        changes = [
+            _change("datasets", "update", {"write_count": 2}),
+            _change(
+                "datasets",
+                "update",
+                {"sort_keys.field": 1, "last_loaded_at": 1},
+                removed_fields=["frame_summaries.field"],
+            ),
+            _change("datasets", "update", {"write_count": 2, "info": {}}),
+            _change("datasets", "update", removed_fields=["app_config.x"]),
+            _change("datasets", "delete"),
+            _change("views", "update", {"name": "myview"}),
+            _change("workspaces", "insert"),
+            _change("samples.abc", "update", {"tags": []}),
+        ]
+        expected = [False, False, True, True, True, True, True, False]
+
+        coll = foo.get_db_conn()["test_change_stream_pipeline"]
+        try:
+            coll.insert_many([dict(c, index=i) for i, c in enumerate(changes)])
+            pipeline = fosc._get_change_stream_pipeline()
+            matches = {d["index"] for d in coll.aggregate(pipeline)}
+        finally:
+            coll.drop()
+
+        actual = [i in matches for i in range(len(changes))]
+        self.assertListEqual(actual, expected)
+
+    def test_coalesce_events(self):
+        state = fos.StateDescription()
+        events = [
+            (datetime.now(), fose.StateUpdate(state)),
+            (datetime.now(), fose.SelectSamples(sample_ids=["a"])),
+            (datetime.now(), fose.StateUpdate(state)),
+            (datetime.now(), fose.Refresh(state)),
+        ]
+
+        coalesced = fosl._coalesce(events)
+        self.assertListEqual(coalesced, events[1:])
+
 
 class TestServerEvents(unittest.IsolatedAsyncioTestCase):
     async def test_dispatch_state_update(self):
         state = fos.StateDescription()
         await fosd.dispatch_event(None, fose.StateUpdate(state))
         self.assertEqual(state, foss.get_state())
+
+    async def test_dispatch_notifies_listeners(self):
+        listener = foss.Listener(
+            queue=asyncio.LifoQueue(), subscription="subscription"
+        )
+        event_name = fose.SelectSamples.get_event_name()
+        foss.get_listeners()[event_name].add(listener)
+
+        try:
+            await fosd.dispatch_event(None, fose.SelectSamples(["a"]))
+            await asyncio.wait_for(listener.notify.wait(), timeout=1)
+            self.assertEqual(listener.queue.qsize(), 1)
+        finally:
+            foss.get_listeners()[event_name].remove(listener)
@@ -0,0 +1,188 @@
+"""
+FiftyOne Server media cache unit tests.
+
+| Copyright 2017-2024, Voxel51, Inc.
+| `voxel51.com <https://voxel51.com/>`_
+|
+"""
+import asyncio
+import os
+import threading
+import unittest
+
+import numpy as np
+from starlette.applications import Starlette
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+import eta.core.utils as etau
+
+import fiftyone as fo
+import fiftyone.utils.image as foui
+import fiftyone.server.media_cache as fosm
+from fiftyone.server.routes.media import Media
+
+from decorators import drop_datasets
+
+
+class MediaCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = etau.TempDir()
+        self._root_dir = self._temp_dir.__enter__()
+
+    def tearDown(self):
+        self._temp_dir.__exit__()
+
+    def _new_image(self, name, width=64, height=48):
+        path = os.path.join(self._root_dir, "media", name)
+        etau.ensure_basedir(path)
+        img = np.random.randint(255, size=(height, width, 3), dtype=np.uint8)
+        foui.write(img, path)
+        return path
+
+    def _new_cache(self, max_size_bytes=2**30):
+        cache_dir = os.path.join(self._root_dir, "cache")
+        return fosm.MediaCache(cache_dir, max_size_bytes, num_workers=2)
+
+    def test_thumbnails(self):
+        cache = self._new_cache()
+        png_path = self._new_image("image.png")
+        tiff_path = self._new_image("image.tiff")
+
+        # Browser-friendly images are served as-is
+        self.assertEqual(cache.get_sync(png_path), png_path)
+
+        thumb_path = cache.get_sync(png_path, width=16)
+        self.assertNotEqual(thumb_path, png_path)
+        self.assertTrue(thumb_path.endswith(".jpg"))
+        self.assertEqual(foui.read(thumb_path).shape, (12, 16, 3))
+
+        # Cache hits reuse the same file
+        mtime = os.path.getmtime(thumb_path)
+        self.assertEqual(cache.get_sync(png_path, width=16), thumb_path)
+        self.assertEqual(os.path.getmtime(thumb_path), mtime)
+
+        webp_path = cache.get_sync(png_path, width=16, format="webp")
+        self.assertTrue(webp_path.endswith(".webp"))
+
+        # Non browser-friendly images are proxied at full resolution
+        proxy_path = cache.get_sync(tiff_path)
+        self.assertTrue(proxy_path.endswith(".jpg"))
+        self.assertEqual(foui.read(proxy_path).shape, (48, 64, 3))
+
+        with self.assertRaises(ValueError):
+            cache.get_sync(png_path, format="gif")
+
+    def test_eviction(self):
+        paths = [self._new_image("image%d.png" % i) for i in range(4)]
+
+        cache = self._new_cache()
+        thumb_path = cache.get_sync(paths[0], width=32)
+        thumb_size = os.path.getsize(thumb_path)
+
+        cache.clear()
+        cache.max_size_bytes = 2 * thumb_size + thumb_size // 2
+
+        thumb_paths = [cache.get_sync(p, width=32) for p in paths[:2]]
+
+        # Refreshes the first thumbnail so that the second is evicted
+        cache.get_sync(paths[0], width=32)
+        cache.get_sync(paths[2], width=32)
+
+        self.assertTrue(os.path.isfile(thumb_paths[0]))
+        self.assertFalse(os.path.isfile(thumb_paths[1]))
+        self.assertLessEqual(cache.size_bytes, cache.max_size_bytes)
+
+        # The index is rebuilt from disk by new instances
+        cache2 = self._new_cache(max_size_bytes=cache.max_size_bytes)
+        self.assertEqual(cache2.size_bytes, cache.size_bytes)
+
+    def test_get_async(self):
+        cache = self._new_cache()
+        png_path = self._new_image("image.png")
+        thumb_path = cache.get_sync(png_path, width=16)
+
+        # The index is built lazily by the first lookup of a new instance
+        cache = self._new_cache()
+        index_threads = []
+        ensure_index = cache._ensure_index
+
+        def _ensure_index():
+            index_threads.append(threading.get_ident())
+            ensure_index()
+
+        cache._ensure_index = _ensure_index
+
+        async def _get():
+            path = await cache.get(png_path, width=16)
+            return path, threading.get_ident()
+
+        path, loop_thread = asyncio.run(_get())
+
+        self.assertEqual(path, thumb_path)
+        self.assertTrue(index_threads)
+        self.assertNotIn(loop_thread, index_threads)
+
+    def test_media_route(self):
+        png_path = self._new_image("image.png")
+
+        cache_dir = os.path.join(self._root_dir, "cache")
+        media_cache_dir = fo.config.media_cache_dir
+        fo.config.media_cache_dir = cache_dir
+
+        app = Starlette(routes=[Route("/media", Media)])
+
+        try:
+            with TestClient(app) as client:
+                params = {"filepath": png_path, "width": "16"}
+                response = client.get("/media", params=params)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(
+                    response.headers["content-type"], "image/jpeg"
+                )
+
+                for params in (
+                    {"filepath": png_path, "width": "abc"},
+                    {"filepath": png_path, "width": "0"},
+                    {"filepath": png_path, "format": "gif"},
+                ):
+                    response = client.get("/media", params=params)
+                    self.assertEqual(response.status_code, 400)
+
+                    response = client.head("/media", params=params)
+                    self.assertEqual(response.status_code, 400)
+        finally:
+            fo.config.media_cache_dir = media_cache_dir
+
+    @drop_datasets
+    def test_warm_media_cache(self):
+        dataset = fo.Dataset()
+        dataset.add_samples(
+            [
+                fo.Sample(filepath=self._new_image("image%d.png" % i))
+                for i in range(3)
+            ]
+        )
+
+        cache_dir = os.path.join(self._root_dir, "cache")
+        media_cache_dir = fo.config.media_cache_dir
+        fo.config.media_cache_dir = cache_dir
+
+        try:
+            num_added = fosm.warm_media_cache(dataset, width=16)
+            self.assertEqual(num_added, 3)
+
+            num_added = fosm.warm_media_cache(dataset, width=16)
+            self.assertEqual(num_added, 0)
+
+            cache = fosm.get_media_cache()
+            for filepath in dataset.values("filepath"):
+                cache_path = cache.get_cache_path(filepath, width=16)
+                self.assertTrue(os.path.isfile(cache_path))
+        finally:
+            fo.config.media_cache_dir = media_cache_dir
+
+
+if __name__ == "__main__":
+    fo.config.show_progress_bars = False
+    unittest.main(verbosity=2)
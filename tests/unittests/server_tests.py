@@ -5,19 +5,34 @@ FiftyOne server-related unit tests.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+import gzip
+import json
 import math
+import os
 import unittest
+from unittest import mock
+
+import numpy as np
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse, Response
+
+import eta.core.utils as etau
 
 import fiftyone as fo
 import fiftyone.core.dataset as fod
 import fiftyone.core.labels as fol
 import fiftyone.core.odm as foo
 import fiftyone.core.sample as fos
+import fiftyone.server.compression as fosc
+import fiftyone.server.metadata as fosm
+from fiftyone.server.compression import CompressionMiddleware
 from fiftyone.server.query import Dataset
 from fiftyone.server.samples import paginate_samples
 import fiftyone.server.view as fosv
+import fiftyone.utils.image as foui
 
-from decorators import drop_datasets
+from decorators import drop_async_dataset, drop_datasets
 from utils.groups import make_disjoint_groups_dataset
 
 
@@ -860,6 +875,57 @@ class ServerViewTests(unittest.TestCase):
         )
         self.assertEqual(len(view), 1)
 
+    @drop_datasets
+    def test_get_view_cache(self):
+        dataset = fod.Dataset("test")
+        dataset.add_samples(
+            [
+                fos.Sample(filepath="image1.png", tags=["train"]),
+                fos.Sample(filepath="image2.png", tags=["test"]),
+            ]
+        )
+
+        stages = [fo.MatchTags("train")._serialize()]
+        fosv.clear_view_cache()
+
+        view1 = fosv.get_view("test", stages=stages, reload=False)
+        view2 = fosv.get_view("test", stages=stages, reload=False)
+        self.assertIsNot(view1, view2)
+        self.assertEqual(view1, view2)
+        self.assertEqual(len(view2), 1)
+        self.assertEqual(len(fosv._view_cache), 1)
+
+        # Reloading requests bypass the cache
+        view3 = fosv.get_view("test", stages=stages)
+        self.assertEqual(view3, view1)
+        self.assertEqual(len(fosv._view_cache), 1)
+
+        filters = {"tags": {"values": ["test"], "exclude": False}}
+        view4 = fosv.get_view("test", filters=filters, reload=False)
+        self.assertEqual(len(view4), 1)
+        self.assertEqual(
+            view4.first().filepath, view1._dataset.last().filepath
+        )
+
+        # Schema changes invalidate cached views
+        dataset.add_sample_field("int", fo.IntField)
+        view5 = fosv.get_view(
+            "test",
+            pagination_data=True,
+            filters={"int": {"range": [0, 1]}},
+            reload=False,
+        )
+        self.assertEqual(len(view5), 0)
+
+        dataset.delete_sample_field("int")
+        with self.assertRaises(Exception):
+            fosv.get_view(
+                "test",
+                pagination_data=True,
+                filters={"int": {"range": [0, 1]}},
+                reload=False,
+            )
+
 
 class AysncServerViewTests(unittest.IsolatedAsyncioTestCase):
     @drop_datasets
@@ -896,6 +962,115 @@ class AysncServerViewTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(len(second_samples.edges), 1)
         self.assertEqual(second_samples.edges[0].node.id, second._id)
 
+    @drop_async_dataset
+    async def test_metadata_batch(self, dataset: fo.Dataset):
+        with etau.TempDir() as tmp_dir:
+            filepaths = []
+            for i in range(3):
+                filepath = os.path.join(tmp_dir, "image%d.png" % i)
+                img = np.zeros((20 + i, 40, 3), dtype=np.uint8)
+                foui.write(img, filepath)
+                filepaths.append(filepath)
+
+            dataset.add_samples(
+                [fo.Sample(filepath=filepath) for filepath in filepaths]
+                + [fo.Sample(filepath=os.path.join(tmp_dir, "missing.png"))]
+            )
+
+            write_count = dataset._get_write_count()
+
+            samples = await paginate_samples(
+                dataset.name, [], {}, first=4, pagination_data=True
+            )
+            aspect_ratios = [e.node.aspect_ratio for e in samples.edges]
+            self.assertListEqual(aspect_ratios, [40 / 20, 40 / 21, 40 / 22, 1])
+
+            # Computed metadata is stored on the samples
+            self.assertEqual(dataset._get_write_count(), write_count + 1)
+            dataset.reload()
+            self.assertListEqual(
+                dataset.values("metadata.height"), [20, 21, 22, None]
+            )
+            self.assertListEqual(
+                dataset.values("metadata.num_channels"), [3, 3, 3, None]
+            )
+
+            sample = dataset.first()
+            sample.metadata = None
+            sample.save()
+
+            # Cached metadata is reused while the media is unchanged
+            with mock.patch.object(
+                fosm, "_build_metadata", side_effect=Exception
+            ):
+                samples = await paginate_samples(
+                    dataset.name, [], {}, first=1, pagination_data=True
+                )
+
+            self.assertEqual(samples.edges[0].node.aspect_ratio, 40 / 20)
+
+            img = np.zeros((30, 80, 3), dtype=np.uint8)
+            foui.write(img, filepaths[0])
+
+            samples = await paginate_samples(
+                dataset.name, [], {}, first=1, pagination_data=True
+            )
+            self.assertEqual(samples.edges[0].node.aspect_ratio, 80 / 30)
+
+
+class ServerCompressionTests(unittest.IsolatedAsyncioTestCase):
+    async def _request(self, response, accept_encoding):
+        app = CompressionMiddleware(response, minimum_size=100)
+        scope = {
+            "type": "http",
+            "headers": [(b"accept-encoding", accept_encoding.encode())],
+        }
+        messages = []
+
+        async def receive():
+            return {"type": "http.request"}
+
+        async def send(message):
+            messages.append(message)
+
+        await app(scope, receive, send)
+        headers = Headers(raw=messages[0]["headers"])
+        body = b"".join(m.get("body", b"") for m in messages[1:])
+        return headers, body
+
+    async def test_compression(self):
+        data = {
+            "samples": [{"filepath": "image%d.png" % i} for i in range(50)]
+        }
+        response = JSONResponse(data)
+
+        headers, body = await self._request(response, "gzip, deflate")
+        self.assertEqual(headers["content-encoding"], "gzip")
+        self.assertEqual(int(headers["content-length"]), len(body))
+        self.assertEqual(json.loads(gzip.decompress(body)), data)
+
+        headers, body = await self._request(response, "gzip;q=0")
+        self.assertNotIn("content-encoding", headers)
+        self.assertEqual(json.loads(body), data)
+
+        response = JSONResponse({"small": True})
+        headers, body = await self._request(response, "gzip")
+        self.assertNotIn("content-encoding", headers)
+
+        response = Response(b"0" * 1000, media_type="image/png")
+        headers, body = await self._request(response, "gzip")
+        self.assertNotIn("content-encoding", headers)
+        self.assertEqual(len(body), 1000)
+
+    def test_negotiate_encoding(self):
+        self.assertIsNone(fosc.negotiate_encoding(""))
+        self.assertIsNone(fosc.negotiate_encoding("identity"))
+        self.assertEqual(fosc.negotiate_encoding("gzip"), "gzip")
+        self.assertEqual(fosc.negotiate_encoding("br;q=0, gzip;q=0.5"), "gzip")
+
+        expected = "br" if fosc.brotli is not None else "gzip"
+        self.assertEqual(fosc.negotiate_encoding("gzip, br"), expected)
+
 
 class ServerDocTests(unittest.TestCase):
     def test_dataset_doc(self):
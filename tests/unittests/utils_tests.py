@@ -13,6 +13,7 @@ import numpy as np
 
 import fiftyone as fo
 import fiftyone.constants as foc
+import fiftyone.core.json as foj
 import fiftyone.core.media as fom
 import fiftyone.core.odm as foo
 import fiftyone.core.utils as fou
@@ -355,6 +356,26 @@ class SerializationTests(unittest.TestCase):
 
         self.assertDictEqual(s1.to_dict(), s2.to_dict())
 
+    def test_stringify_masks(self):
+        mask = np.random.randint(3, size=(4, 5), dtype=np.uint8)
+        fortran_mask = np.asfortranarray(mask)
+
+        for array in (mask, fortran_mask):
+            d = {
+                "_cls": "Segmentation",
+                "mask": fou.serialize_numpy_array(array),
+            }
+            d = foj.stringify(d)
+            mask2 = fou.deserialize_numpy_array(d["mask"], ascii=True)
+            self.assertTrue(mask2.flags.c_contiguous)
+            np.testing.assert_array_equal(mask2, mask)
+
+        d = {
+            "_cls": "Classification",
+            "logits": fou.serialize_numpy_array(mask),
+        }
+        self.assertEqual(foj.stringify(d)["logits"], str(mask.shape))
+
 
 class MediaTypeTests(unittest.TestCase):
     @drop_datasets
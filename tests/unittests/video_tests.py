@@ -168,6 +168,84 @@ class VideoTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             dataset.create_index("frames.non_existent_field")
 
+    @drop_datasets
+    def test_frame_summaries(self):
+        dataset = fo.Dataset()
+
+        sample1 = fo.Sample(filepath="video1.mp4")
+        sample1.frames[1] = fo.Frame(
+            dets=fo.Detections(
+                detections=[
+                    fo.Detection(label="cat", confidence=0.9),
+                    fo.Detection(label="dog", confidence=0.4),
+                ]
+            )
+        )
+        sample1.frames[2] = fo.Frame(
+            dets=fo.Detections(
+                detections=[fo.Detection(label="cat", confidence=0.1)]
+            )
+        )
+        sample1.frames[3] = fo.Frame()
+
+        sample2 = fo.Sample(filepath="video2.mp4")
+        sample2.frames[1] = fo.Frame(
+            dets=fo.Detections(
+                detections=[fo.Detection(label="dog", confidence=0.5)]
+            )
+        )
+
+        dataset.add_samples([sample1, sample2])
+
+        def _run(sample_collection):
+            return (
+                sample_collection.count("frames.dets"),
+                sample_collection.count("frames.dets.detections"),
+                sample_collection.count("frames.dets.detections.label"),
+                sample_collection.count_values("frames.dets.detections.label"),
+                sample_collection.aggregate(
+                    fo.Bounds(
+                        "frames.dets.detections.confidence",
+                        safe=True,
+                        _count_nonfinites=True,
+                    )
+                ),
+            )
+
+        expected = _run(dataset)
+        self.assertEqual(expected[:3], (3, 4, 4))
+        self.assertDictEqual(expected[3], {"cat": 2, "dog": 2})
+
+        dataset.create_frame_summaries("dets")
+        self.assertListEqual(dataset.list_frame_summaries(), ["dets"])
+        self.assertNotIn("_frame_summaries", dataset.get_field_schema())
+
+        self.assertEqual(_run(dataset), expected)
+
+        view = dataset.match(F("filepath").ends_with("1.mp4"))
+        self.assertEqual(_run(view)[:3], (2, 3, 3))
+
+        # Stale summaries are not used, nor recomputed, by aggregations
+        sample2.frames[2] = fo.Frame(
+            dets=fo.Detections(
+                detections=[fo.Detection(label="bird", confidence=0.7)]
+            )
+        )
+        sample2.save()
+
+        counts = dataset.count_values("frames.dets.detections.label")
+        self.assertDictEqual(counts, {"cat": 2, "dog": 2, "bird": 1})
+        self.assertEqual(dataset.count("frames.dets"), 4)
+        self.assertDictEqual(dataset._get_frame_summaries(), {})
+
+        dataset.create_frame_summaries("dets")
+        self.assertIn("dets", dataset._get_frame_summaries())
+        self.assertEqual(_run(dataset)[:3], (4, 5, 5))
+
+        dataset.drop_frame_summaries()
+        self.assertListEqual(dataset.list_frame_summaries(), [])
+        self.assertEqual(dataset.count("frames.dets.detections"), 5)
+
     @drop_datasets
     def test_frames_order(self):
         dataset = fo.Dataset()
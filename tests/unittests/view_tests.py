@@ -8,14 +8,19 @@ FiftyOne view-related unit tests.
 from copy import deepcopy
 from datetime import date, datetime, timedelta
 import math
+import pickle
 
 from bson import ObjectId
 import unittest
+from unittest.mock import ANY, patch
 import numpy as np
 
 import fiftyone as fo
 from fiftyone import ViewField as F, VALUE
+import fiftyone.core.aggregations as foa
 import fiftyone.core.media as fom
+import fiftyone.core.odm as foo
+import fiftyone.core.odm.database as foodb
 import fiftyone.core.sample as fos
 import fiftyone.core.stages as fosg
 import fiftyone.core.view as fov
@@ -820,6 +825,68 @@ class ViewExpressionTests(unittest.TestCase):
         self.assertEqual(len(view), 1)
         self.assertEqual(view.first().date, date2)
 
+    def test_to_mongo_memoization(self):
+        expr = F("label").is_in(["cat", "dog"]) & (F("confidence") > 0.5)
+
+        # Compiled representations are reused, but public copies are not
+        self.assertIs(expr._to_mongo(), expr._to_mongo())
+        d1 = expr.to_mongo()
+        d2 = expr.to_mongo()
+        self.assertDictEqual(d1, d2)
+        self.assertIsNot(d1, d2)
+
+        d1["$and"][0]["$in"][1].append("bird")
+        self.assertDictEqual(expr.to_mongo(), d2)
+
+        self.assertEqual(
+            expr.to_mongo(prefix="$$this")["$and"][1],
+            {"$gt": ["$$this.confidence", 0.5]},
+        )
+
+        # Freezing the prefix of a sub-expression invalidates the expressions
+        # that contain it
+        conf_expr = F("confidence") > 0.5
+        parent = conf_expr & F("tp")
+        self.assertEqual(
+            parent.to_mongo()["$and"][0], {"$gt": ["$confidence", 0.5]}
+        )
+
+        F("detections").filter(conf_expr)
+        self.assertEqual(
+            parent.to_mongo()["$and"][0], {"$gt": ["$$this.confidence", 0.5]}
+        )
+
+        # Removing a field prefix in-place invalidates the expression
+        frames_expr = (F("frames.dets.label") == "cat") | F("frames.tp")
+        self.assertEqual(
+            frames_expr.to_mongo()["$or"][0],
+            {"$eq": ["$frames.dets.label", "cat"]},
+        )
+
+        foa._remove_prefix(frames_expr, "frames")
+        self.assertEqual(
+            frames_expr.to_mongo(),
+            {"$or": [{"$eq": ["$dets.label", "cat"]}, "$tp"]},
+        )
+
+        # Substituting variables in-place invalidates the expression
+        area = F("w") * F("h")
+        in_expr = (area > 1) & (area < 2)
+        self.assertEqual(
+            in_expr.to_mongo()["$and"][0],
+            {"$gt": [{"$multiply": ["$w", "$h"]}, 1]},
+        )
+
+        let_expr = area.let_in(in_expr)
+        self.assertEqual(in_expr.to_mongo()["$and"][0], {"$gt": ["$$expr", 1]})
+        self.assertEqual(let_expr.to_mongo()["$let"]["in"], in_expr.to_mongo())
+
+        # Memoized representations are not pickled
+        expr._to_mongo()
+        also_expr = pickle.loads(pickle.dumps(expr))
+        self.assertNotIn("_compiled", also_expr.__dict__)
+        self.assertDictEqual(also_expr.to_mongo(), d2)
+
 
 class SliceTests(unittest.TestCase):
     @drop_datasets
@@ -3421,6 +3488,54 @@ class ViewStageTests(unittest.TestCase):
         for tags in view.values("test_dets.detections.tags", unwind=True):
             self.assertListEqual(tags, [])
 
+    @drop_datasets
+    def test_tag_labels_sharded(self):
+        dataset = fo.Dataset()
+        dataset.add_samples(
+            [
+                fo.Sample(
+                    filepath="image%d.jpg" % i,
+                    dets=fo.Detections(
+                        detections=[
+                            fo.Detection(label="cat", confidence=0.9),
+                            fo.Detection(label="dog", confidence=0.1),
+                        ]
+                    ),
+                    clf=fo.Classification(label="cat", confidence=i / 20),
+                )
+                for i in range(20)
+            ]
+        )
+
+        # Force the updates to be split into multiple shards
+        with patch.object(
+            fo.Dataset._get_id_shards, "__defaults__", (5,)
+        ), patch(
+            "fiftyone.core.utils.recommend_thread_pool_workers",
+            return_value=4,
+        ):
+            self.assertGreater(len(dataset._get_id_shards(dataset)), 1)
+
+            view = dataset.filter_labels("dets", F("confidence") > 0.5)
+            view.tag_labels(["test", "test"], label_fields="dets")
+
+            counts = dataset.count_values("dets.detections.tags")
+            self.assertDictEqual(counts, {"test": 20})
+
+            view = dataset.match(F("clf.confidence") >= 0.5)
+            view.tag_labels("test", label_fields="clf")
+            self.assertDictEqual(dataset.count_label_tags("clf"), {"test": 10})
+
+            dataset.untag_labels("test")
+            self.assertDictEqual(dataset.count_label_tags(), {})
+
+            view = dataset.filter_labels("dets", F("label") == "dog")
+            dataset.delete_labels(view=view, fields="dets")
+            self.assertEqual(dataset.count("dets.detections"), 20)
+            self.assertDictEqual(
+                dataset.count_values("dets.detections.label"), {"cat": 20}
+            )
+
     def test_match(self):
         self.sample1["value"] = "value"
         self.sample1.save()
@@ -3708,6 +3823,88 @@ class ViewStageTests(unittest.TestCase):
         self.assertEqual(len(result), 2)
         self.assertEqual(result.values("id"), values)
 
+    @drop_datasets
+    def test_select_large_values(self):
+        dataset = fo.Dataset()
+        dataset.add_samples(
+            [
+                fo.Sample(
+                    filepath="image%d.jpg" % i,
+                    index=i,
+                    ground_truth=fo.Detections(
+                        detections=[
+                            fo.Detection(label=str(j)) for j in range(3)
+                        ]
+                    ),
+                )
+                for i in range(10)
+            ]
+        )
+
+        ids = dataset.values("id")
+        label_ids = dataset.values("ground_truth.detections.id", unwind=True)
+        sample_ids = [ids[7], ids[2], ids[5]]
+
+        def make_views():
+            return [
+                dataset.select(sample_ids),
+                dataset.select(sample_ids, ordered=True),
+                dataset.exclude(sample_ids),
+                dataset.select_by("index", [8, 1, 4, 1], ordered=True),
+                dataset.exclude_by("index", [8, 1, 4]),
+                dataset.select_labels(ids=label_ids[:5]),
+            ]
+
+        expected = [view.values("index") for view in make_views()]
+        expected_labels = make_views()[-1].values("ground_truth.detections.id")
+
+        # Values are joined from a collection rather than embedded
+        with patch.object(fosg, "_MAX_INLINE_VALUES", 2):
+            views = make_views()
+            for view in views:
+                self.assertIn("$lookup", str(view._pipeline()))
+                self.assertNotIn(sample_ids[0], str(view._pipeline()))
+
+            self.assertListEqual([v.values("index") for v in views], expected)
+            self.assertListEqual(
+                views[-1].values("ground_truth.detections.id"),
+                expected_labels,
+            )
+
+        # Ordered values are sorted without `$indexOfArray`
+        with patch.object(fosg, "_MAX_INLINE_ORDERED_VALUES", 1):
+            views = make_views()
+            self.assertNotIn("$indexOfArray", str(views[1]._pipeline()))
+            self.assertListEqual([v.values("index") for v in views], expected)
+
+        self.assertListEqual(expected[1], [7, 2, 5])
+        self.assertListEqual(expected[3], [8, 1, 4])
+
+        # Values collections are only dropped as orphans once unused
+        with patch.object(fosg, "_MAX_INLINE_VALUES", 2):
+            view = dataset.select(sample_ids)
+            coll_name = next(
+                s["$lookup"]["from"]
+                for s in view._pipeline()
+                if "$lookup" in s
+            )
+            conn = foo.get_db_conn()
+
+            foo.drop_orphan_collections()
+            self.assertIn(coll_name, conn.list_collection_names())
+
+            with patch.object(
+                foodb, "_VALUES_COLLECTION_TTL", timedelta(seconds=-1)
+            ):
+                foo.drop_orphan_collections()
+
+            self.assertNotIn(coll_name, conn.list_collection_names())
+
+            # Dropped collections are recreated when needed
+            self.assertListEqual(view.values("index"), expected[0])
+
+        foo.drop_values_collections()
+
     def _select_field_setup(self):
         self.dataset.add_sample_field("select_fields_field", fo.IntField)
         self.dataset.set_values("select_fields_field", [1] * len(self.dataset))
@@ -4322,10 +4519,109 @@ class ViewStageTests(unittest.TestCase):
         self.assertListEqual(also_view4.values("foo"), ["bar", "spam", "spam"])
         self.assertListEqual(also_view4.values("field"), [3, 1, 2])
 
+    @drop_datasets
+    def test_sort_by_materialize(self):
+        dataset = fo.Dataset()
+        dataset.add_samples(
+            [
+                fo.Sample(filepath="image1.jpg", tags=["a", "b"], field=2),
+                fo.Sample(filepath="image2.jpg", tags=[], field=1),
+                fo.Sample(filepath="image3.jpg", tags=["a"], field=3),
+            ]
+        )
+
+        expr = F("tags").length()
+        view = dataset.sort_by(expr, reverse=True, materialize=True)
+
+        # Building a view never writes sort keys
+        self.assertIn("$addFields", view._pipeline()[-3])
+        self.assertListEqual(dataset.list_sort_keys(), [])
+
+        dataset.create_sort_keys(expr)
+        self.assertListEqual(dataset.list_sort_keys(), [expr.to_mongo()])
+
+        sort_field = list(view._pipeline()[-1]["$sort"].keys())[0]
+        self.assertTrue(sort_field.startswith("_sort_key_"))
+        self.assertIn(sort_field, dataset.list_indexes())
+        self.assertNotIn(sort_field, dataset.get_field_schema())
+        self.assertListEqual(view.values("field"), [2, 3, 1])
+
+        also_view = fo.DatasetView._build(dataset, view._serialize())
+        self.assertIn(sort_field, also_view._pipeline()[-1]["$sort"])
+
+        # Stale sort keys are not used
+        sample = dataset.first()
+        sample.tags = []
+        sample.save()
+
+        self.assertNotIn(sort_field, view._pipeline()[-2]["$sort"])
+        self.assertListEqual(view.values(expr), [1, 0, 0])
+        self.assertEqual(view.first().field, 3)
+
+        dataset.create_sort_keys(expr)
+        self.assertIn(sort_field, view._pipeline()[-1]["$sort"])
+        self.assertListEqual(view.values(expr), [1, 0, 0])
+
+        # Expressions that follow stages that modify samples do not use sort
+        # keys
+        view2 = dataset.set_field("tags", ["x"]).sort_by(
+            expr, materialize=True
+        )
+        self.assertNotIn(sort_field, view2._pipeline()[-2]["$sort"])
+        self.assertListEqual(view2.values(expr), [1, 1, 1])
+
+        dataset.drop_sort_keys()
+        self.assertListEqual(dataset.list_sort_keys(), [])
+        self.assertNotIn(sort_field, dataset.list_indexes())
+        self.assertIsNone(
+            dataset._sample_collection.find_one(
+                {sort_field: {"$exists": True}}
+            )
+        )
+        self.assertListEqual(view.values("field"), [3, 2, 1])
+
+        with self.assertRaises(ValueError):
+            dataset.create_sort_keys(F("frames").length())
+
     def test_take(self):
         result = list(self.dataset.take(1))
         self.assertIs(len(result), 1)
 
+    @drop_datasets
+    def test_take_shuffle_rand_index(self):
+        dataset = fo.Dataset()
+        dataset.add_samples(
+            [
+                fo.Sample(filepath="image%d.jpg" % i, index=i)
+                for i in range(100)
+            ]
+        )
+        dataset.create_index("_rand")
+
+        view = dataset.take(10, seed=51)
+        self.assertEqual(
+            view._pipeline()[0], {"$match": {"_rand": {"$gte": ANY}}}
+        )
+
+        values = view.values("index")
+        self.assertEqual(len(values), 10)
+        self.assertEqual(len(set(values)), 10)
+        self.assertListEqual(dataset.take(10, seed=51).values("index"), values)
+        self.assertEqual(len(dataset.take(1000)), 100)
+
+        # Stages that follow other stages use the default implementation
+        view = dataset.limit(50).take(10, seed=51)
+        self.assertNotIn("$unionWith", str(view._pipeline()))
+        self.assertTrue(set(view.values("index")).issubset(range(50)))
+
+        view = dataset.shuffle(seed=51)
+        self.assertIn("$unionWith", str(view._pipeline()))
+
+        values = view.values("index")
+        self.assertListEqual(sorted(values), list(range(100)))
+        self.assertListEqual(dataset.shuffle(seed=51).values("index"), values)
+        self.assertNotEqual(values, list(range(100)))
+
     def test_uuids(self):
         stage = fosg.Take(1)
         stage_dict = stage._serialize()